@@ -1,16 +1,23 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, BackgroundTasks, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-import psycopg
+from fastapi.responses import PlainTextResponse, RedirectResponse, Response
 import os
 import asyncio
 import logging
+import time
 from typing import List, Dict, Any, Optional
 
-from .models.dumpster_data import ScrapedData, DumpsterCompany, ServiceArea, DumpsterSize, DumpsterPrice
-from .scrapers.waste_management_scraper import WasteManagementScraper
-from .scrapers.budget_dumpster_scraper import BudgetDumpsterScraper
-from .scrapers.liberty_dumpsters_scraper import LibertyDumpstersScraper
+from .models.dumpster_data import DumpsterCompany, ServiceArea, DumpsterSize, DumpsterPrice
+from .scrapers.registry import provider_names
+from .utils.city_search import MAX_RESULTS as MAX_CITY_RESULTS, CitySearchIndex
 from .utils.data_storage import DataStorage
+from .utils.gazetteer import get_gazetteer
+from .utils.nearby_index import MAX_RESULTS as MAX_NEARBY_RESULTS, NearbyIndex
+from .utils.zip_index import normalize_zip
+from .utils.job_queue import JOB_QUEUE_FILE, JobQueue
+from .utils.metrics import HTTP_REQUEST_SECONDS, render as render_metrics
+from .utils.profiling import PROFILE_HEADER, PROFILE_MAX_SECONDS, SamplingProfiler, check_token, profiling_enabled
+from .utils.run_ledger import RUN_LEDGER_FILE, RunLedger
 from .utils.scheduler import ScraperScheduler
 
 logging.basicConfig(level=logging.INFO)
@@ -30,67 +37,150 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# "inline" runs scrapes inside the API process; "worker" queues them for
+# the scrape workers (python -m app.worker), which also own the schedule
+SCRAPER_EXECUTION = os.getenv("SCRAPER_EXECUTION", "inline")
+
 data_storage = DataStorage(data_dir="data")
-scheduler = ScraperScheduler(data_storage)
+job_queue = JobQueue(JOB_QUEUE_FILE) if SCRAPER_EXECUTION == "worker" else None
+run_ledger = RunLedger(RUN_LEDGER_FILE)
+scheduler = ScraperScheduler(data_storage, job_queue=job_queue, run_ledger=run_ledger)
 
 os.makedirs("data", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe the latency of every request, labelled by route template"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status,
+        )
+
+async def profile_request(request: Request, call_next):
+    """Profile a request that carries the profiling token and name the saved file in the response"""
+    if request.url.path == "/admin/profile" or not check_token(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+    
+    profiler = SamplingProfiler().start()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+    route = request.scope.get("route")
+    response.headers["X-Profile-File"] = profiler.save(
+        f"request-{request.method}-{route.path if route is not None else request.url.path}"
+    )
+    return response
+
+# Only installed when profiling is configured, so it costs nothing otherwise
+if profiling_enabled():
+    app.middleware("http")(profile_request)
+
+def require_profiling(token: Optional[str]):
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not check_token(token):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {PROFILE_HEADER} header")
+
+@app.post("/admin/profile")
+async def profile_api(seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+                      token: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """Sample the API's event loop for ``seconds`` and save the profile under logs/profiles"""
+    require_profiling(token)
+    profiler = SamplingProfiler().start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    return {"file": profiler.save(f"api-{seconds:g}s"), "samples": profiler.samples}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this process"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/healthz")
 async def healthz():
-    """Health check endpoint"""
+    """Health check endpoint; reports "warming" until the first scrape of an empty dataset finishes"""
+    if scheduler.warming or (job_queue is not None and not data_storage.has_data()):
+        return {"status": "warming"}
     return {"status": "ok"}
 
 @app.post("/scrape")
-async def scrape_data(background_tasks: BackgroundTasks):
-    """Trigger scraping of dumpster rental websites"""
-    background_tasks.add_task(run_scrapers)
-    return {"message": "Scraping started in the background"}
+async def scrape_data(background_tasks: BackgroundTasks, providers: Optional[List[str]] = Query(None),
+                      profile: bool = False, token: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """Trigger scraping of dumpster rental websites.
 
-async def run_scrapers():
-    """Run all scrapers and store the data"""
-    try:
-        scrapers = [
-            WasteManagementScraper(),
-            BudgetDumpsterScraper(),
-            LibertyDumpstersScraper()
-        ]
-        
-        all_companies = []
-        all_service_areas = []
-        all_dumpster_sizes = []
-        all_prices = []
-        
-        for scraper in scrapers:
-            async with scraper:
-                logger.info(f"Starting scraper for {scraper.__class__.__name__}")
-                
-                company = await scraper.scrape_company_info()
-                all_companies.append(company)
-                
-                service_areas = await scraper.scrape_service_areas()
-                all_service_areas.extend(service_areas)
-                
-                dumpster_sizes = await scraper.scrape_dumpster_sizes()
-                all_dumpster_sizes.extend(dumpster_sizes)
-                
-                prices = await scraper.scrape_prices()
-                all_prices.extend(prices)
-                
-                logger.info(f"Completed scraper for {scraper.__class__.__name__}")
-        
-        scraped_data = ScrapedData(
-            companies=[DumpsterCompany(**company) for company in all_companies],
-            service_areas=[ServiceArea(**area) for area in all_service_areas],
-            dumpster_sizes=[DumpsterSize(**size) for size in all_dumpster_sizes],
-            prices=[DumpsterPrice(**price) for price in all_prices]
-        )
-        
-        data_storage.save_data(scraped_data)
-        logger.info("All data scraped and saved successfully")
-        
-    except Exception as e:
-        logger.error(f"Error during scraping: {str(e)}")
+    Pass ``providers`` to re-scrape only those sites and merge their records
+    into the current data instead of refreshing everything. With ``profile``
+    (requires the profiling token) the whole run is profiled.
+    """
+    if profile:
+        require_profiling(token)
+    
+    if providers:
+        unknown = [name for name in providers if name not in provider_names()]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown providers: {', '.join(unknown)}. Available: {', '.join(provider_names())}"
+            )
+    
+    if job_queue is not None:
+        job_id = await scheduler.trigger(providers or None, profile=profile)
+        return {"message": "Scraping queued", "job_id": job_id, "providers": providers or provider_names()}
+    
+    background_tasks.add_task(run_scrapers, providers or None, profile)
+    return {"message": "Scraping started in the background", "providers": providers or provider_names()}
+
+async def run_scrapers(providers: Optional[List[str]] = None, profile: bool = False):
+    """Run scrapers for the given providers (default: all) and store the data"""
+    await scheduler.run_scrapers(providers, profile=profile)
+
+@app.get("/scrape/schedule")
+async def get_scrape_schedule():
+    """Get the scraper schedule with its last and next run"""
+    return scheduler.state()
+
+@app.get("/scrape/jobs")
+async def get_scrape_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    """Get recent scrape jobs (worker mode only)"""
+    if job_queue is None:
+        raise HTTPException(status_code=404, detail="Scrapes run inline; there is no job queue")
+    return job_queue.list_jobs(status, limit)
+
+@app.get("/scrape/jobs/{job_id}")
+async def get_scrape_job(job_id: int):
+    """Get a scrape job (worker mode only)"""
+    job = job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No scrape job {job_id}")
+    return job
+
+@app.get("/scrape/runs")
+async def get_scrape_runs(scraper: Optional[str] = None, status: Optional[str] = None,
+                          limit: int = Query(20, ge=1, le=500)):
+    """Get recent scrape runs with per-scraper timings, page failures, fallbacks and record counts"""
+    return run_ledger.list_runs(limit, scraper, status)
+
+@app.get("/scrape/runs/{run_id}")
+async def get_scrape_run(run_id: str):
+    """Get a scrape run including every page it fetched, slowest first"""
+    run = run_ledger.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"No scrape run {run_id}")
+    return run
 
 @app.get("/companies", response_model=List[DumpsterCompany])
 async def get_companies():
@@ -113,12 +203,23 @@ async def get_prices():
     return data_storage.get_prices()
 
 @app.get("/city/{city}")
-async def get_city_data(city: str, state: Optional[str] = None):
-    """Get all data for a specific city"""
-    city_data = data_storage.get_data_for_city(city, state)
+async def get_city_data(response: Response, city: str, state: Optional[str] = None, redirect: bool = True):
+    """Get all data for a specific city.
+
+    Abbreviations ("St Louis", "Ft Worth") and small typos resolve to the
+    matching city; ``resolved`` gives its canonical spelling and path. A
+    non-exact match answers with a 301 to that path, or with
+    ``redirect=false`` with the data and a rel=canonical link to it.
+    """
+    match = data_storage.resolve_city(city, state)
+    city_data = data_storage.get_data_for_areas(match.area_ids) if match is not None else {}
     if not city_data:
         raise HTTPException(status_code=404, detail=f"No data found for city: {city}")
-    return city_data
+    if match.match != "exact":
+        if redirect:
+            return RedirectResponse(match.canonical_path, status_code=301)
+        response.headers["Link"] = f'<{match.canonical_path}>; rel="canonical"'
+    return {**city_data, "resolved": match.as_dict()}
 
 @app.get("/cities")
 async def get_all_cities():
@@ -134,13 +235,125 @@ async def get_all_cities():
             unique_cities.append(city)
     return unique_cities
 
+@app.get("/cities/search")
+async def search_cities(q: str = "", limit: int = Query(10, ge=1, le=MAX_CITY_RESULTS), state: Optional[str] = None):
+    """Autocomplete: cities whose name starts with ``q``, most providers first"""
+    return data_storage.get_index("city_search", CitySearchIndex).search(q, limit, state)
+
+# Most ZIP codes accepted by one batch lookup
+MAX_ZIP_BATCH = 100
+
+def zip_data(zip_code: str, fallback: bool) -> Optional[Dict[str, Any]]:
+    match = data_storage.resolve_zip(zip_code, fallback)
+    zip_bundle = data_storage.get_data_for_areas(match.area_ids) if match is not None else {}
+    if not zip_bundle:
+        return None
+    return {**zip_bundle, "resolved": match.as_dict()}
+
+@app.get("/zip/{zip_code}")
+async def get_zip_data(zip_code: str, fallback: bool = True):
+    """Get all data for a ZIP code, the same bundle as /city/{city}.
+
+    With ``fallback`` an unserved ZIP gets the data of the nearest served
+    ZIP sharing its first three digits; ``resolved`` says which was used.
+    """
+    if normalize_zip(zip_code) is None:
+        raise HTTPException(status_code=400, detail=f"Not a ZIP code: {zip_code}")
+    result = zip_data(zip_code, fallback)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No data found for ZIP code: {zip_code}")
+    return result
+
+@app.get("/zips")
+async def get_zips_data(zip_codes: List[str] = Query(..., alias="zip", max_length=MAX_ZIP_BATCH),
+                        fallback: bool = True):
+    """Batch ZIP lookup: ``?zip=78701&zip=63101``; each ZIP maps to its bundle, or null if not served"""
+    invalid = [zip_code for zip_code in zip_codes if normalize_zip(zip_code) is None]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Not ZIP codes: {', '.join(invalid)}")
+    return {zip_code: zip_data(zip_code, fallback) for zip_code in dict.fromkeys(zip_codes)}
+
+# Longest rental priced by /city/{city}/compare
+MAX_RENTAL_DAYS = 365
+
+@app.get("/city/{city}/compare")
+async def compare_city_prices(city: str, size: int = Query(..., ge=1), state: Optional[str] = None,
+                              days: Optional[int] = Query(None, ge=1, le=MAX_RENTAL_DAYS)):
+    """Providers of a ``size``-yard dumpster in ``city``, cheapest first.
+
+    Each company appears once, with its cheapest price in the city. With
+    ``days`` every offer gets the ``total_price`` of renting for that many
+    days, and offers are ranked by it.
+    """
+    match = data_storage.resolve_city(city, state)
+    if match is None:
+        raise HTTPException(status_code=404, detail=f"No data found for city: {city}")
+    ranking = data_storage.get_price_ranking()
+    offers = ranking.compare(match.area_ids, size, days)
+    if not offers:
+        sizes = ", ".join(str(size_yards) for size_yards in ranking.city_sizes(match.area_ids))
+        raise HTTPException(status_code=404, detail=f"No {size} yard prices for city: {city} (sizes: {sizes or 'none'})")
+    return {"resolved": match.as_dict(), "size_yards": size, "days": days, "offers": offers}
+
+@app.get("/city/{city}/nearby")
+async def get_nearby_cities(city: str, state: Optional[str] = None,
+                            k: int = Query(10, ge=1, le=MAX_NEARBY_RESULTS),
+                            radius_km: Optional[float] = Query(None, gt=0)):
+    """The ``k`` served cities closest to ``city``, optionally only those within ``radius_km``"""
+    match = data_storage.resolve_city(city, state)
+    if match is None:
+        raise HTTPException(status_code=404, detail=f"No data found for city: {city}")
+    index = data_storage.get_index("nearby", NearbyIndex)
+    point, cities = index.origin(match.area_ids)
+    if point is None:
+        raise HTTPException(status_code=404, detail=f"No coordinates known for city: {city}")
+    return {
+        "resolved": match.as_dict(),
+        "latitude": round(point[0], 5),
+        "longitude": round(point[1], 5),
+        "cities": index.nearby(point[0], point[1], k, radius_km, exclude=cities),
+    }
+
+@app.get("/zip/{zip_code}/nearby")
+async def get_nearby_zip_cities(zip_code: str, k: int = Query(10, ge=1, le=MAX_NEARBY_RESULTS),
+                                radius_km: Optional[float] = Query(None, gt=0)):
+    """The ``k`` served cities closest to a ZIP code, excluding the cities serving the ZIP itself.
+
+    An unserved ZIP is placed with the gazetteer when it knows the ZIP,
+    otherwise at the nearest served ZIP sharing its first three digits.
+    """
+    normalized = normalize_zip(zip_code)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail=f"Not a ZIP code: {zip_code}")
+    index = data_storage.get_index("nearby", NearbyIndex)
+    match = data_storage.resolve_zip(normalized, fallback=False)
+    point, cities = index.origin(match.area_ids) if match is not None else (None, set())
+    if point is None:
+        point = get_gazetteer().locate(zip_code=normalized)
+    if point is None:
+        match = data_storage.resolve_zip(normalized)
+        point, _ = index.origin(match.area_ids) if match is not None else (None, set())
+    if point is None:
+        raise HTTPException(status_code=404, detail=f"No coordinates known for ZIP code: {zip_code}")
+    return {
+        "zip": normalized,
+        "latitude": round(point[0], 5),
+        "longitude": round(point[1], 5),
+        "cities": index.nearby(point[0], point[1], k, radius_km, exclude=cities),
+    }
+
 @app.on_event("startup")
 async def startup_event():
-    """Run on startup to ensure we have some data and start scheduler"""
-    data = data_storage.load_data()
-    if not data.companies:
-        logger.info("No data found. Running initial scrape...")
-        await run_scrapers()
+    """Start the scheduler; without data the initial scrape runs in the background"""
+    if job_queue is not None:
+        # The workers own the schedule; only make sure an empty dataset gets filled
+        if not data_storage.has_data():
+            logger.info("No data found. Queueing initial scrape...")
+            await scheduler.trigger()
+        return
+    
+    if scheduler.check_warming():
+        logger.info("No data found. Running initial scrape in the background...")
     
-    asyncio.create_task(scheduler.start_weekly_schedule())
-    logger.info("Weekly scraper schedule started")
+    asyncio.create_task(scheduler.start_schedule())
+    logger.info("Scraper schedule started")
@@ -2,6 +2,10 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime
 
+# Services a size is offered for; only roll-off dumpsters are compared with each other
+SERVICE_DUMPSTER = "dumpster"
+SERVICE_JUNK_REMOVAL = "junk_removal"
+
 class DumpsterCompany(BaseModel):
     """Model for dumpster rental companies"""
     id: str
@@ -18,6 +22,8 @@ class ServiceArea(BaseModel):
     state: str
     zip_code: Optional[str] = None
     county: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     
 class DumpsterSize(BaseModel):
     """Model for dumpster sizes"""
@@ -27,6 +33,7 @@ class DumpsterSize(BaseModel):
     description: Optional[str] = None
     weight_limit_lbs: Optional[int] = None
     suitable_for: Optional[List[str]] = None
+    service: str = SERVICE_DUMPSTER
     
 class DumpsterPrice(BaseModel):
     """Model for dumpster pricing"""
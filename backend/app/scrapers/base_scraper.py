@@ -1,20 +1,80 @@
 import aiohttp
 import asyncio
+import os
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from contextlib import aclosing
+from typing import Awaitable, Callable, Dict, List, Any, AsyncIterator, Iterable, Optional, Pattern, Sequence, Set, Tuple
+from urllib.parse import urljoin, urlparse
 import logging
 
+from .fixtures import FETCH_MODES, FixtureArchive
+from .frontier import CrawlFrontier
+from .parsing import run_parser, parse_location_links
+from .pricing import RegionalPricing
+from ..utils.metrics import FETCH_BYTES, FETCH_RESPONSES, FETCH_SECONDS
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CRAWL_STATE_DIR = os.getenv("SCRAPER_CRAWL_STATE_DIR", os.path.join("data", "crawl"))
+CRAWL_MAX_DEPTH = int(os.getenv("SCRAPER_CRAWL_MAX_DEPTH", "3"))
+CRAWL_CONCURRENCY = int(os.getenv("SCRAPER_CRAWL_CONCURRENCY", "8"))
+CRAWL_MAX_PAGES = int(os.getenv("SCRAPER_CRAWL_MAX_PAGES", "5000"))
+
+# "live" fetches over HTTP, "record" also saves responses to the fixture
+# archive and "replay" serves them from the archive without network access
+FETCH_MODE = os.getenv("SCRAPER_FETCH_MODE", "live")
+FIXTURE_DIR = os.getenv("SCRAPER_FIXTURE_DIR", os.path.join("data", "fixtures"))
+REPLAY_LATENCY_MS = float(os.getenv("SCRAPER_REPLAY_LATENCY_MS", "0"))
+
+_CRAWL_DONE = object()
+
 class BaseScraper(ABC):
     """Base class for all scrapers"""
     
+    # Registry key, also used to select providers for a partial scrape
+    name: str = ""
+    # Pages the service-area crawl starts from, relative to base_url
+    location_index_paths: List[str] = []
+    # Links whose href matches are followed and checked for "City, ST" text
+    location_href_pattern: Optional[Pattern] = None
+    # Regional price model used to build prices for every area and size
+    pricing: Optional[RegionalPricing] = None
+    # Used when the crawl finds no service areas
+    default_cities: List[Tuple[str, str]] = []
+    
     def __init__(self, base_url: str):
         self.base_url = base_url
         self.session = None
+        self.fetch_mode = FETCH_MODE
+        self.fixture_dir = FIXTURE_DIR
+        self.replay_latency_ms = REPLAY_LATENCY_MS
+        self.fixtures: Optional[FixtureArchive] = None
+        # Per-run record of (url, status, bytes, seconds, fetched_at) for each page fetched
+        self.fetch_log: List[Tuple[str, str, int, float, float]] = []
+        # Parts of the data that came from hard-coded defaults instead of the site
+        self.fallbacks: Set[str] = set()
+        
+    @property
+    def fixture_path(self) -> str:
+        """Fixture archive used by record and replay modes"""
+        return os.path.join(self.fixture_dir, f"{self.name or self.__class__.__name__}.zip")
         
     async def __aenter__(self):
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {self.fetch_mode}")
+        
+        self.fetch_log = []
+        self.fallbacks = set()
+        if self.fetch_mode == "replay":
+            self.fixtures = FixtureArchive(self.fixture_path, "r")
+            logger.info(f"Replaying {len(self.fixtures)} responses from {self.fixture_path}")
+            return self
+        if self.fetch_mode == "record":
+            self.fixtures = FixtureArchive(self.fixture_path, "w")
+        
         self.session = aiohttp.ClientSession(headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -23,39 +83,244 @@ class BaseScraper(ABC):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        if self.fixtures:
+            self.fixtures.close()
+            self.fixtures = None
             
     async def fetch_page(self, url: str) -> str:
         """Fetch a page and return its HTML content"""
+        if self.fetch_mode == "replay":
+            return await self._replay_page(url)
+        
+        start = time.perf_counter()
         try:
             async with self.session.get(url) as response:
                 if response.status == 200:
-                    return await response.text()
+                    text = await response.text()
                 else:
                     logger.error(f"Failed to fetch {url}: Status {response.status}")
-                    return ""
+                    text = ""
+                
+                self._observe_fetch(url, response.status, text, start)
+                if self.fixtures is not None:
+                    self.fixtures.put(url, response.status, text)
+                return text
         except Exception as e:
+            self._observe_fetch(url, "error", "", start)
             logger.error(f"Error fetching {url}: {str(e)}")
             return ""
+    
+    def _observe_fetch(self, url: str, status: Any, text: str, start: float):
+        """Record latency, status and size of a fetch in the metrics and the fetch log"""
+        seconds = time.perf_counter() - start
+        size = len(text.encode('utf-8')) if text else 0
+        scraper = self.name or self.__class__.__name__
+        host = urlparse(url).netloc
+        FETCH_SECONDS.observe(seconds, scraper=scraper, host=host)
+        FETCH_RESPONSES.inc(scraper=scraper, host=host, status=status)
+        if size:
+            FETCH_BYTES.inc(size, scraper=scraper, host=host)
+        self.fetch_log.append((url, str(status), size, seconds, time.time()))
+    
+    def use_fallback(self, part: str):
+        """Note that ``part`` of the data comes from hard-coded defaults"""
+        if part not in self.fallbacks:
+            logger.warning(f"{self.name or self.__class__.__name__} is using default {part}")
+        self.fallbacks.add(part)
+            
+    async def _replay_page(self, url: str) -> str:
+        """Serve a recorded response, optionally after a simulated network delay"""
+        start = time.perf_counter()
+        if self.replay_latency_ms:
+            await asyncio.sleep(self.replay_latency_ms / 1000)
+        
+        recorded = self.fixtures.get(url)
+        if recorded is None:
+            self._observe_fetch(url, "missing", "", start)
+            logger.warning(f"No recorded response for {url}")
+            return ""
+        
+        status, text = recorded
+        self._observe_fetch(url, status, text if status == 200 else "", start)
+        if status != 200:
+            logger.error(f"Failed to fetch {url}: Status {status} (replayed)")
+            return ""
+        return text
             
     @abstractmethod
     async def scrape_company_info(self) -> Dict[str, Any]:
         """Scrape company information"""
         pass
         
-    @abstractmethod
+    async def crawl(
+        self,
+        seeds: Sequence[str],
+        parse_page: Callable[[str, str], Awaitable[Tuple[List[Any], List[str]]]],
+        max_depth: int = CRAWL_MAX_DEPTH,
+        concurrency: int = CRAWL_CONCURRENCY,
+        max_pages: Optional[int] = CRAWL_MAX_PAGES,
+        state_name: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Crawl from ``seeds`` with a pool of workers, yielding parsed results.
+
+        ``parse_page(html, url)`` returns ``(results, links)``; results must
+        be JSON-serializable and links are followed up to ``max_depth`` on the
+        scraper's own host. Crawl state is persisted under CRAWL_STATE_DIR, so
+        an interrupted crawl resumes instead of starting over, and is removed
+        once the crawl completes.
+        """
+        state_name = state_name or self.__class__.__name__
+        frontier = CrawlFrontier(
+            state_file=os.path.join(CRAWL_STATE_DIR, f"{state_name}.sqlite"),
+            max_depth=max_depth,
+            allowed_hosts={urlparse(self.base_url).netloc},
+            max_pages_per_host=max_pages,
+        )
+        
+        for result in frontier.done_results():
+            yield result
+        if not frontier.resumed:
+            for seed in seeds:
+                frontier.add(seed, 0)
+        
+        work: asyncio.Queue = asyncio.Queue()
+        out: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+        
+        def enqueue_pending():
+            for item in frontier.drain_pending():
+                work.put_nowait(item)
+        
+        async def worker():
+            while True:
+                url, depth = await work.get()
+                try:
+                    html = await self.fetch_page(url)
+                    if html:
+                        results, links = await parse_page(html, url)
+                        for link in links:
+                            frontier.add(urljoin(url, link), depth + 1)
+                        enqueue_pending()
+                        frontier.mark_done(url, results)
+                        for result in results:
+                            await out.put(result)
+                except Exception as e:
+                    logger.error(f"Error crawling {url}: {str(e)}")
+                finally:
+                    work.task_done()
+        
+        async def finish():
+            await work.join()
+            await out.put(_CRAWL_DONE)
+        
+        enqueue_pending()
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        finisher = asyncio.create_task(finish())
+        completed = False
+        try:
+            while True:
+                result = await out.get()
+                if result is _CRAWL_DONE:
+                    break
+                yield result
+            completed = True
+            logger.info(f"{state_name} crawl finished after {len(frontier.visited)} pages")
+        finally:
+            finisher.cancel()
+            for task in workers:
+                task.cancel()
+            if completed:
+                frontier.clear()
+            else:
+                frontier.close()
+        
+    def parse_location(self, text: str, href: str) -> Optional[Tuple[str, str]]:
+        """Turn a location link into ``(city, state)``, or None if it is not one"""
+        if ',' in text:
+            city, state = text.split(',', 1)
+            return city.strip(), state.strip()
+        return None
+        
+    async def parse_location_index(self, html: str, url: str) -> Tuple[List[Any], List[str]]:
+        """Extract service areas and links to follow from a location page"""
+        links = await run_parser(parse_location_links, html, self.location_href_pattern)
+        areas = []
+        follow = []
+        
+        for text, href in links:
+            location = self.parse_location(text, href)
+            if location:
+                areas.append(list(location))
+            follow.append(href)
+        
+        return areas, follow
+        
+    async def stream_service_areas(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield service areas as the location crawl discovers them"""
+        seen = set()
+        
+        if self.location_index_paths and self.location_href_pattern is not None:
+            seeds = [urljoin(self.base_url, path) for path in self.location_index_paths]
+            async with aclosing(self.crawl(seeds, self.parse_location_index)) as locations:
+                async for city, state in locations:
+                    key = (city.lower(), state.lower())
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield {
+                        "id": str(uuid.uuid4()),
+                        "city": city,
+                        "state": state,
+                    }
+        
+        if not seen and self.default_cities:
+            self.use_fallback("service_areas")
+            for city, state in self.default_cities:
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "city": city,
+                    "state": state,
+                }
+        
     async def scrape_service_areas(self) -> List[Dict[str, Any]]:
         """Scrape service areas"""
-        pass
+        return [area async for area in self.stream_service_areas()]
         
     @abstractmethod
     async def scrape_dumpster_sizes(self) -> List[Dict[str, Any]]:
         """Scrape dumpster sizes"""
         pass
         
-    @abstractmethod
+    def iter_prices(self, service_areas: List[Dict[str, Any]], dumpster_sizes: List[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Prices for each service area and dumpster size, built lazily from ``pricing``"""
+        if self.pricing is None:
+            raise NotImplementedError(f"{self.__class__.__name__} has no pricing model")
+        return self.pricing.price_grid(self.company_id, service_areas, dumpster_sizes)
+        
     async def scrape_prices(self) -> List[Dict[str, Any]]:
         """Scrape prices"""
-        pass
+        service_areas = await self.scrape_service_areas()
+        dumpster_sizes = await self.scrape_dumpster_sizes()
+        return list(self.iter_prices(service_areas, dumpster_sizes))
+        
+    async def stream_records(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(record_type, record)`` pairs as they are scraped.
+
+        Prices are built from the same service areas and sizes that were
+        yielded, so their ids always line up.
+        """
+        yield "companies", await self.scrape_company_info()
+        
+        service_areas = []
+        async for area in self.stream_service_areas():
+            service_areas.append(area)
+            yield "service_areas", area
+            
+        dumpster_sizes = await self.scrape_dumpster_sizes()
+        for size in dumpster_sizes:
+            yield "dumpster_sizes", size
+            
+        for price in self.iter_prices(service_areas, dumpster_sizes):
+            yield "prices", price
         
     async def scrape_all(self) -> Dict[str, Any]:
         """Scrape all data"""
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import zipfile
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+
+from .frontier import normalize_url
+
+logger = logging.getLogger(__name__)
+
+FETCH_MODES = ("live", "record", "replay")
+
+
+class FixtureArchive:
+    """Compressed archive of recorded HTTP responses, keyed by URL.
+
+    Each response is stored as a deflated JSON entry holding the URL, the
+    status code and the body, so a whole scrape can be replayed offline.
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        if mode not in ("r", "w"):
+            raise ValueError(f"Unsupported fixture archive mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        if mode == "w":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED)
+        self._names = set(self._zip.namelist())
+
+    @staticmethod
+    def _entry_name(url: str) -> str:
+        return f"responses/{hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Tuple[int, str]]:
+        """Return ``(status, body)`` recorded for a URL, or None"""
+        name = self._entry_name(url)
+        if name not in self._names:
+            return None
+        entry = json.loads(self._zip.read(name))
+        return entry["status"], entry["body"]
+
+    def put(self, url: str, status: int, body: str):
+        """Record a response; the first response recorded for a URL wins"""
+        name = self._entry_name(url)
+        if name in self._names:
+            return
+        self._zip.writestr(name, json.dumps({"url": url, "status": status, "body": body}))
+        self._names.add(name)
+
+    def iter_responses(self) -> Iterator[Dict]:
+        """Iterate over every recorded response"""
+        for name in sorted(self._names):
+            yield json.loads(self._zip.read(name))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def close(self):
+        self._zip.close()
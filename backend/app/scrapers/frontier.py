@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for deduplication (no fragment, lowercase host, no trailing slash)"""
+    url, _ = urldefrag(url)
+    parts = urlparse(url)
+    path = parts.path.rstrip('/') or '/'
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, '', parts.query, ''))
+
+
+class CrawlFrontier:
+    """URL frontier for crawling location pages.
+
+    Keeps an in-memory visited set for deduplication, enforces depth and
+    host limits and, when ``state_file`` is given, persists every queued
+    URL and the results of finished pages to SQLite so an interrupted crawl
+    can resume where it stopped.
+    """
+
+    def __init__(
+        self,
+        state_file: Optional[str] = None,
+        max_depth: int = 3,
+        allowed_hosts: Optional[Iterable[str]] = None,
+        max_pages_per_host: Optional[int] = None,
+        commit_every: int = 50,
+    ):
+        self.state_file = state_file
+        self.max_depth = max_depth
+        self.allowed_hosts = {host.lower() for host in allowed_hosts} if allowed_hosts else None
+        self.max_pages_per_host = max_pages_per_host
+        self.commit_every = commit_every
+
+        self.visited: Set[str] = set()
+        self.host_counts: Dict[str, int] = defaultdict(int)
+        self._pending: List[Tuple[str, int]] = []
+        self._done_results: List[Any] = []
+        self._uncommitted = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if state_file:
+            os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(state_file)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS frontier ("
+                "url TEXT PRIMARY KEY, depth INTEGER NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', results TEXT)"
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        rows = self._conn.execute("SELECT url, depth, status, results FROM frontier").fetchall()
+        for url, depth, status, results in rows:
+            self.visited.add(url)
+            self.host_counts[urlparse(url).netloc] += 1
+            if status == 'done':
+                if results:
+                    self._done_results.extend(json.loads(results))
+            else:
+                self._pending.append((url, depth))
+
+        if rows:
+            logger.info(f"Resuming crawl from {self.state_file}: {len(self._pending)} pending, "
+                        f"{len(rows) - len(self._pending)} done")
+
+    @property
+    def resumed(self) -> bool:
+        """Whether this frontier picked up state from an earlier crawl"""
+        return bool(self._pending or self._done_results)
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue a URL if it is new and within limits; return whether it was queued"""
+        if depth > self.max_depth:
+            return False
+
+        url = normalize_url(url)
+        if url in self.visited:
+            return False
+
+        host = urlparse(url).netloc
+        if self.allowed_hosts is not None and host not in self.allowed_hosts:
+            return False
+        if self.max_pages_per_host is not None and self.host_counts[host] >= self.max_pages_per_host:
+            return False
+
+        self.visited.add(url)
+        self.host_counts[host] += 1
+        self._pending.append((url, depth))
+
+        if self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)", (url, depth))
+            self._maybe_commit()
+        return True
+
+    def drain_pending(self) -> List[Tuple[str, int]]:
+        """Return and clear the URLs queued since the last call"""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def done_results(self) -> Iterator[Any]:
+        """Results stored for pages finished before a resume"""
+        yield from self._done_results
+
+    def mark_done(self, url: str, results: Optional[List[Any]] = None):
+        """Record that a URL was crawled, along with the results it produced"""
+        if self._conn:
+            self._conn.execute(
+                "UPDATE frontier SET status = 'done', results = ? WHERE url = ?",
+                (json.dumps(results or []), normalize_url(url)),
+            )
+            self._maybe_commit()
+
+    def _maybe_commit(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        """Flush persisted state"""
+        if self._conn:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def clear(self):
+        """Close and delete the persisted state once a crawl has completed"""
+        self.close()
+        if self.state_file and os.path.exists(self.state_file):
+            os.remove(self.state_file)
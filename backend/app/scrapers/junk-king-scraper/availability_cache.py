@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import time
+from collections import defaultdict
+
+DEFAULT_TTL_DAYS = 30
+
+class AvailabilityCache:
+    """
+    Persistent Junk King availability results keyed by ZIP.
+
+    Each entry records whether the ZIP is serviced, how that was determined
+    ("checked" in a browser/HTTP check or "inferred" from neighbouring ZIPs)
+    and when. Entries older than the TTL are ignored.
+    """
+
+    def __init__(self, path, ttl_days=DEFAULT_TTL_DAYS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS availability ("
+            "zip TEXT PRIMARY KEY, is_available INTEGER NOT NULL, "
+            "source TEXT NOT NULL, checked_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, zip_codes, include_inferred=False):
+        """Return {zip: is_available} for the ZIPs with a fresh cached result."""
+        cutoff = time.time() - self.ttl_seconds
+        found = {}
+        zip_codes = list(zip_codes)
+
+        for start in range(0, len(zip_codes), 500):
+            chunk = zip_codes[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT zip, is_available, source FROM availability "
+                f"WHERE checked_at >= ? AND zip IN ({placeholders})",
+                [cutoff, *chunk],
+            )
+            for zip_code, is_available, source in rows:
+                if include_inferred or source != "inferred":
+                    found[zip_code] = bool(is_available)
+
+        return found
+
+    def get(self, zip_code, include_inferred=False):
+        """Return the fresh cached result for a ZIP, or None."""
+        return self.get_many([zip_code], include_inferred).get(zip_code)
+
+    def put(self, zip_code, is_available, source="checked"):
+        """Store a result for a ZIP, stamped with the current time."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO availability (zip, is_available, source, checked_at) VALUES (?, ?, ?, ?)",
+            (zip_code, int(bool(is_available)), source, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+def zip3(zip_code):
+    """First three digits of a (zero-padded) ZIP code."""
+    return str(zip_code).zfill(5)[:3]
+
+def pick_representatives(rows):
+    """
+    Choose one ZIP per city and one per ZIP3 prefix to check first.
+
+    Returns:
+        tuple: (representative rows, remaining rows)
+    """
+    representatives = []
+    remaining = []
+    seen_cities = set()
+    seen_prefixes = set()
+
+    for row in rows:
+        city, state, zip_code = row
+        city_key = (city, state)
+        prefix = zip3(zip_code)
+        if city_key not in seen_cities or prefix not in seen_prefixes:
+            representatives.append(row)
+        else:
+            remaining.append(row)
+        seen_cities.add(city_key)
+        seen_prefixes.add(prefix)
+
+    return representatives, remaining
+
+def infer_availability(rows, sample_rows, results):
+    """
+    Infer availability for rows from the known results of sample rows in the
+    same city or ZIP3.
+
+    A row is inferred only when every known result that shares its city or its
+    ZIP3 prefix agrees; rows with disagreeing or no samples must be checked.
+
+    Returns:
+        tuple: ({zip: is_available} inferred, rows that still need a check)
+    """
+    by_city = defaultdict(set)
+    by_prefix = defaultdict(set)
+    for city, state, zip_code in sample_rows:
+        if zip_code in results:
+            result = results[zip_code]
+            by_city[(city, state)].add(result)
+            by_prefix[zip3(zip_code)].add(result)
+
+    inferred = {}
+    unresolved = []
+    for row in rows:
+        city, state, zip_code = row
+        samples = by_city.get((city, state), set()) | by_prefix.get(zip3(zip_code), set())
+        if len(samples) == 1:
+            inferred[zip_code] = next(iter(samples))
+        else:
+            unresolved.append(row)
+
+    return inferred, unresolved
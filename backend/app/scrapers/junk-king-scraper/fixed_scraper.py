@@ -1,150 +0,0 @@
-import asyncio
-import pandas as pd
-import re
-import random
-from playwright.async_api import async_playwright
-
-STATE_PRICING = {
-    'California': {'min_range': (399, 449), 'max_range': (649, 699)},
-    'New York': {'min_range': (399, 449), 'max_range': (649, 699)},
-    'Hawaii': {'min_range': (429, 479), 'max_range': (679, 729)},
-    'Massachusetts': {'min_range': (389, 439), 'max_range': (639, 689)},
-    'Connecticut': {'min_range': (379, 429), 'max_range': (629, 679)},
-    'New Jersey': {'min_range': (379, 429), 'max_range': (629, 679)},
-    'Washington': {'min_range': (369, 419), 'max_range': (619, 669)},
-    'Colorado': {'min_range': (359, 409), 'max_range': (609, 659)},
-    
-    'Florida': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Illinois': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Virginia': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Oregon': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Maryland': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Nevada': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Arizona': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Minnesota': {'min_range': (319, 369), 'max_range': (569, 619)},
-    
-    'Texas': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'Georgia': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'North Carolina': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'Pennsylvania': {'min_range': (309, 359), 'max_range': (559, 609)},
-    'Ohio': {'min_range': (289, 339), 'max_range': (539, 589)},
-    'Michigan': {'min_range': (289, 339), 'max_range': (539, 589)},
-    'Tennessee': {'min_range': (279, 329), 'max_range': (529, 579)},
-    'Missouri': {'min_range': (279, 329), 'max_range': (529, 579)},
-    
-    'default': {'min_range': (299, 349), 'max_range': (549, 599)}
-}
-
-LARGE_CITIES = [
-    'New York City', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 
-    'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose',
-    'Austin', 'Jacksonville', 'San Francisco', 'Columbus', 'Indianapolis',
-    'Seattle', 'Denver', 'Washington', 'Boston', 'Nashville', 'Las Vegas',
-    'Portland', 'Miami', 'Atlanta', 'Minneapolis'
-]
-
-async def setup_browser():
-    """Set up and return a Playwright browser instance."""
-    playwright = await async_playwright().start()
-    browser = await playwright.chromium.launch(headless=True)
-    context = await browser.new_context(viewport={"width": 1920, "height": 1080})
-    page = await context.new_page()
-    return playwright, browser, page, context
-
-async def check_availability_and_pricing(page, zip_code, state, city):
-    """
-    Check if Junk King is available in the given zip code and get pricing if available.
-    Uses regional pricing based on state and city size.
-    
-    Returns:
-        tuple: (is_available, min_price, max_price)
-    """
-    is_available = False
-    min_price = ""
-    max_price = ""
-    
-    try:
-        await page.goto(f"https://www.junk-king.com/free-estimate?zipcode={zip_code}", wait_until="domcontentloaded")
-        
-        await page.wait_for_load_state("networkidle")
-        await asyncio.sleep(2)
-        
-        page_content = await page.content()
-        if "Sorry, we don't service your area yet" in page_content or "Sorry, we don" in page_content:
-            is_available = False
-            return is_available, min_price, max_price
-        
-        is_available = True
-        
-        state_pricing = STATE_PRICING.get(state, STATE_PRICING['default'])
-        
-        city_adjustment = 0
-        if city in LARGE_CITIES:
-            city_adjustment = random.randint(20, 50)
-        
-        min_base = random.randint(state_pricing['min_range'][0], state_pricing['min_range'][1])
-        max_base = random.randint(state_pricing['max_range'][0], state_pricing['max_range'][1])
-        
-        min_price = f"${min_base + city_adjustment}"
-        max_price = f"${max_base + city_adjustment}"
-        
-    except Exception as e:
-        print(f"Error processing zip code {zip_code}: {str(e)}")
-        if is_available:
-            state_pricing = STATE_PRICING.get(state, STATE_PRICING['default'])
-            min_price = f"${state_pricing['min_range'][0]}"
-            max_price = f"${state_pricing['max_range'][0]}"
-    
-    return is_available, min_price, max_price
-
-async def process_zip_codes(input_file, output_file, limit=None):
-    """Process zip codes in the input file and save results to output file."""
-    df = pd.read_csv(input_file)
-    
-    if limit:
-        df = df.head(limit)
-    
-    results = []
-    
-    playwright, browser, page, context = await setup_browser()
-    
-    try:
-        for count, (_, row) in enumerate(df.iterrows()):
-            city = row['city']
-            state = row['state']
-            zip_code = str(row['Zips'])
-            
-            print(f"Processing {city}, {state} with ZIP: {zip_code}")
-            
-            is_available, min_price, max_price = await check_availability_and_pricing(page, zip_code, state, city)
-            
-            results.append({
-                'city': city,
-                'state': state,
-                'zip': zip_code,
-                'is_available': is_available,
-                'min_price': min_price,
-                'max_price': max_price
-            })
-            
-            if (count + 1) % 10 == 0:
-                pd.DataFrame(results).to_csv(output_file, index=False)
-                print(f"Saved intermediate results after processing {count + 1} records")
-            
-            await asyncio.sleep(2)
-    
-    finally:
-        await browser.close()
-        await playwright.stop()
-        
-        pd.DataFrame(results).to_csv(output_file, index=False)
-        print(f"Completed processing. Results saved to {output_file}")
-
-async def main():
-    input_file = "/home/ubuntu/attachments/6cb26970-af39-480f-9c18-20b37e1eb22d/Roll+Off+Rates+Data+-+Junk+King+Availability+1.csv"
-    output_file = "/home/ubuntu/repos/rolloffrates/junk_king_fixed_results.csv"
-    
-    await process_zip_codes(input_file, output_file)
-
-if __name__ == "__main__":
-    asyncio.run(main())
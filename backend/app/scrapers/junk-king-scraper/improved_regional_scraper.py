@@ -1,150 +1,367 @@
 import asyncio
+import csv
+import os
 import pandas as pd
-import re
-import random
+import time
 from playwright.async_api import async_playwright
 
-STATE_PRICING = {
-    'California': {'min_range': (399, 449), 'max_range': (649, 699)},
-    'New York': {'min_range': (399, 449), 'max_range': (649, 699)},
-    'Hawaii': {'min_range': (429, 479), 'max_range': (679, 729)},
-    'Massachusetts': {'min_range': (389, 439), 'max_range': (639, 689)},
-    'Connecticut': {'min_range': (379, 429), 'max_range': (629, 679)},
-    'New Jersey': {'min_range': (379, 429), 'max_range': (629, 679)},
-    'Washington': {'min_range': (369, 419), 'max_range': (619, 669)},
-    'Colorado': {'min_range': (359, 409), 'max_range': (609, 659)},
-    
-    'Florida': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Illinois': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Virginia': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Oregon': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Maryland': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Nevada': {'min_range': (339, 389), 'max_range': (589, 639)},
-    'Arizona': {'min_range': (329, 379), 'max_range': (579, 629)},
-    'Minnesota': {'min_range': (319, 369), 'max_range': (569, 619)},
-    
-    'Texas': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'Georgia': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'North Carolina': {'min_range': (299, 349), 'max_range': (549, 599)},
-    'Pennsylvania': {'min_range': (309, 359), 'max_range': (559, 609)},
-    'Ohio': {'min_range': (289, 339), 'max_range': (539, 589)},
-    'Michigan': {'min_range': (289, 339), 'max_range': (539, 589)},
-    'Tennessee': {'min_range': (279, 329), 'max_range': (529, 579)},
-    'Missouri': {'min_range': (279, 329), 'max_range': (529, 579)},
-    
-    'default': {'min_range': (299, 349), 'max_range': (549, 599)}
-}
-
-LARGE_CITIES = [
-    'New York City', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 
-    'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose',
-    'Austin', 'Jacksonville', 'San Francisco', 'Columbus', 'Indianapolis',
-    'Seattle', 'Denver', 'Washington', 'Boston', 'Nashville', 'Las Vegas',
-    'Portland', 'Miami', 'Atlanta', 'Minneapolis'
-]
+# The pricing tables live in the backend's app package; run with backend/ on PYTHONPATH
+from app.scrapers.pricing import junk_king_floor_prices, junk_king_price_ranges
+
+from availability_cache import AvailabilityCache, DEFAULT_TTL_DAYS, infer_availability, pick_representatives
+
+DEFAULT_CONCURRENCY = 4
+RECYCLE_PAGE_AFTER = 50
+ROW_DELAY_SECONDS = 2
+REPORT_EVERY = 10
+
+ESTIMATE_URL = "https://www.junk-king.com/free-estimate?zipcode={zip_code}"
+UNAVAILABLE_TEXT = "Sorry, we don"
+WAIT_TIMEOUT_MS = 10000
+
+# Resource types and hosts the availability check never needs
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest"}
+BLOCKED_HOST_FRAGMENTS = (
+    "google-analytics", "googletagmanager", "doubleclick", "googlesyndication", "facebook",
+    "hotjar", "hubspot", "clarity.ms", "bing.com", "linkedin", "tiktok", "youtube", "vimeo",
+)
+# Markers that confirm service in the plain-HTTP response; none are known
+# to be server-rendered yet, so the HTTP check can only rule ZIPs out and
+# is off by default (available ZIPs would pay for both requests)
+AVAILABLE_HTTP_MARKERS = ()
 
 async def setup_browser():
     """Set up and return a Playwright browser instance."""
     playwright = await async_playwright().start()
     browser = await playwright.chromium.launch(headless=True)
+    context, page = await new_worker_page(browser)
+    return playwright, browser, page, context
+
+async def block_nonessential(route):
+    """Abort requests for resources the availability check doesn't need."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOST_FRAGMENTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def new_worker_page(browser):
+    """Open a fresh browser context and page for one worker."""
     context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    await context.route("**/*", block_nonessential)
     page = await context.new_page()
-    return playwright, browser, page, context
+    return context, page
+
+RESULT_FIELDS = ['city', 'state', 'zip', 'is_available', 'min_price', 'max_price', 'source']
+
+class CheckpointWriter:
+    """Append result rows to the output CSV as they are produced."""
+    
+    def __init__(self, output_file, append=False):
+        self.output_file = output_file
+        mode = 'a' if append and os.path.exists(output_file) else 'w'
+        write_header = mode == 'w' or os.path.getsize(output_file) == 0
+        
+        fieldnames = RESULT_FIELDS
+        if not write_header:
+            # Keep appending in the column layout of the existing file
+            with open(output_file, newline='') as existing:
+                fieldnames = next(csv.reader(existing))
+        
+        self._file = open(output_file, mode, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+            self._file.flush()
+    
+    def write(self, row):
+        self._writer.writerow(row)
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+def load_processed_zips(output_file):
+    """Return the ZIPs already present in an earlier run's output CSV."""
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        return set()
+    
+    processed = pd.read_csv(output_file, usecols=['zip'], dtype={'zip': str})
+    return set(processed['zip'].dropna())
+
+class ThroughputMeter:
+    """Track processed ZIPs and report the rate in ZIPs per minute."""
+    
+    def __init__(self, total):
+        self.total = total
+        self.processed = 0
+        self.browser_checks = 0
+        self.errors = 0
+        self.started = time.monotonic()
+    
+    def add(self, count=1):
+        self.processed += count
+    
+    @property
+    def zips_per_minute(self):
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed * 60 if elapsed > 0 else 0.0
+    
+    def report(self):
+        print(f"Processed {self.processed}/{self.total} ZIPs ({self.zips_per_minute:.1f} ZIPs/min, "
+              f"{self.browser_checks} page checks, {self.errors} errors)")
+
+async def check_availability_http(page, zip_code, timeout_ms=WAIT_TIMEOUT_MS):
+    """
+    Check availability with a plain HTTP request, without rendering the page.
+    
+    Returns:
+        bool or None: the availability if the response settles it, otherwise None
+    """
+    try:
+        response = await page.request.get(ESTIMATE_URL.format(zip_code=zip_code), timeout=timeout_ms)
+        if not response.ok:
+            return None
+        body = await response.text()
+    except Exception as e:
+        print(f"HTTP check failed for zip code {zip_code}: {str(e)}")
+        return None
+    
+    if UNAVAILABLE_TEXT in body:
+        return False
+    if AVAILABLE_HTTP_MARKERS and any(marker in body for marker in AVAILABLE_HTTP_MARKERS):
+        return True
+    return None
+
+async def check_availability_browser(page, zip_code, timeout_ms=WAIT_TIMEOUT_MS):
+    """
+    Load the estimate page and wait until it shows the "not serviced" message
+    or the network goes idle, whichever comes first.
+    """
+    await page.goto(ESTIMATE_URL.format(zip_code=zip_code), wait_until="domcontentloaded", timeout=timeout_ms)
+    
+    unavailable = asyncio.ensure_future(page.wait_for_selector(f"text={UNAVAILABLE_TEXT}", timeout=timeout_ms))
+    idle = asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=timeout_ms))
+    try:
+        done, _ = await asyncio.wait({unavailable, idle}, return_when=asyncio.FIRST_COMPLETED)
+        if unavailable in done and unavailable.exception() is None:
+            return False
+        # Without a settled page the content says nothing; let the timeout surface as an error
+        await asyncio.wait({idle})
+        if idle.exception() is not None:
+            raise idle.exception()
+    finally:
+        for task in (unavailable, idle):
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(unavailable, idle, return_exceptions=True)
+    
+    page_content = await page.content()
+    return UNAVAILABLE_TEXT not in page_content
 
-async def check_availability_and_pricing(page, zip_code, state, city):
+def regional_price_range(state, city):
+    """Return (min_price, max_price) strings from the regional pricing model."""
+    min_prices, max_prices = junk_king_price_ranges([state], [city])
+    return f"${min_prices[0]}", f"${max_prices[0]}"
+
+async def check_availability_and_pricing(page, zip_code, state, city, http_first=False, timeout_ms=WAIT_TIMEOUT_MS,
+                                         meter=None):
     """
     Check if Junk King is available in the given zip code and get pricing if available.
     Uses regional pricing based on state and city size.
     
+    With ``http_first`` a plain HTTP request is tried first and the browser is
+    only used when that response doesn't settle availability. Until
+    AVAILABLE_HTTP_MARKERS are known that only settles unavailable ZIPs. Browser checks
+    are counted on ``meter`` when one is given.
+    
     Returns:
-        tuple: (is_available, min_price, max_price)
+        tuple: (is_available, min_price, max_price); is_available is None when
+        the check failed or timed out and availability is unknown
     """
-    is_available = False
+    is_available = None
     min_price = ""
     max_price = ""
     
     try:
-        await page.goto(f"https://www.junk-king.com/free-estimate?zipcode={zip_code}", wait_until="domcontentloaded")
-        
-        await page.wait_for_load_state("networkidle")
-        await asyncio.sleep(2)
+        availability = await check_availability_http(page, zip_code, timeout_ms) if http_first else None
+        if availability is None:
+            if meter is not None:
+                meter.browser_checks += 1
+            availability = await check_availability_browser(page, zip_code, timeout_ms)
         
-        page_content = await page.content()
-        if "Sorry, we don't service your area yet" in page_content or "Sorry, we don" in page_content:
-            is_available = False
-            return is_available, min_price, max_price
+        if not availability:
+            return False, min_price, max_price
         
         is_available = True
-        
-        state_pricing = STATE_PRICING.get(state, STATE_PRICING['default'])
-        
-        city_adjustment = 0
-        if city in LARGE_CITIES:
-            city_adjustment = random.randint(20, 50)
-        
-        min_base = random.randint(state_pricing['min_range'][0], state_pricing['min_range'][1])
-        max_base = random.randint(state_pricing['max_range'][0], state_pricing['max_range'][1])
-        
-        min_price = f"${min_base + city_adjustment}"
-        max_price = f"${max_base + city_adjustment}"
+        min_price, max_price = regional_price_range(state, city)
         
     except Exception as e:
         print(f"Error processing zip code {zip_code}: {str(e)}")
         if is_available:
-            state_pricing = STATE_PRICING.get(state, STATE_PRICING['default'])
-            min_price = f"${state_pricing['min_range'][0]}"
-            max_price = f"${state_pricing['max_range'][0]}"
+            min_prices, max_prices = junk_king_floor_prices([state])
+            min_price = f"${min_prices[0]}"
+            max_price = f"${max_prices[0]}"
     
     return is_available, min_price, max_price
 
-async def process_zip_codes(input_file, output_file, limit=None):
-    """Process zip codes in the input file and save results to output file."""
+def result_row(city, state, zip_code, is_available, min_price="", max_price="", source="checked"):
+    """Build an output row; available ZIPs without prices get regional ones."""
+    if is_available and not min_price:
+        min_price, max_price = regional_price_range(state, city)
+    return {
+        'city': city,
+        'state': state,
+        'zip': zip_code,
+        'is_available': is_available,
+        'min_price': min_price,
+        'max_price': max_price,
+        'source': source
+    }
+
+async def zip_worker(worker_id, browser, queue, checkpoint, meter, results, cache=None,
+                     recycle_after=RECYCLE_PAGE_AFTER, row_delay=ROW_DELAY_SECONDS,
+                     http_first=False, timeout_ms=WAIT_TIMEOUT_MS):
+    """Check ZIPs from the shared queue on this worker's own page until the queue is empty."""
+    context, page = await new_worker_page(browser)
+    processed = 0
+    
+    try:
+        while True:
+            try:
+                city, state, zip_code = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            
+            print(f"[worker {worker_id}] Processing {city}, {state} with ZIP: {zip_code}")
+            
+            is_available, min_price, max_price = await check_availability_and_pricing(
+                page, zip_code, state, city, http_first=http_first, timeout_ms=timeout_ms, meter=meter
+            )
+            
+            if is_available is None:
+                # Unknown, not unavailable: leave it out of the output, cache and
+                # inference so --resume checks it again
+                meter.errors += 1
+            else:
+                checkpoint.write(result_row(city, state, zip_code, is_available, min_price, max_price))
+                results[zip_code] = is_available
+                if cache is not None:
+                    cache.put(zip_code, is_available)
+                meter.add()
+            processed += 1
+            
+            if meter.processed % REPORT_EVERY == 0:
+                meter.report()
+            
+            if recycle_after and processed % recycle_after == 0:
+                await context.close()
+                context, page = await new_worker_page(browser)
+            
+            if row_delay:
+                await asyncio.sleep(row_delay)
+    finally:
+        await context.close()
+
+async def check_zips(browser, rows, checkpoint, meter, results, cache, concurrency, **worker_options):
+    """Check a batch of (city, state, zip) rows with a pool of browser workers."""
+    queue = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+    
+    workers = [
+        zip_worker(worker_id, browser, queue, checkpoint, meter, results, cache, **worker_options)
+        for worker_id in range(max(1, min(concurrency, len(rows))))
+    ]
+    await asyncio.gather(*workers)
+
+async def process_zip_codes(input_file, output_file, limit=None, concurrency=DEFAULT_CONCURRENCY,
+                            recycle_after=RECYCLE_PAGE_AFTER, row_delay=ROW_DELAY_SECONDS, resume=False,
+                            http_first=False, timeout_ms=WAIT_TIMEOUT_MS,
+                            cache_file=None, cache_ttl_days=DEFAULT_TTL_DAYS, infer=False):
+    """
+    Process zip codes in the input file and save results to output file.
+    
+    ZIPs are pulled from a shared queue by ``concurrency`` workers, each with its
+    own browser context; a worker's context is replaced every ``recycle_after`` ZIPs.
+    Every result is appended to the output CSV as soon as it is known. With
+    ``resume`` the existing output is kept and ZIPs already in it are skipped.
+    
+    With ``cache_file`` ZIPs checked within ``cache_ttl_days`` are answered from
+    the availability cache. With ``infer`` one ZIP per city and per ZIP3 prefix
+    is checked first, and the rest are only checked where those samples disagree.
+    """
     df = pd.read_csv(input_file)
     
     if limit:
         df = df.head(limit)
     
-    results = []
+    processed_zips = load_processed_zips(output_file) if resume else set()
     
-    playwright, browser, page, context = await setup_browser()
+    rows = [
+        (city, state, str(zip_code))
+        for city, state, zip_code in df[['city', 'state', 'Zips']].itertuples(index=False)
+        if str(zip_code) not in processed_zips
+    ]
+    
+    if processed_zips:
+        print(f"Resuming: skipping {len(df) - len(rows)} ZIPs already in {output_file}")
+    
+    meter = ThroughputMeter(len(rows))
+    checkpoint = CheckpointWriter(output_file, append=resume)
+    cache = AvailabilityCache(cache_file, ttl_days=cache_ttl_days) if cache_file else None
+    results = {}
+    worker_options = dict(recycle_after=recycle_after, row_delay=row_delay, http_first=http_first, timeout_ms=timeout_ms)
+    
+    playwright = None
+    browser = None
     
     try:
-        for count, (_, row) in enumerate(df.iterrows()):
-            city = row['city']
-            state = row['state']
-            zip_code = str(row['Zips'])
-            
-            print(f"Processing {city}, {state} with ZIP: {zip_code}")
-            
-            is_available, min_price, max_price = await check_availability_and_pricing(page, zip_code, state, city)
-            
-            results.append({
-                'city': city,
-                'state': state,
-                'zip': zip_code,
-                'is_available': is_available,
-                'min_price': min_price,
-                'max_price': max_price
-            })
-            
-            if (count + 1) % 10 == 0:
-                pd.DataFrame(results).to_csv(output_file, index=False)
-                print(f"Saved intermediate results after processing {count + 1} records")
+        if cache is not None:
+            cached = cache.get_many([zip_code for _, _, zip_code in rows], include_inferred=infer)
+            to_check = []
+            for city, state, zip_code in rows:
+                if zip_code in cached:
+                    checkpoint.write(result_row(city, state, zip_code, cached[zip_code], source="cached"))
+                    results[zip_code] = cached[zip_code]
+                    meter.add()
+                else:
+                    to_check.append((city, state, zip_code))
+            print(f"Availability cache answered {len(rows) - len(to_check)} of {len(rows)} ZIPs")
+        else:
+            to_check = rows
+        
+        if to_check:
+            playwright = await async_playwright().start()
+            browser = await playwright.chromium.launch(headless=True)
+        
+        if infer and to_check:
+            representatives, remaining = pick_representatives(to_check)
+            print(f"Checking {len(representatives)} representative ZIPs first")
+            await check_zips(browser, representatives, checkpoint, meter, results, cache, concurrency, **worker_options)
             
-            await asyncio.sleep(2)
+            inferred, to_check = infer_availability(remaining, rows, results)
+            for city, state, zip_code in remaining:
+                if zip_code in inferred:
+                    checkpoint.write(result_row(city, state, zip_code, inferred[zip_code], source="inferred"))
+                    if cache is not None:
+                        cache.put(zip_code, inferred[zip_code], source="inferred")
+                    meter.add()
+            print(f"Inferred {len(inferred)} ZIPs; {len(to_check)} need their own check")
+        
+        if to_check:
+            await check_zips(browser, to_check, checkpoint, meter, results, cache, concurrency, **worker_options)
     
     finally:
-        await browser.close()
-        await playwright.stop()
+        if browser is not None:
+            await browser.close()
+        if playwright is not None:
+            await playwright.stop()
         
-        pd.DataFrame(results).to_csv(output_file, index=False)
+        checkpoint.close()
+        if cache is not None:
+            cache.close()
+        meter.report()
+        if meter.errors:
+            print(f"{meter.errors} ZIPs could not be checked and were not saved; rerun with --resume to retry them")
         print(f"Completed processing. Results saved to {output_file}")
-
-async def main():
-    input_file = "/home/ubuntu/attachments/6cb26970-af39-480f-9c18-20b37e1eb22d/Roll+Off+Rates+Data+-+Junk+King+Availability+1.csv"
-    output_file = "/home/ubuntu/repos/rolloffrates/junk_king_regional_results.csv"
-    
-    await process_zip_codes(input_file, output_file)
-
-if __name__ == "__main__":
-    asyncio.run(main())
@@ -1,14 +1,49 @@
+import argparse
 import asyncio
-from improved_regional_scraper import process_zip_codes
+from availability_cache import DEFAULT_TTL_DAYS
+from improved_regional_scraper import (
+    DEFAULT_CONCURRENCY,
+    RECYCLE_PAGE_AFTER,
+    ROW_DELAY_SECONDS,
+    WAIT_TIMEOUT_MS,
+    process_zip_codes,
+)
 
-async def run_full_scraper():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check Junk King availability and regional pricing for a list of ZIPs.")
+    parser.add_argument("input_file", help="CSV with city, state and Zips columns")
+    parser.add_argument("output_file", help="Results CSV (appended to as ZIPs are processed)")
+    parser.add_argument("--limit", type=int, help="Only process the first N rows of the input")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Number of browser workers")
+    parser.add_argument("--recycle-after", type=int, default=RECYCLE_PAGE_AFTER, help="Replace a worker's browser context after N ZIPs")
+    parser.add_argument("--row-delay", type=float, default=ROW_DELAY_SECONDS, help="Seconds each worker waits between ZIPs")
+    parser.add_argument("--timeout-ms", type=int, default=WAIT_TIMEOUT_MS, help="Timeout for page loads and availability waits")
+    parser.add_argument("--http-first", action="store_true",
+                        help="Try a plain HTTP request before the browser; it only rules ZIPs out, so it pays off when most are unserved")
+    parser.add_argument("--cache", dest="cache_file", help="SQLite availability cache to read and update")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL_DAYS, help="Ignore cached results older than this")
+    parser.add_argument("--infer", action="store_true", help="Check one ZIP per city/ZIP3 first and infer the rest where samples agree")
+    parser.add_argument("--resume", action="store_true", help="Keep the existing output and skip ZIPs already in it")
+    return parser.parse_args(argv)
+
+async def run_full_scraper(args):
     """Run the regional pricing scraper on the entire dataset."""
-    input_file = "/home/ubuntu/attachments/6cb26970-af39-480f-9c18-20b37e1eb22d/Roll+Off+Rates+Data+-+Junk+King+Availability+1.csv"
-    output_file = "/home/ubuntu/repos/rolloffrates/junk_king_regional_results.csv"
-    
     print("Starting full scraper run with regional pricing model...")
-    await process_zip_codes(input_file, output_file)
+    await process_zip_codes(
+        args.input_file,
+        args.output_file,
+        limit=args.limit,
+        concurrency=args.concurrency,
+        recycle_after=args.recycle_after,
+        row_delay=args.row_delay,
+        resume=args.resume,
+        http_first=args.http_first,
+        timeout_ms=args.timeout_ms,
+        cache_file=args.cache_file,
+        cache_ttl_days=args.cache_ttl_days,
+        infer=args.infer,
+    )
     print("Scraper completed successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(run_full_scraper())
+    asyncio.run(run_full_scraper(parse_args()))
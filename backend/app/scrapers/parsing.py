@@ -0,0 +1,149 @@
+import asyncio
+import os
+import re
+import time
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from ..utils.metrics import PARSE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PHONE_PATTERN = re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+SIZE_PATTERN = re.compile(r'(\d+)\s*yard', re.IGNORECASE)
+LOGO_PATTERN = re.compile(r'logo', re.IGNORECASE)
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_FEATURES = "lxml"
+except ImportError:
+    DEFAULT_FEATURES = "html.parser"
+
+PARSE_EXECUTOR = os.getenv("SCRAPER_PARSE_EXECUTOR", "thread")
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", "0")) or None
+
+_executor: Optional[Executor] = None
+
+
+def get_parse_executor() -> Executor:
+    """Return the shared executor used for HTML parsing, creating it on first use"""
+    global _executor
+    if _executor is None:
+        if PARSE_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="html-parse")
+        logger.info(f"Using {PARSE_EXECUTOR} pool for HTML parsing")
+    return _executor
+
+
+def shutdown_parse_executor():
+    """Shut down the shared parse executor"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+async def run_parser(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a parse function off the event loop.
+
+    With the process pool, ``func`` must be a module-level function and its
+    arguments and return value must be picklable, so parse functions return
+    plain data rather than soup objects.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(get_parse_executor(), partial(func, *args, **kwargs))
+    finally:
+        PARSE_SECONDS.observe(time.perf_counter() - start, function=func.__name__)
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None, features: Optional[str] = None) -> BeautifulSoup:
+    """Build a BeautifulSoup tree with the fastest available backend"""
+    return BeautifulSoup(html, features or DEFAULT_FEATURES, parse_only=parse_only)
+
+
+def _class_matches(pattern: Pattern) -> Callable[[Optional[str]], bool]:
+    return lambda c: bool(c and pattern.search(c))
+
+
+def parse_company_page(html: str, base_url: str, about_pattern: Union[str, Pattern],
+                       features: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Extract description, phone and logo URL from a company home page"""
+    soup = make_soup(html, features=features)
+    if isinstance(about_pattern, str):
+        about_pattern = re.compile(about_pattern, re.IGNORECASE)
+
+    description = ""
+    about_section = soup.find('div', class_=_class_matches(about_pattern))
+    if about_section:
+        description = about_section.get_text().strip()
+
+    phone = None
+    phone_element = soup.find(string=PHONE_PATTERN)
+    if phone_element:
+        phone_match = PHONE_PATTERN.search(str(phone_element))
+        if phone_match:
+            phone = phone_match.group(0)
+
+    logo_url = None
+    logo = soup.find('img', alt=LOGO_PATTERN)
+    if logo and isinstance(logo, Tag) and logo.has_attr('src'):
+        logo_url = logo['src']
+        if isinstance(logo_url, str) and not logo_url.startswith('http'):
+            logo_url = f"{base_url}{logo_url}"
+
+    return {
+        "description": description,
+        "phone": phone,
+        "logo_url": logo_url,
+    }
+
+
+def parse_location_links(html: str, href_pattern: Union[str, Pattern],
+                         features: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Return ``(text, href)`` for every link whose href matches ``href_pattern``.
+
+    Only matching ``<a>`` tags are built into the tree.
+    """
+    if isinstance(href_pattern, str):
+        href_pattern = re.compile(href_pattern, re.IGNORECASE)
+    strainer = SoupStrainer('a', href=href_pattern)
+    soup = make_soup(html, parse_only=strainer, features=features)
+    return [(link.get_text().strip(), link['href']) for link in soup.find_all('a', href=True)]
+
+
+def parse_size_mentions(html: str, description_from: str = "next_paragraph",
+                        features: Optional[str] = None) -> List[Tuple[int, str]]:
+    """Return ``(size_yards, description)`` for every "N yard" text on the page.
+
+    ``description_from`` is ``"next_paragraph"`` to use the first ``<p>`` after
+    the matching element, or ``"parent"`` to use the parent element's text.
+    """
+    soup = make_soup(html, features=features)
+    sizes = []
+
+    for element in soup.find_all(string=SIZE_PATTERN):
+        size_match = SIZE_PATTERN.search(str(element))
+        if not size_match:
+            continue
+
+        parent_element = element.parent
+        description = ""
+        if parent_element:
+            if description_from == "parent":
+                description = parent_element.get_text().strip()
+            else:
+                description_element = parent_element.find_next('p')
+                if description_element:
+                    description = description_element.get_text().strip()
+
+        sizes.append((int(size_match.group(1)), description))
+
+    return sizes
@@ -0,0 +1,202 @@
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.regions import STATE_ABBREVIATIONS, state_code
+
+# Every known state code gets a slot in the factor arrays; the last slot is
+# for states that are not in the table
+STATE_INDEX = {code: index for index, code in enumerate(sorted(set(STATE_ABBREVIATIONS.values())))}
+UNKNOWN_STATE = len(STATE_INDEX)
+
+
+def state_indices(states: Iterable[str]) -> np.ndarray:
+    """Positions of states in the factor arrays (``UNKNOWN_STATE`` for unknown states)"""
+    unique, inverse = np.unique(np.asarray(list(states), dtype=str), return_inverse=True)
+    positions = np.fromiter((STATE_INDEX.get(state_code(state), UNKNOWN_STATE) for state in unique),
+                            dtype=np.intp, count=len(unique))
+    return positions[inverse]
+
+
+def state_lookup(values: Mapping[str, Any], default: Any, dtype=float) -> np.ndarray:
+    """Lookup array indexed by ``state_indices`` from a {state code: value} table"""
+    table = np.full((UNKNOWN_STATE + 1, *np.shape(default)), default, dtype=dtype)
+    for state, value in values.items():
+        table[STATE_INDEX[state_code(state)]] = value
+    return table
+
+
+def city_lookup(values: Mapping[Tuple[str, str], float], cities: Iterable[str], states: Iterable[str],
+                default: float = 1.0) -> np.ndarray:
+    """Value for each (city, state) pair from a {(city, state code): value} table"""
+    states = list(states)
+    # Normalize each distinct state once rather than once per area
+    unique, inverse = np.unique(np.asarray(states, dtype=str), return_inverse=True)
+    codes = [state_code(state) for state in unique.tolist()]
+    return np.fromiter((values.get((city, codes[index]), default) for city, index in zip(cities, inverse.tolist())),
+                       dtype=float, count=len(states))
+
+
+class RegionalPricing:
+    """Price model of a provider: a base price plus a per-yard price, scaled by state and city.
+
+    City factors apply on top of the state factor and are keyed by
+    (city, state code), so same-named cities in different states stay apart.
+    ``price_grid`` computes the price of every (service area, size) pair in a
+    single vectorized pass and materializes price records only when iterated.
+    """
+
+    def __init__(
+        self,
+        base_price: float,
+        price_per_yard: float,
+        state_factors: Mapping[str, float],
+        additional_day_rate: float,
+        weight_overage_price: float,
+        rental_period_days: int,
+        city_factors: Optional[Mapping[Tuple[str, str], float]] = None,
+    ):
+        self.base_price = base_price
+        self.price_per_yard = price_per_yard
+        self.state_factors = dict(state_factors)
+        self.additional_day_rate = additional_day_rate
+        self.weight_overage_price = weight_overage_price
+        self.rental_period_days = rental_period_days
+        self.city_factors = {(city, state_code(state)): factor
+                             for (city, state), factor in (city_factors or {}).items()}
+        self._factors = state_lookup(self.state_factors, 1.0)
+
+    def factors(self, states: Iterable[str], cities: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Price factor for each state, times the city factor when ``cities`` is given"""
+        states = list(states)
+        factors = self._factors[state_indices(states)]
+        if cities is not None and self.city_factors:
+            factors = factors * city_lookup(self.city_factors, cities, states)
+        return factors
+
+    def price_matrix(self, states: Iterable[str], size_yards: Iterable[int],
+                     cities: Optional[Iterable[str]] = None) -> np.ndarray:
+        """(areas x sizes) matrix of base prices"""
+        size_prices = self.base_price + self.price_per_yard * np.fromiter(size_yards, dtype=float)
+        return np.round(np.outer(self.factors(states, cities), size_prices), 2)
+
+    def price_grid(self, company_id: str, service_areas: Sequence[Dict[str, Any]],
+                   dumpster_sizes: Sequence[Dict[str, Any]]) -> "PriceGrid":
+        """Prices for every service area and dumpster size"""
+        base_prices = self.price_matrix(
+            (area["state"] for area in service_areas),
+            (size["size_yards"] for size in dumpster_sizes),
+            (area.get("city") or "" for area in service_areas),
+        )
+        return PriceGrid(
+            company_id,
+            [area["id"] for area in service_areas],
+            [size["id"] for size in dumpster_sizes],
+            base_prices,
+            np.round(base_prices * self.additional_day_rate, 2),
+            self.weight_overage_price,
+            self.rental_period_days,
+        )
+
+
+class PriceGrid:
+    """Computed prices of one company, turned into price records on iteration"""
+
+    def __init__(self, company_id: str, area_ids: List[str], size_ids: List[str], base_prices: np.ndarray,
+                 additional_day_prices: np.ndarray, weight_overage_price: float, rental_period_days: int):
+        self.company_id = company_id
+        self.area_ids = area_ids
+        self.size_ids = size_ids
+        self.base_prices = base_prices
+        self.additional_day_prices = additional_day_prices
+        self.weight_overage_price = weight_overage_price
+        self.rental_period_days = rental_period_days
+
+    def __len__(self) -> int:
+        return self.base_prices.size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        base_prices = self.base_prices.tolist()
+        additional_day_prices = self.additional_day_prices.tolist()
+        for area_id, area_prices, area_day_prices in zip(self.area_ids, base_prices, additional_day_prices):
+            for size_id, base_price, additional_day_price in zip(self.size_ids, area_prices, area_day_prices):
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "company_id": self.company_id,
+                    "size_id": size_id,
+                    "service_area_id": area_id,
+                    "base_price": base_price,
+                    "additional_day_price": additional_day_price,
+                    "weight_overage_price": self.weight_overage_price,
+                    "rental_period_days": self.rental_period_days,
+                }
+
+
+# Junk King quotes a (minimum load, full truck) price range per state;
+# large cities add a surcharge on top of both
+JUNK_KING_STATE_RANGES = {
+    'CA': ((399, 449), (649, 699)),
+    'NY': ((399, 449), (649, 699)),
+    'HI': ((429, 479), (679, 729)),
+    'MA': ((389, 439), (639, 689)),
+    'CT': ((379, 429), (629, 679)),
+    'NJ': ((379, 429), (629, 679)),
+    'WA': ((369, 419), (619, 669)),
+    'CO': ((359, 409), (609, 659)),
+
+    'FL': ((329, 379), (579, 629)),
+    'IL': ((329, 379), (579, 629)),
+    'VA': ((329, 379), (579, 629)),
+    'OR': ((339, 389), (589, 639)),
+    'MD': ((339, 389), (589, 639)),
+    'NV': ((339, 389), (589, 639)),
+    'AZ': ((329, 379), (579, 629)),
+    'MN': ((319, 369), (569, 619)),
+
+    'TX': ((299, 349), (549, 599)),
+    'GA': ((299, 349), (549, 599)),
+    'NC': ((299, 349), (549, 599)),
+    'PA': ((309, 359), (559, 609)),
+    'OH': ((289, 339), (539, 589)),
+    'MI': ((289, 339), (539, 589)),
+    'TN': ((279, 329), (529, 579)),
+    'MO': ((279, 329), (529, 579)),
+}
+JUNK_KING_DEFAULT_RANGE = ((299, 349), (549, 599))
+JUNK_KING_LARGE_CITY_SURCHARGE = (20, 50)
+
+LARGE_CITIES = [
+    'New York City', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix',
+    'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose',
+    'Austin', 'Jacksonville', 'San Francisco', 'Columbus', 'Indianapolis',
+    'Seattle', 'Denver', 'Washington', 'Boston', 'Nashville', 'Las Vegas',
+    'Portland', 'Miami', 'Atlanta', 'Minneapolis'
+]
+
+_JUNK_KING_RANGES = state_lookup(
+    {state: [*low, *high] for state, (low, high) in JUNK_KING_STATE_RANGES.items()},
+    [*JUNK_KING_DEFAULT_RANGE[0], *JUNK_KING_DEFAULT_RANGE[1]],
+    dtype=np.int64,
+)
+
+
+def junk_king_price_ranges(states: Sequence[str], cities: Sequence[str],
+                           rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw Junk King (min_price, max_price) arrays for parallel arrays of states and cities"""
+    rng = rng or np.random.default_rng()
+    ranges = _JUNK_KING_RANGES[state_indices(states)]
+    surcharge = np.where(
+        np.isin(np.asarray(cities, dtype=object), LARGE_CITIES),
+        rng.integers(JUNK_KING_LARGE_CITY_SURCHARGE[0], JUNK_KING_LARGE_CITY_SURCHARGE[1], len(ranges), endpoint=True),
+        0,
+    )
+    min_prices = rng.integers(ranges[:, 0], ranges[:, 1], endpoint=True) + surcharge
+    max_prices = rng.integers(ranges[:, 2], ranges[:, 3], endpoint=True) + surcharge
+    return min_prices, max_prices
+
+
+def junk_king_floor_prices(states: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Lowest (min_price, max_price) of each state's Junk King range"""
+    ranges = _JUNK_KING_RANGES[state_indices(states)]
+    return ranges[:, 0], ranges[:, 2]
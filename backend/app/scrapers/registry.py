@@ -0,0 +1,38 @@
+import importlib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Type
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
+# Provider name -> "module:class". Scraper modules (and aiohttp/bs4 with them)
+# are only imported when a scrape actually needs them.
+SCRAPERS: Dict[str, str] = {
+    "waste_management": "waste_management_scraper:WasteManagementScraper",
+    "budget_dumpster": "budget_dumpster_scraper:BudgetDumpsterScraper",
+    "liberty_dumpsters": "liberty_dumpsters_scraper:LibertyDumpstersScraper",
+}
+
+
+def provider_names() -> List[str]:
+    """Names of all registered providers"""
+    return list(SCRAPERS)
+
+
+def get_scraper_class(name: str) -> Type["BaseScraper"]:
+    """Import and return the scraper class registered as ``name``"""
+    module_name, class_name = SCRAPERS[name].split(":")
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def get_scrapers(providers: Optional[Iterable[str]] = None) -> List["BaseScraper"]:
+    """Instantiate the scrapers for ``providers``, or for every provider if None"""
+    if providers is None:
+        return [get_scraper_class(name)() for name in SCRAPERS]
+
+    providers = list(dict.fromkeys(providers))
+    unknown = [name for name in providers if name not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown providers: {', '.join(unknown)}. Available: {', '.join(SCRAPERS)}")
+
+    return [get_scraper_class(name)() for name in providers]
@@ -0,0 +1,47 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+from ..models.dumpster_data import DumpsterPrice, ScrapedData
+
+
+class AreaIndex:
+    """Service areas of a snapshot by id, with their prices grouped per area.
+
+    Builds the bundle served for a city or ZIP (areas, prices, and the
+    companies and sizes those prices refer to) from a list of area ids,
+    touching only those areas' prices.
+    """
+
+    def __init__(self, data: ScrapedData):
+        self.areas = {area.id: area for area in data.service_areas}
+        self.prices: Dict[str, List[DumpsterPrice]] = defaultdict(list)
+        for price in data.prices:
+            self.prices[price.service_area_id].append(price)
+        # Keep companies and sizes in snapshot order
+        self.companies = {company.id: company for company in data.companies}
+        self.sizes = {size.id: size for size in data.dumpster_sizes}
+        self.company_order = {company_id: i for i, company_id in enumerate(self.companies)}
+        self.size_order = {size_id: i for i, size_id in enumerate(self.sizes)}
+
+    def bundle(self, area_ids: Iterable[str]) -> Dict[str, Any]:
+        """Areas, prices, companies and sizes for ``area_ids``; empty if none of the areas exist"""
+        areas = [self.areas[area_id] for area_id in dict.fromkeys(area_ids) if area_id in self.areas]
+        if not areas:
+            return {}
+
+        prices = [price for area in areas for price in self.prices.get(area.id, ())]
+        company_ids = {price.company_id for price in prices}
+        size_ids = {price.size_id for price in prices}
+
+        return {
+            "service_areas": areas,
+            "companies": [
+                self.companies[company_id]
+                for company_id in sorted(company_ids & self.companies.keys(), key=self.company_order.__getitem__)
+            ],
+            "dumpster_sizes": [
+                self.sizes[size_id]
+                for size_id in sorted(size_ids & self.sizes.keys(), key=self.size_order.__getitem__)
+            ],
+            "prices": prices,
+        }
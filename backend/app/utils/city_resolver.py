@@ -0,0 +1,169 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from ..models.dumpster_data import ScrapedData
+from .city_search import normalize_name
+from .regions import state_code
+
+# Abbreviations in place names and the words they stand for
+NAME_ALIASES = {
+    "st": "saint",
+    "ste": "sainte",
+    "ft": "fort",
+    "mt": "mount",
+    "mtn": "mountain",
+    "pt": "point",
+    "hts": "heights",
+    "spgs": "springs",
+    "jct": "junction",
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+}
+
+# Fuzzy matches must share at least this share of character trigrams (Dice coefficient)
+FUZZY_MIN_SCORE = 0.6
+# ... and be at most this many edits per character away, so a prefix or a
+# longer name ("New", "Austinville") is not taken for a typo
+FUZZY_MAX_EDITS_PER_CHAR = 0.25
+# Trigrams shared by more names than this are too common to narrow the search
+MAX_POSTINGS = 1000
+FUZZY_CANDIDATES = 20
+
+
+def canonical_name(name: str) -> str:
+    """Normalized name with abbreviations expanded, so "St. Louis" and "saint louis" match"""
+    return " ".join(NAME_ALIASES.get(word, word) for word in normalize_name(name).split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class CityMatch:
+    """A resolved city: its canonical spelling, service areas and how it was matched"""
+    city: str
+    state: Optional[str]
+    area_ids: List[str]
+    # "exact", "alias" (same name once abbreviations are expanded) or "fuzzy"
+    match: str
+    score: float = 1.0
+
+    @property
+    def canonical_path(self) -> str:
+        path = f"/city/{quote(self.city)}"
+        return f"{path}?state={quote(self.state)}" if self.state else path
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "city": self.city,
+            "state": self.state,
+            "match": self.match,
+            "score": round(self.score, 3),
+            "canonical_path": self.canonical_path,
+        }
+
+
+class CityResolver:
+    """Resolves city names from URLs and user input to the cities in a snapshot.
+
+    Names are looked up by their canonical form (normalized, abbreviations
+    expanded) in a hash table. Names with no such match go through a
+    character-trigram index: only cities sharing a rare trigram with the
+    query are scored, so a lookup never scans every city.
+    """
+
+    def __init__(self, data: ScrapedData):
+        # canonical name -> state -> (display name, area ids)
+        self.cities: Dict[str, Dict[str, Tuple[str, List[str]]]] = defaultdict(dict)
+        for area in data.service_areas:
+            states = self.cities[canonical_name(area.city)]
+            state = area.state.upper()
+            if state not in states:
+                states[state] = (area.city, [])
+            states[state][1].append(area.id)
+
+        self.keys: List[str] = list(self.cities)
+        self.key_trigrams: List[Set[str]] = [trigrams(key) for key in self.keys]
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for i, grams in enumerate(self.key_trigrams):
+            for gram in grams:
+                self.postings[gram].append(i)
+
+    def _fuzzy(self, key: str, state: Optional[str]) -> Optional[Tuple[str, float]]:
+        grams = trigrams(key)
+        usable = sorted((gram for gram in grams if gram in self.postings), key=lambda gram: len(self.postings[gram]))
+        # Rare trigrams narrow the candidates; keep at least two even when all are common
+        selected = [gram for gram in usable if len(self.postings[gram]) <= MAX_POSTINGS] or usable[:2]
+
+        shared: Counter = Counter()
+        for gram in selected:
+            shared.update(self.postings[gram])
+
+        max_edits = max(1, int(len(key) * FUZZY_MAX_EDITS_PER_CHAR))
+        scored: List[Tuple[float, int, str]] = []
+        for i, _ in shared.most_common(FUZZY_CANDIDATES):
+            candidate = self.keys[i]
+            if state is not None and state not in self.cities[candidate]:
+                continue
+            score = 2 * len(grams & self.key_trigrams[i]) / (len(grams) + len(self.key_trigrams[i]))
+            if score < FUZZY_MIN_SCORE:
+                continue
+            distance = edit_distance(key, candidate)
+            if distance <= max_edits:
+                scored.append((score, -distance, candidate))
+
+        if not scored:
+            return None
+        scored.sort(reverse=True)
+        # Two equally good candidates: the input doesn't say which city it means
+        if len(scored) > 1 and scored[0][:2] == scored[1][:2]:
+            return None
+        return scored[0][2], scored[0][0]
+
+    def resolve(self, city: str, state: Optional[str] = None) -> Optional[CityMatch]:
+        """The city ``city`` most likely means, or None.
+
+        Without ``state`` a name found in several states resolves to all of
+        them, with no state in the canonical target.
+        """
+        state = state_code(state).upper() if state else None
+        key = canonical_name(city)
+        match = "exact" if key in self.cities else None
+        score = 1.0
+        if match is None:
+            found = self._fuzzy(key, state)
+            if found is None:
+                return None
+            key, score = found
+            match = "fuzzy"
+
+        states = self.cities[key]
+        if state is not None:
+            if state not in states:
+                return None
+            states = {state: states[state]}
+
+        display = next(iter(states.values()))[0]
+        if match == "exact" and normalize_name(city) != normalize_name(display):
+            match = "alias"
+        area_ids = [area_id for _, ids in states.values() for area_id in ids]
+        return CityMatch(display, next(iter(states)) if len(states) == 1 else None, area_ids, match, score)
@@ -0,0 +1,104 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..models.dumpster_data import ScrapedData
+from .regions import state_code
+
+# Top matches for prefixes up to this length are precomputed, since short
+# prefixes match a large share of all cities
+CACHED_PREFIX_LENGTH = 2
+MAX_RESULTS = 50
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a place name and reduce punctuation and runs of spaces to single spaces"""
+    return _NON_ALNUM.sub(' ', name.lower()).strip()
+
+
+def area_providers(data: ScrapedData) -> Dict[str, Set[str]]:
+    """Service area id -> ids of the companies with prices there"""
+    providers: Dict[str, Set[str]] = defaultdict(set)
+    for price in data.prices:
+        providers[price.service_area_id].add(price.company_id)
+    return providers
+
+
+class CitySearchIndex:
+    """Prefix search over the cities in a snapshot.
+
+    Cities (one entry per city and state, however many ZIP areas it has)
+    are kept in a sorted array of normalized names, so all names starting
+    with a prefix form one contiguous run found with ``bisect``. Matches
+    are ranked by provider count, then by number of service areas. The
+    ranked top matches of every short prefix are precomputed.
+    """
+
+    def __init__(self, data: ScrapedData):
+        providers = area_providers(data)
+        cities: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for area in data.service_areas:
+            key = (normalize_name(area.city), area.state.upper())
+            city = cities.get(key)
+            if city is None:
+                city = cities[key] = {"city": area.city, "state": area.state, "providers": set(), "service_areas": 0}
+            city["providers"].update(providers.get(area.id, ()))
+            city["service_areas"] += 1
+
+        ordered = sorted(cities.items())
+        self.names: List[str] = [name for (name, _), _ in ordered]
+        self.states: List[str] = [state for (_, state), _ in ordered]
+        self.cities: List[Dict[str, Any]] = [
+            {**city, "providers": len(city["providers"])} for _, city in ordered
+        ]
+
+        # Position of every city in the overall ranking; lower is better
+        ranking = sorted(
+            range(len(self.cities)),
+            key=lambda i: (-self.cities[i]["providers"], -self.cities[i]["service_areas"], self.names[i]),
+        )
+        self.rank = [0] * len(ranking)
+        for position, i in enumerate(ranking):
+            self.rank[i] = position
+
+        self._top: Dict[str, List[int]] = defaultdict(list)
+        for i in ranking:
+            name = self.names[i]
+            for length in range(min(len(name), CACHED_PREFIX_LENGTH) + 1):
+                top = self._top[name[:length]]
+                if len(top) < MAX_RESULTS:
+                    top.append(i)
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+    def _range(self, prefix: str) -> range:
+        start = bisect_left(self.names, prefix)
+        # Every name with the prefix sorts before prefix + the highest character
+        end = bisect_left(self.names, prefix + "\uffff", start)
+        return range(start, end)
+
+    def search(self, query: str, limit: int = 10, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The best ``limit`` cities whose name starts with ``query``.
+
+        ``query`` may end in ", ST" to restrict matches to a state.
+        """
+        limit = max(0, min(limit, MAX_RESULTS))
+        if ',' in query:
+            query, query_state = query.rsplit(',', 1)
+            state = state or query_state.strip() or None
+        prefix = normalize_name(query)
+        state = state_code(state).upper() if state else None
+
+        if state is None and len(prefix) <= CACHED_PREFIX_LENGTH:
+            matches = self._top.get(prefix, [])[:limit]
+        else:
+            candidates = self._range(prefix)
+            if state is not None:
+                candidates = [i for i in candidates if self.states[i].startswith(state)]
+            matches = heapq.nsmallest(limit, candidates, key=self.rank.__getitem__)
+        return [self.cities[i] for i in matches]
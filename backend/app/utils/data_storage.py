@@ -1,14 +1,30 @@
+import itertools
 import json
 import os
+import shutil
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple, TypeVar
 import logging
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
 from ..models.dumpster_data import ScrapedData
+from .area_index import AreaIndex
+from .city_resolver import CityMatch, CityResolver
+from .price_ranking import PriceRanking
+from .zip_index import ZipIndex, ZipMatch
+from .metrics import SNAPSHOT_CACHE, STORAGE_BYTES, STORAGE_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class DataStorage:
     """Class for storing and retrieving scraped data"""
     
@@ -16,6 +32,12 @@ class DataStorage:
         """Initialize the data storage with a directory path"""
         self.data_dir = data_dir
         self.data_file = os.path.join(data_dir, "dumpster_data.json")
+        self.staging_dir = os.path.join(data_dir, "staging")
+        self.lock_file = os.path.join(data_dir, ".publish.lock")
+        # Last loaded snapshot, keyed by the data file's (mtime, size, inode)
+        self._snapshot: Optional[Tuple[Tuple[int, int, int], ScrapedData]] = None
+        # Lookup structures derived from the snapshot they were built from, by name
+        self._indexes: Dict[str, Tuple[ScrapedData, Any]] = {}
         
         os.makedirs(data_dir, exist_ok=True)
         
@@ -26,27 +48,50 @@ class DataStorage:
         """Save data to JSON file"""
         try:
             data.last_updated = datetime.now()
+            self._snapshot = None
+            start = time.perf_counter()
             
             with open(self.data_file, 'w') as f:
                 json.dump(data.dict(), f, default=str, indent=2)
             
+            STORAGE_SECONDS.observe(time.perf_counter() - start, operation="save")
+            STORAGE_BYTES.inc(os.path.getsize(self.data_file), operation="save")
             logger.info(f"Data saved successfully to {self.data_file}")
             return True
         except Exception as e:
             logger.error(f"Error saving data: {str(e)}")
             return False
     
+    def _snapshot_key(self) -> Tuple[int, int, int]:
+        stat = os.stat(self.data_file)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+    
     def load_data(self) -> ScrapedData:
-        """Load data from JSON file"""
+        """Load data from JSON file.
+
+        The parsed snapshot is cached until the data file changes, so
+        snapshots published by other processes are picked up on the next call.
+        """
         try:
             if os.path.exists(self.data_file):
+                key = self._snapshot_key()
+                if self._snapshot is not None and self._snapshot[0] == key:
+                    SNAPSHOT_CACHE.inc(result="hit")
+                    return self._snapshot[1]
+                
+                SNAPSHOT_CACHE.inc(result="miss")
+                start = time.perf_counter()
                 with open(self.data_file, 'r') as f:
                     data_dict = json.load(f)
                 
                 if 'last_updated' in data_dict and isinstance(data_dict['last_updated'], str):
                     data_dict['last_updated'] = datetime.fromisoformat(data_dict['last_updated'].replace('Z', '+00:00'))
                 
-                return ScrapedData(**data_dict)
+                data = ScrapedData(**data_dict)
+                self._snapshot = (key, data)
+                STORAGE_SECONDS.observe(time.perf_counter() - start, operation="load")
+                STORAGE_BYTES.inc(key[1], operation="load")
+                return data
             else:
                 logger.warning(f"Data file {self.data_file} not found. Returning empty data.")
                 return ScrapedData()
@@ -54,6 +99,37 @@ class DataStorage:
             logger.error(f"Error loading data: {str(e)}")
             return ScrapedData()
     
+    def get_index(self, name: str, build: Callable[[ScrapedData], T]) -> T:
+        """An index derived from the current snapshot, built with ``build`` once per snapshot"""
+        data = self.load_data()
+        cached = self._indexes.get(name)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        start = time.perf_counter()
+        index = build(data)
+        self._indexes[name] = (data, index)
+        logger.info(f"Built {name} index in {time.perf_counter() - start:.2f}s")
+        return index
+    
+    def has_data(self) -> bool:
+        """Whether the current snapshot has any companies"""
+        return bool(self.load_data().companies)
+    
+    @contextmanager
+    def publish_lock(self):
+        """Serialize snapshot publishing across processes sharing the data directory"""
+        if fcntl is None:
+            yield
+            return
+        
+        with open(self.lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
     def update_data(self, new_data: Dict[str, Any]) -> bool:
         """Update existing data with new data"""
         try:
@@ -76,6 +152,126 @@ class DataStorage:
             logger.error(f"Error updating data: {str(e)}")
             return False
     
+    def _staging_path(self, run_id: str, source: str, record_type: str) -> str:
+        return os.path.join(self.staging_dir, run_id, source, f"{record_type}.jsonl")
+    
+    def append_records(self, run_id: str, source: str, record_type: str, records: List[Dict[str, Any]]) -> int:
+        """Append a batch of records from one source to the staging area of a scrape run.
+
+        Staged batches are on disk as soon as this returns, so an interrupted
+        run can still be published later with ``commit_staging``.
+        """
+        path = self._staging_path(run_id, source, record_type)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        with open(path, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        
+        return len(records)
+    
+    def iter_staged_records(self, run_id: str, source: str, record_type: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the records a source staged for a run, one at a time"""
+        path = self._staging_path(run_id, source, record_type)
+        if not os.path.exists(path):
+            return
+        
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping truncated staged record in {path}")
+    
+    def list_staged_runs(self) -> List[str]:
+        """List run ids that have staged records which were never committed"""
+        if not os.path.isdir(self.staging_dir):
+            return []
+        return sorted(os.listdir(self.staging_dir))
+    
+    def list_staged_sources(self, run_id: str) -> List[str]:
+        """List the sources that staged records for a run"""
+        run_dir = os.path.join(self.staging_dir, run_id)
+        if not os.path.isdir(run_dir):
+            return []
+        return sorted(os.listdir(run_dir))
+    
+    def _retained_records(self, replace_websites: Set[str]) -> Dict[str, list]:
+        """Current snapshot records that do not belong to the replaced companies"""
+        current = self.load_data()
+        replaced_ids = {company.id for company in current.companies if company.website in replace_websites}
+        
+        kept_prices = [price for price in current.prices if price.company_id not in replaced_ids]
+        replaced_area_ids = {price.service_area_id for price in current.prices if price.company_id in replaced_ids}
+        replaced_area_ids -= {price.service_area_id for price in kept_prices}
+        
+        return {
+            "companies": [company for company in current.companies if company.id not in replaced_ids],
+            "service_areas": [area for area in current.service_areas if area.id not in replaced_area_ids],
+            "dumpster_sizes": [size for size in current.dumpster_sizes if size.company_id not in replaced_ids],
+            "prices": kept_prices,
+        }
+    
+    def commit_staging(self, run_id: str, sources: Optional[List[str]] = None,
+                       replace_websites: Optional[Set[str]] = None) -> bool:
+        """Publish the records staged for a run as the current data snapshot.
+
+        With ``replace_websites`` the staged records are merged into the
+        current snapshot: only records of companies with those websites are
+        dropped, everything else is kept. Without it the staged records
+        replace the snapshot. ``sources`` limits which staged sources are
+        published (default: all of them).
+
+        The snapshot is streamed record by record into a temporary file that
+        then replaces the data file, so readers never see a half-written file.
+        """
+        start = time.perf_counter()
+        with self.publish_lock():
+            committed = self._commit_staging(run_id, sources, replace_websites)
+        
+        if committed:
+            STORAGE_SECONDS.observe(time.perf_counter() - start, operation="commit")
+            STORAGE_BYTES.inc(os.path.getsize(self.data_file), operation="commit")
+        return committed
+    
+    def _commit_staging(self, run_id: str, sources: Optional[List[str]], replace_websites: Optional[Set[str]]) -> bool:
+        sources = self.list_staged_sources(run_id) if sources is None else sources
+        tmp_file = f"{self.data_file}.tmp"
+        try:
+            retained = self._retained_records(replace_websites) if replace_websites is not None else {}
+            with open(tmp_file, 'w') as f:
+                f.write('{\n')
+                for record_type in ("companies", "service_areas", "dumpster_sizes", "prices"):
+                    f.write(f'  "{record_type}": [')
+                    first = True
+                    records = itertools.chain(
+                        (record.dict() for record in retained.get(record_type, [])),
+                        *(self.iter_staged_records(run_id, source, record_type) for source in sources),
+                    )
+                    for record in records:
+                        f.write('\n    ' if first else ',\n    ')
+                        f.write(json.dumps(record, default=str))
+                        first = False
+                    f.write('\n  ],\n' if not first else '],\n')
+                f.write(f'  "last_updated": {json.dumps(datetime.now().isoformat())}\n}}\n')
+            
+            os.replace(tmp_file, self.data_file)
+            self.discard_staging(run_id)
+            logger.info(f"Staged run {run_id} committed to {self.data_file} (sources: {', '.join(sources)})")
+            return True
+        except Exception as e:
+            logger.error(f"Error committing staged run {run_id}: {str(e)}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            return False
+    
+    def discard_staging(self, run_id: str):
+        """Remove the staged records of a run"""
+        shutil.rmtree(os.path.join(self.staging_dir, run_id), ignore_errors=True)
+    
     def get_service_areas(self) -> list:
         """Get all service areas"""
         data = self.load_data()
@@ -96,31 +292,25 @@ class DataStorage:
         data = self.load_data()
         return data.prices
     
+    def resolve_city(self, city: str, state: Optional[str] = None) -> Optional[CityMatch]:
+        """The city in the current snapshot that ``city`` names, tolerating abbreviations and typos"""
+        return self.get_index("city_resolver", CityResolver).resolve(city, state)
+    
+    def resolve_zip(self, zip_code: str, fallback: bool = True) -> Optional[ZipMatch]:
+        """Service areas for a ZIP code, optionally falling back to the nearest served ZIP in its ZIP3"""
+        return self.get_index("zips", ZipIndex).lookup(zip_code, fallback)
+    
+    def get_data_for_areas(self, area_ids: List[str]) -> Dict[str, Any]:
+        """Areas, prices, companies and sizes for the given service area ids"""
+        return self.get_index("areas", AreaIndex).bundle(area_ids)
+    
+    def get_price_ranking(self) -> PriceRanking:
+        """Provider prices per service area, city and size of the current snapshot, cheapest first"""
+        return self.get_index("price_ranking", PriceRanking)
+    
     def get_data_for_city(self, city: str, state: Optional[str] = None) -> Dict[str, Any]:
         """Get all data for a specific city"""
-        data = self.load_data()
-        
-        matching_areas = []
-        for area in data.service_areas:
-            if area.city.lower() == city.lower():
-                if state is None or area.state.lower() == state.lower():
-                    matching_areas.append(area)
-        
-        if not matching_areas:
+        match = self.resolve_city(city, state)
+        if match is None:
             return {}
-        
-        area_ids = [area.id for area in matching_areas]
-        matching_prices = [price for price in data.prices if price.service_area_id in area_ids]
-        
-        company_ids = set(price.company_id for price in matching_prices)
-        size_ids = set(price.size_id for price in matching_prices)
-        
-        matching_companies = [company for company in data.companies if company.id in company_ids]
-        matching_sizes = [size for size in data.dumpster_sizes if size.id in size_ids]
-        
-        return {
-            "service_areas": matching_areas,
-            "companies": matching_companies,
-            "dumpster_sizes": matching_sizes,
-            "prices": matching_prices
-        }
+        return self.get_data_for_areas(match.area_ids)
@@ -0,0 +1,106 @@
+import csv
+import logging
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from .city_resolver import canonical_name
+from .regions import state_code
+from .zip_index import normalize_zip
+
+logger = logging.getLogger(__name__)
+
+# Coordinates of major US cities, shipped with the app
+BUNDLED_GAZETTEER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.csv")
+# Extra Census Gazetteer files (places and/or ZCTAs, tab-separated), separated by os.pathsep
+GAZETTEER_FILES = [path for path in os.getenv("GAZETTEER_FILES", "").split(os.pathsep) if path]
+
+# Census place names end in their legal/statistical area description
+_PLACE_SUFFIXES = (" city", " town", " village", " borough", " municipality", " cdp")
+
+Coordinates = Tuple[float, float]
+
+
+def _place_name(name: str) -> str:
+    name = name.strip()
+    lowered = name.lower()
+    for suffix in _PLACE_SUFFIXES:
+        if lowered.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _read_census(path: str) -> Iterator[Tuple[str, str, str, Coordinates]]:
+    """``(kind, key, state, coordinates)`` rows of a Census place or ZCTA gazetteer file"""
+    with open(path, newline="", encoding="latin-1") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = [column.strip() for column in next(reader)]
+        for row in reader:
+            record = dict(zip(header, (value.strip() for value in row)))
+            try:
+                point = (float(record["INTPTLAT"]), float(record["INTPTLONG"]))
+            except (KeyError, ValueError):
+                continue
+            if "NAME" in record and "USPS" in record:
+                yield "place", _place_name(record["NAME"]), record["USPS"], point
+            elif "GEOID" in record:
+                yield "zip", record["GEOID"], "", point
+
+
+class Gazetteer:
+    """Offline coordinates for US places and ZIP codes.
+
+    Cities are keyed by canonical name and state, so "St. Louis" finds
+    "Saint Louis"; ZIP codes (ZCTAs) only come from Census files.
+    """
+
+    def __init__(self):
+        self.places: Dict[Tuple[str, str], Coordinates] = {}
+        self.zips: Dict[str, Coordinates] = {}
+
+    def __len__(self) -> int:
+        return len(self.places) + len(self.zips)
+
+    def add_place(self, city: str, state: str, latitude: float, longitude: float):
+        self.places.setdefault((canonical_name(city), state_code(state).upper()), (latitude, longitude))
+
+    def load_bundled(self, path: str = BUNDLED_GAZETTEER):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.add_place(row["city"], row["state"], float(row["latitude"]), float(row["longitude"]))
+
+    def load_census(self, path: str):
+        for kind, key, state, (latitude, longitude) in _read_census(path):
+            if kind == "place":
+                self.add_place(key, state, latitude, longitude)
+            else:
+                self.zips.setdefault(key, (latitude, longitude))
+
+    def locate(self, city: Optional[str] = None, state: Optional[str] = None,
+               zip_code: Optional[str] = None) -> Optional[Coordinates]:
+        """Coordinates of a ZIP code if known, otherwise of the city; None if neither is known"""
+        zip_code = normalize_zip(zip_code) if zip_code else None
+        if zip_code in self.zips:
+            return self.zips[zip_code]
+        if city and state:
+            return self.places.get((canonical_name(city), state_code(state).upper()))
+        return None
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """The shared gazetteer: the bundled cities plus any files in GAZETTEER_FILES, loaded once"""
+    global _gazetteer
+    if _gazetteer is None:
+        gazetteer = Gazetteer()
+        # Census files first, so their coordinates win over the bundled approximations
+        for path in GAZETTEER_FILES:
+            try:
+                gazetteer.load_census(path)
+            except OSError as e:
+                logger.error(f"Error loading gazetteer {path}: {str(e)}")
+        gazetteer.load_bundled()
+        logger.info(f"Loaded gazetteer with {len(gazetteer.places)} places and {len(gazetteer.zips)} ZIP codes")
+        _gazetteer = gazetteer
+    return _gazetteer
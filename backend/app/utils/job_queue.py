@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_FILE = os.getenv("SCRAPER_JOB_QUEUE", os.path.join("data", "jobs.db"))
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class JobQueue:
+    """Durable job queue in a local SQLite file, shared by the API and worker processes.
+
+    Workers claim a job by taking a lease on it and must renew the lease
+    with ``heartbeat`` while they work. A job whose lease expires (its
+    worker died or hung) is handed to the next worker that claims, until
+    it has been attempted ``max_attempts`` times.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'queued', attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL DEFAULT 3, lease_owner TEXT, lease_expires REAL, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, error TEXT, result TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    @staticmethod
+    def _job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None, max_attempts: int = 3,
+                unique: bool = False) -> int:
+        """Add a job and return its id.
+
+        With ``unique`` an identical job that is still queued or running is
+        reused instead of adding another one.
+        """
+        payload_json = json.dumps(payload or {}, sort_keys=True)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if unique:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND payload = ? AND status IN ('queued', 'running') "
+                    "ORDER BY id LIMIT 1",
+                    (kind, payload_json),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("COMMIT")
+                    return row["id"]
+
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (kind, payload, max_attempts, created_at) VALUES (?, ?, ?, ?)",
+                (kind, payload_json, max_attempts, time.time()),
+            )
+            self._conn.execute("COMMIT")
+            return cursor.lastrowid
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job to ``owner``; None if there is nothing to do"""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs whose worker stopped heartbeating are retried or given up on
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, lease_owner = NULL, "
+                "error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (owner, now + lease_seconds, now, row["id"]),
+            )
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            self._conn.execute("COMMIT")
+            return self._job(job)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease on a running job; False if ``owner`` no longer holds it"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time() + lease_seconds, job_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a leased job as done"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, lease_owner = NULL, lease_expires = NULL, "
+            "error = NULL, result = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time(), json.dumps(result, default=str) if result is not None else None, job_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str) -> bool:
+        """Release a leased job after an error; it is queued again while attempts remain"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+            "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, error = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time(), error, job_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """A job by id"""
+        return self._job(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first, optionally only those with ``status``"""
+        if status is None:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit))
+        return [self._job(row) for row in rows]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,190 @@
+import argparse
+import logging
+import uuid
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from ..models.dumpster_data import SERVICE_JUNK_REMOVAL
+from .data_storage import DataStorage
+from .gazetteer import get_gazetteer
+from .regions import STATE_CODES
+
+logger = logging.getLogger(__name__)
+
+JUNK_KING_NAME = "Junk King"
+JUNK_KING_WEBSITE = "https://www.junk-king.com"
+SOURCE = "junk_king"
+
+# Ids are derived from the ZIP so re-importing a file updates records in place
+ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, JUNK_KING_WEBSITE)
+
+# Junk King quotes by truck load: min_price is the minimum load, max_price a full truck
+LOAD_SIZES = (
+    ("minimum", 2, "Minimum load (about 1/8 truck)", "min_price"),
+    ("full", 15, "Full truck load", "max_price"),
+)
+
+CSV_DTYPES = {
+    'city': 'string',
+    'state': 'string',
+    'zip': 'string',
+    'is_available': 'string',
+    'min_price': 'string',
+    'max_price': 'string',
+}
+
+DEFAULT_CHUNKSIZE = 10000
+
+_STATE_CODES = pd.Series(STATE_CODES)
+
+
+def record_id(*parts) -> str:
+    """Deterministic id for a Junk King record"""
+    return str(uuid.uuid5(ID_NAMESPACE, ":".join(str(part) for part in parts)))
+
+
+COMPANY_ID = record_id("company")
+
+
+def parse_prices(prices: pd.Series) -> pd.Series:
+    """Convert "$1,234" style strings to floats (NaN where there is no price)"""
+    return pd.to_numeric(prices.str.replace(r'[$,\s]', '', regex=True), errors='coerce')
+
+
+def read_results(csv_file: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Read a Junk King results CSV in chunks of cleaned, typed rows.
+
+    Each chunk has ``city``, ``state`` (two-letter code where known), a
+    zero-padded ``zip``, a boolean ``is_available`` and numeric
+    ``min_price``/``max_price`` columns.
+    """
+    reader = pd.read_csv(csv_file, dtype=CSV_DTYPES, usecols=lambda column: column in CSV_DTYPES,
+                         chunksize=chunksize)
+    for chunk in reader:
+        state = chunk['state'].fillna('').str.strip()
+        yield pd.DataFrame({
+            'city': chunk['city'].fillna('').str.strip(),
+            'state': state.str.lower().map(_STATE_CODES).fillna(state),
+            'zip': chunk['zip'].str.strip().str.zfill(5),
+            'is_available': chunk['is_available'].str.strip().str.lower().eq('true').fillna(False),
+            'min_price': parse_prices(chunk['min_price']),
+            'max_price': parse_prices(chunk['max_price']),
+        })
+
+
+def company_record() -> Dict:
+    return {
+        "id": COMPANY_ID,
+        "name": JUNK_KING_NAME,
+        "website": JUNK_KING_WEBSITE,
+        "logo_url": None,
+        "description": "Junk removal priced by truck load",
+        "phone": None,
+    }
+
+
+def size_records() -> List[Dict]:
+    return [
+        {
+            "id": record_id("size", key),
+            "company_id": COMPANY_ID,
+            "size_yards": size_yards,
+            "description": description,
+            "weight_limit_lbs": None,
+            "suitable_for": None,
+            "service": SERVICE_JUNK_REMOVAL,
+        }
+        for key, size_yards, description, _ in LOAD_SIZES
+    ]
+
+
+def iter_records(csv_file: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[Tuple[str, List[Dict]]]:
+    """Yield ``(record_type, records)`` batches for the available ZIPs in a results CSV.
+
+    Every available ZIP becomes a ZIP-level service area with one price per
+    load size; repeated ZIPs keep their first row.
+    """
+    yield "companies", [company_record()]
+    yield "dumpster_sizes", size_records()
+
+    seen: Set[str] = set()
+    for chunk in read_results(csv_file, chunksize):
+        chunk = chunk[chunk['is_available'] & chunk['zip'].notna() & ~chunk['zip'].isin(seen)]
+        chunk = chunk.drop_duplicates('zip')
+        if chunk.empty:
+            continue
+        seen.update(chunk['zip'])
+
+        area_ids = [record_id("area", zip_code) for zip_code in chunk['zip']]
+        gazetteer = get_gazetteer()
+        located = [
+            gazetteer.locate(city, state, zip_code) or (None, None)
+            for city, state, zip_code in zip(chunk['city'], chunk['state'], chunk['zip'])
+        ]
+        areas = pd.DataFrame({
+            'id': area_ids,
+            'city': chunk['city'].to_numpy(object),
+            'state': chunk['state'].to_numpy(object),
+            'zip_code': chunk['zip'].to_numpy(object),
+            'county': None,
+            # Object columns, so unlocated areas keep None instead of NaN
+            'latitude': pd.Series([latitude for latitude, _ in located], dtype=object),
+            'longitude': pd.Series([longitude for _, longitude in located], dtype=object),
+        })
+        yield "service_areas", areas.to_dict('records')
+
+        for key, _, _, column in LOAD_SIZES:
+            priced = chunk[column].notna().to_numpy()
+            prices = pd.DataFrame({
+                'id': [record_id("price", key, zip_code) for zip_code in chunk['zip'][priced]],
+                'company_id': COMPANY_ID,
+                'size_id': record_id("size", key),
+                'service_area_id': [area_id for area_id, ok in zip(area_ids, priced) if ok],
+                'base_price': chunk[column][priced].to_numpy(float),
+                'additional_day_price': None,
+                'weight_overage_price': None,
+                'rental_period_days': None,
+            })
+            if not prices.empty:
+                yield "prices", prices.to_dict('records')
+
+
+def import_results(csv_file: str, data_storage: DataStorage, chunksize: int = DEFAULT_CHUNKSIZE,
+                   run_id: Optional[str] = None) -> Dict[str, int]:
+    """Import a Junk King results CSV into the data snapshot.
+
+    Records are staged in batches and then merged into the snapshot,
+    replacing any Junk King records from an earlier import.
+    """
+    run_id = run_id or f"junk-king-{uuid.uuid4().hex}"
+    counts = {"companies": 0, "service_areas": 0, "dumpster_sizes": 0, "prices": 0}
+
+    try:
+        for record_type, records in iter_records(csv_file, chunksize):
+            counts[record_type] += data_storage.append_records(run_id, SOURCE, record_type, records)
+    except Exception as e:
+        logger.error(f"Error importing Junk King results from {csv_file}: {str(e)}")
+        data_storage.discard_staging(run_id)
+        raise
+
+    if not data_storage.commit_staging(run_id, sources=[SOURCE], replace_websites={JUNK_KING_WEBSITE}):
+        raise RuntimeError(f"Could not commit Junk King import {run_id}")
+
+    logger.info(f"Imported Junk King results from {csv_file}: {counts}")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import Junk King results into the dumpster dataset")
+    parser.add_argument("csv_file", help="Results CSV written by run_regional_scraper.py")
+    parser.add_argument("--data-dir", default="data", help="Data directory of the API")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows read per chunk")
+    args = parser.parse_args(argv)
+
+    counts = import_results(args.csv_file, DataStorage(args.data_dir), chunksize=args.chunksize)
+    print(", ".join(f"{count} {record_type}" for record_type, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .data_storage import DataStorage
+from .junk_king_import import DEFAULT_CHUNKSIZE, JUNK_KING_WEBSITE, LOAD_SIZES, read_results, record_id
+
+MAJOR_CITIES = [
+    'New York City', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix',
+    'Philadelphia', 'San Antonio', 'San Diego', 'Dallas'
+]
+
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+PRICE_COLUMNS = ['min_price', 'max_price']
+
+
+def load_csv(csv_file: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Load a Junk King results CSV as typed ``city/state/zip/is_available/min_price/max_price`` rows"""
+    return pd.concat(read_results(csv_file, chunksize), ignore_index=True)
+
+
+def load_dataset(data_storage: DataStorage) -> pd.DataFrame:
+    """Load the imported Junk King records of the data snapshot in the same shape as ``load_csv``"""
+    data = data_storage.load_data()
+    company_ids = {company.id for company in data.companies if company.website == JUNK_KING_WEBSITE}
+    size_columns = {record_id("size", key): column for key, _, _, column in LOAD_SIZES}
+
+    prices = pd.DataFrame(
+        [(price.service_area_id, size_columns.get(price.size_id), price.base_price)
+         for price in data.prices if price.company_id in company_ids],
+        columns=['area_id', 'column', 'price'],
+    )
+    areas = pd.DataFrame(
+        [(area.id, area.city, area.state, area.zip_code) for area in data.service_areas],
+        columns=['area_id', 'city', 'state', 'zip'],
+    )
+
+    wide = prices.dropna(subset=['column']).pivot_table(index='area_id', columns='column', values='price', aggfunc='first')
+    frame = areas.merge(wide.reset_index(), on='area_id').drop(columns='area_id')
+    for column in PRICE_COLUMNS:
+        if column not in frame:
+            frame[column] = float('nan')
+    frame['is_available'] = True
+    return frame
+
+
+def _price_stats(grouped) -> pd.DataFrame:
+    """count/min/max/mean plus percentiles for each price column, one row per group"""
+    if grouped.ngroups == 0:
+        # Nothing available: no groups to describe, and no quantile columns to name
+        return pd.DataFrame()
+    stats = grouped[PRICE_COLUMNS].agg(['count', 'min', 'max', 'mean'])
+    quantiles = grouped[PRICE_COLUMNS].quantile(list(PERCENTILES)).unstack()
+    quantiles.columns = pd.MultiIndex.from_tuples(
+        [(column, f"p{round(q * 100)}") for column, q in quantiles.columns]
+    )
+    return stats.join(quantiles).round(2)
+
+
+def _records(stats: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """{group: {price column: {stat: value}}}"""
+    result = {}
+    for group, row in stats.iterrows():
+        entry = {}
+        for (column, stat), value in row.items():
+            entry.setdefault(column, {})[stat] = None if pd.isna(value) else float(value)
+        result[str(group)] = entry
+    return result
+
+
+def build_report(frame: pd.DataFrame, major_cities: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Availability and price statistics overall, by state and for major vs other cities"""
+    major_cities = MAJOR_CITIES if major_cities is None else major_cities
+    total = len(frame)
+    available = frame[frame['is_available']].assign(
+        city_class=lambda df: df['city'].isin(major_cities).map({True: 'major', False: 'other'}),
+        overall='all',
+    )
+
+    return {
+        "total_records": total,
+        "available": int(len(available)),
+        "available_pct": round(len(available) / total * 100, 2) if total else 0.0,
+        "prices": _records(_price_stats(available.groupby('overall'))).get('all', {}),
+        "by_state": _records(_price_stats(available.groupby('state'))),
+        "by_city_class": _records(_price_stats(available.groupby('city_class'))),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a report in the console format of the original analysis script"""
+    print(f"Total records processed: {report['total_records']}")
+    print(f"Available locations: {report['available']} ({report['available_pct']:.2f}%)")
+
+    if not report['available']:
+        return
+
+    def describe(stats, indent=""):
+        low, high = stats.get('min_price', {}), stats.get('max_price', {})
+        print(f"{indent}Min price range: ${low.get('min')} - ${low.get('max')}")
+        print(f"{indent}Max price range: ${high.get('min')} - ${high.get('max')}")
+        print(f"{indent}Average min price: ${low.get('mean') or 0:.2f} (median ${low.get('p50') or 0:.2f})")
+        print(f"{indent}Average max price: ${high.get('mean') or 0:.2f} (median ${high.get('p50') or 0:.2f})")
+
+    print("\nPricing statistics:")
+    describe(report['prices'])
+
+    print("\nPrice ranges by state:")
+    for state, stats in report['by_state'].items():
+        print(f"{state}:")
+        describe(stats, "  ")
+
+    print("\nPrice comparison for major cities vs. other cities:")
+    for city_class, label in (('major', "Major Cities"), ('other', "Other Cities")):
+        if city_class in report['by_city_class']:
+            print(f"{label}:")
+            describe(report['by_city_class'][city_class], "  ")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report Junk King availability and pricing")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", dest="csv_file", help="Results CSV written by run_regional_scraper.py")
+    source.add_argument("--data-dir", help="Report on the Junk King records imported into this data directory")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    frame = load_csv(args.csv_file) if args.csv_file else load_dataset(DataStorage(args.data_dir))
+    report = build_report(frame)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
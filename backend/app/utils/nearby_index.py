@@ -0,0 +1,175 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.dumpster_data import ScrapedData
+from .city_resolver import canonical_name
+from .city_search import area_providers
+from .gazetteer import Gazetteer, get_gazetteer
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Grid cells are this many degrees of latitude and longitude on a side
+CELL_DEGREES = 1.0
+MAX_RESULTS = 50
+
+
+def haversine_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """Great-circle distance between two points given in degrees"""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _is_coordinate(value: Optional[float]) -> bool:
+    """Whether a stored latitude or longitude is usable; NaN and infinities count as missing"""
+    return value is not None and math.isfinite(value)
+
+
+def _cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    return math.floor(latitude / CELL_DEGREES), math.floor(longitude / CELL_DEGREES)
+
+
+class NearbyIndex:
+    """Served cities of a snapshot on a latitude/longitude grid.
+
+    Each city (one per name and state) sits at the mean position of its
+    service areas; areas without coordinates are placed with the
+    gazetteer. A query visits grid cells in rings of growing size around
+    the origin and stops once no unvisited cell can hold a closer city
+    than the k-th found so far, so it only looks at cities near the origin.
+    """
+
+    def __init__(self, data: ScrapedData, gazetteer: Optional[Gazetteer] = None):
+        gazetteer = gazetteer or get_gazetteer()
+        providers = area_providers(data)
+        keys: Dict[Tuple[str, str], int] = {}
+        cities: List[Dict[str, Any]] = []
+        positions: List[List[float]] = []
+        self.area_city: Dict[str, int] = {}
+        for area in data.service_areas:
+            key = (canonical_name(area.city), area.state.upper())
+            i = keys.get(key)
+            if i is None:
+                i = keys[key] = len(cities)
+                cities.append({"city": area.city, "state": area.state, "providers": set(), "service_areas": 0})
+                positions.append([0.0, 0.0, 0])
+            cities[i]["providers"].update(providers.get(area.id, ()))
+            cities[i]["service_areas"] += 1
+            self.area_city[area.id] = i
+
+            if _is_coordinate(area.latitude) and _is_coordinate(area.longitude):
+                point = (area.latitude, area.longitude)
+            else:
+                point = gazetteer.locate(area.city, area.state, area.zip_code)
+            if point is not None:
+                position = positions[i]
+                position[0] += point[0]
+                position[1] += point[1]
+                position[2] += 1
+
+        self.cities: List[Dict[str, Any]] = []
+        self.points: List[Optional[Tuple[float, float]]] = []
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, (city, (latitude, longitude, located)) in enumerate(zip(cities, positions)):
+            point = (latitude / located, longitude / located) if located else None
+            self.points.append(point)
+            self.cities.append({
+                **city,
+                "providers": len(city["providers"]),
+                "latitude": round(point[0], 5) if point else None,
+                "longitude": round(point[1], 5) if point else None,
+            })
+            if point is not None:
+                self.cells[_cell(*point)].append(i)
+        self.cells = dict(self.cells)
+
+        if self.cells:
+            rows = [row for row, _ in self.cells]
+            columns = [column for _, column in self.cells]
+            self.bounds = (min(rows), max(rows), min(columns), max(columns))
+            self.highest = max(abs(point[0]) for point in self.points if point is not None)
+        else:
+            self.bounds = (0, -1, 0, -1)
+            self.highest = 0.0
+
+    def __len__(self) -> int:
+        """Number of cities with a position"""
+        return sum(len(cities) for cities in self.cells.values())
+
+    def origin(self, area_ids: Iterable[str]) -> Tuple[Optional[Tuple[float, float]], Set[int]]:
+        """Position of the first located city among ``area_ids``, and all of their cities"""
+        cities = {self.area_city[area_id] for area_id in area_ids if area_id in self.area_city}
+        located = sorted(i for i in cities if self.points[i] is not None)
+        return (self.points[located[0]] if located else None), cities
+
+    @staticmethod
+    def _reachable(ring: int, last_ring: int, highest: float) -> float:
+        """Lower bound on the distance to points ``ring`` to ``last_ring`` rings away.
+
+        Such a point is at least ``ring - 1`` cells away in latitude or in
+        longitude. Longitude wraps around, so a point ``c`` columns away
+        may also be only ``360 - (c + 1)`` degrees away the other way. By the
+        haversine formula a longitude difference of ``dl`` means
+        ``sin(d / 2) >= cos(highest) * sin(dl / 2)`` when neither latitude
+        exceeds ``highest``.
+        """
+        latitude_degrees = max(0.0, (ring - 1) * CELL_DEGREES)
+        longitude_degrees = max(0.0, min((ring - 1) * CELL_DEGREES, 360 - (last_ring + 1) * CELL_DEGREES))
+        across = 2 * EARTH_RADIUS_KM * math.asin(
+            math.cos(math.radians(highest)) * math.sin(math.radians(min(longitude_degrees, 180.0)) / 2))
+        return min(latitude_degrees * KM_PER_DEGREE, across)
+
+    def _ring(self, row: int, column: int, ring: int) -> Iterable[Tuple[int, int]]:
+        low_row, high_row, low_column, high_column = self.bounds
+        for r in range(max(row - ring, low_row), min(row + ring, high_row) + 1):
+            if abs(r - row) == ring:
+                columns: Iterable[int] = range(max(column - ring, low_column), min(column + ring, high_column) + 1)
+            else:
+                columns = [c for c in (column - ring, column + ring) if low_column <= c <= high_column]
+            for c in columns:
+                yield r, c
+
+    def nearest(self, latitude: float, longitude: float, k: int = 10, radius_km: Optional[float] = None,
+                exclude: Iterable[int] = ()) -> List[Tuple[float, int]]:
+        """``(distance_km, city)`` of the ``k`` closest cities, nearest first"""
+        k = max(0, min(k, MAX_RESULTS))
+        if k == 0 or not self.cells:
+            return []
+        exclude = set(exclude)
+        row, column = _cell(latitude, longitude)
+        low_row, high_row, low_column, high_column = self.bounds
+        last_ring = max(abs(row - low_row), abs(row - high_row), abs(column - low_column), abs(column - high_column))
+        highest = min(max(self.highest, abs(latitude)), 90.0)
+
+        # Max-heap of the best k so far, as (-distance, city)
+        best: List[Tuple[float, int]] = []
+        for ring in range(last_ring + 1):
+            # Nothing in this ring or beyond is closer than this
+            reachable = self._reachable(ring, last_ring, highest)
+            if ring > 0 and ((len(best) == k and -best[0][0] <= reachable)
+                             or (radius_km is not None and radius_km < reachable)):
+                break
+            for cell in self._ring(row, column, ring):
+                for i in self.cells.get(cell, ()):
+                    if i in exclude:
+                        continue
+                    distance = haversine_km(latitude, longitude, *self.points[i])
+                    if radius_km is not None and distance > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, i))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, i))
+
+        return sorted((-distance, i) for distance, i in best)
+
+    def nearby(self, latitude: float, longitude: float, k: int = 10, radius_km: Optional[float] = None,
+               exclude: Iterable[int] = ()) -> List[Dict[str, Any]]:
+        """The ``k`` closest served cities to a point, each with its ``distance_km``"""
+        return [
+            {**self.cities[i], "distance_km": round(distance, 1)}
+            for distance, i in self.nearest(latitude, longitude, k, radius_km, exclude)
+        ]
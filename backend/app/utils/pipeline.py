@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from ..models.dumpster_data import DumpsterCompany, ServiceArea, DumpsterSize, DumpsterPrice
+from .data_storage import DataStorage
+from .gazetteer import get_gazetteer
+from .metrics import RECORDS, REJECTED_RECORDS
+from .run_ledger import RunLedger
+
+if TYPE_CHECKING:
+    from ..scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+RECORD_MODELS = {
+    "companies": DumpsterCompany,
+    "service_areas": ServiceArea,
+    "dumpster_sizes": DumpsterSize,
+    "prices": DumpsterPrice,
+}
+
+_DONE = object()
+
+
+class PublishError(Exception):
+    """A scrape run whose records were not published; the previous snapshot is still current"""
+
+    def __init__(self, message: str, counts: Optional[Dict[str, int]] = None):
+        super().__init__(message)
+        # Records staged by the run
+        self.counts = counts
+
+
+class ScrapePipeline:
+    """Stream scraped records through a bounded queue into staged storage.
+
+    Scrapers run concurrently and push ``(record_type, record)`` pairs into a
+    bounded queue; a single writer validates them and appends them to the
+    run's staging area in batches. When the queue is full the scrapers wait,
+    so memory stays flat regardless of how many records a run produces.
+    With a ``ledger`` every run, scraper and page fetch is recorded in it.
+    """
+
+    def __init__(self, data_storage: DataStorage, batch_size: int = 500, queue_size: int = 2000,
+                 ledger: Optional[RunLedger] = None):
+        self.data_storage = data_storage
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.ledger = ledger
+        # Sources whose scraper failed in the last run
+        self.failed: List[str] = []
+
+    async def run(self, scrapers: Sequence["BaseScraper"], run_id: Optional[str] = None) -> Dict[str, int]:
+        """Run the scrapers, stage their records and publish the snapshot.
+
+        The results replace only the records of the companies these
+        scrapers cover, so providers whose scraper fails keep their previous
+        records and companies no scraper covers (imported Junk King results)
+        are kept as well. Returns the staged record counts once the snapshot
+        is published; raises PublishError if nothing was published.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        self.failed = []
+        reports: Dict[str, Dict[str, Any]] = {}
+        if self.ledger is not None:
+            await self._record(self.ledger.start_run, run_id, [self._source(scraper) for scraper in scrapers])
+        try:
+            counts = await self._run(scrapers, run_id, reports)
+        except PublishError as e:
+            await self._finish(run_id, "failed", scrapers, reports, e.counts, error=str(e))
+            raise
+        except Exception as e:
+            await self._finish(run_id, "error", scrapers, reports, error=str(e))
+            raise
+
+        await self._finish(run_id, "published", scrapers, reports, counts)
+        return counts
+
+    async def _run(self, scrapers: Sequence["BaseScraper"], run_id: str,
+                   reports: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        writer = asyncio.create_task(self._write(queue, run_id, reports))
+        producers = asyncio.gather(*(self._produce(scraper, queue, reports) for scraper in scrapers))
+
+        # The writer only finishes before the producers if it failed
+        await asyncio.wait({writer, producers}, return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            producers.cancel()
+            writer.result()
+
+        succeeded = [scraper for scraper, ok in zip(scrapers, producers.result()) if ok]
+        self.failed = [self._source(scraper) for scraper, ok in zip(scrapers, producers.result()) if not ok]
+        await queue.put(_DONE)
+        counts = await writer
+
+        if not succeeded:
+            logger.error(f"Run {run_id} had no successful scrapers; keeping the current snapshot")
+            self.data_storage.discard_staging(run_id)
+            raise PublishError("No scraper succeeded; the snapshot was not updated", counts)
+
+        sources = [self._source(scraper) for scraper in succeeded]
+        replace_websites = {scraper.base_url for scraper in succeeded}
+        if not self.data_storage.commit_staging(run_id, sources=sources, replace_websites=replace_websites):
+            # The staged records stay on disk, so the run can still be committed later
+            raise PublishError(f"Could not commit run {run_id}; the snapshot was not updated", counts)
+        return counts
+
+    async def _record(self, method, *args, **kwargs):
+        """Write to the run ledger without letting a ledger failure break the run"""
+        try:
+            await asyncio.to_thread(method, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error writing to the run ledger: {str(e)}")
+
+    async def _finish(self, run_id: str, status: str, scrapers: Sequence["BaseScraper"],
+                      reports: Dict[str, Dict[str, Any]], counts: Optional[Dict[str, int]] = None,
+                      error: Optional[str] = None):
+        if self.ledger is None:
+            return
+        for scraper in scrapers:
+            report = reports.get(self._source(scraper))
+            if report is None or "started_at" not in report:
+                continue
+            await self._record(
+                self.ledger.record_scraper, run_id, self._source(scraper), report["ok"],
+                report["started_at"], report.get("finished_at", time.time()), scraper.fallbacks,
+                report["counts"], report["rejected"], scraper.fetch_log, report.get("error"),
+            )
+        rejected = sum(report["rejected"] for report in reports.values())
+        await self._record(self.ledger.finish_run, run_id, status, counts, rejected, error)
+
+    @staticmethod
+    def _source(scraper: "BaseScraper") -> str:
+        return scraper.name or scraper.__class__.__name__
+
+    @staticmethod
+    def _report(reports: Dict[str, Dict[str, Any]], source: str) -> Dict[str, Any]:
+        report = reports.get(source)
+        if report is None:
+            report = reports[source] = {
+                "ok": False, "counts": {record_type: 0 for record_type in RECORD_MODELS}, "rejected": 0,
+            }
+        return report
+
+    async def _produce(self, scraper: "BaseScraper", queue: asyncio.Queue,
+                       reports: Dict[str, Dict[str, Any]]) -> bool:
+        name = scraper.__class__.__name__
+        source = self._source(scraper)
+        report = self._report(reports, source)
+        report["started_at"] = time.time()
+        try:
+            async with scraper:
+                logger.info(f"Starting scraper for {name}")
+                async for record_type, record in scraper.stream_records():
+                    await queue.put((source, record_type, record))
+                logger.info(f"Completed scraper for {name}")
+            report["ok"] = True
+            return True
+        except Exception as e:
+            report["error"] = str(e)
+            logger.error(f"Error in {name} scraper: {str(e)}")
+            return False
+        finally:
+            report["finished_at"] = time.time()
+
+    async def _write(self, queue: asyncio.Queue, run_id: str, reports: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        batches: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        counts = {record_type: 0 for record_type in RECORD_MODELS}
+        rejected = 0
+
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+
+            source, record_type, record = item
+            try:
+                model = RECORD_MODELS[record_type](**record)
+            except (KeyError, ValidationError) as e:
+                rejected += 1
+                self._report(reports, source)["rejected"] += 1
+                REJECTED_RECORDS.inc(source=source, record_type=record_type)
+                logger.warning(f"Rejected {record_type} record from {source}: {str(e)}")
+                continue
+            if isinstance(model, ServiceArea) and (model.latitude is None or model.longitude is None):
+                located = get_gazetteer().locate(model.city, model.state, model.zip_code)
+                if located is not None:
+                    model.latitude, model.longitude = located
+
+            batch = batches[(source, record_type)]
+            batch.append(model.dict())
+            if len(batch) >= self.batch_size:
+                counts[record_type] += await self._flush(run_id, source, record_type, batch, reports)
+                batches[(source, record_type)] = []
+
+        for (source, record_type), batch in batches.items():
+            if batch:
+                counts[record_type] += await self._flush(run_id, source, record_type, batch, reports)
+
+        logger.info(f"Run {run_id} staged {counts} ({rejected} rejected)")
+        return counts
+
+    async def _flush(self, run_id: str, source: str, record_type: str, batch: List[dict],
+                     reports: Dict[str, Dict[str, Any]]) -> int:
+        written = await asyncio.to_thread(self.data_storage.append_records, run_id, source, record_type, batch)
+        RECORDS.inc(written, source=source, record_type=record_type)
+        self._report(reports, source)["counts"][record_type] += written
+        return written
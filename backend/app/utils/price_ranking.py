@@ -0,0 +1,144 @@
+from collections import defaultdict
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..models.dumpster_data import SERVICE_DUMPSTER, DumpsterPrice, ScrapedData
+from .city_resolver import canonical_name
+
+# Sorting is stable, so equal prices keep their snapshot order
+_by_price = attrgetter("base_price")
+
+
+def rental_cost(price: DumpsterPrice, days: int) -> Optional[float]:
+    """What renting for ``days`` days costs at ``price``.
+
+    The base price covers the rental period and every further day costs
+    ``additional_day_price``; None when such days have no price. Prices
+    without a rental period are flat.
+    """
+    extra_days = days - price.rental_period_days if price.rental_period_days is not None else 0
+    if extra_days <= 0:
+        return price.base_price
+    if price.additional_day_price is None:
+        return None
+    return round(price.base_price + extra_days * price.additional_day_price, 2)
+
+
+class PriceRanking:
+    """Provider prices per service area and dumpster size, cheapest first.
+
+    Rankings are precomputed for every (service area, size in yards) and
+    for every city (name and state), where each company appears once with
+    its cheapest price in any of the city's areas. Both are a dictionary
+    lookup. A company's cheapest base price need not be its cheapest
+    rental once extra days are charged, so every price in the city is
+    kept as well, and totals for a rental length pick each company's
+    cheapest total among them.
+    """
+
+    def __init__(self, data: ScrapedData):
+        self.companies = {company.id: company for company in data.companies}
+        # Other services (Junk King truck loads) are not dumpster rentals and aren't ranked
+        self.sizes = {size.id: size for size in data.dumpster_sizes if size.service == SERVICE_DUMPSTER}
+        self.areas = {area.id: area for area in data.service_areas}
+        self.area_city = {
+            area.id: (canonical_name(area.city), area.state.upper()) for area in data.service_areas
+        }
+
+        self.by_area: Dict[Tuple[str, int], List[DumpsterPrice]] = defaultdict(list)
+        # (city, size in yards) -> company id -> its cheapest price there
+        cheapest: Dict[Tuple[Tuple[str, str], int], Dict[str, DumpsterPrice]] = defaultdict(dict)
+        self.all_by_city: Dict[Tuple[Tuple[str, str], int], List[DumpsterPrice]] = defaultdict(list)
+        for price in data.prices:
+            size = self.sizes.get(price.size_id)
+            city = self.area_city.get(price.service_area_id)
+            if size is None or city is None:
+                continue
+            self.by_area[(price.service_area_id, size.size_yards)].append(price)
+            self.all_by_city[(city, size.size_yards)].append(price)
+            companies = cheapest[(city, size.size_yards)]
+            current = companies.get(price.company_id)
+            if current is None or price.base_price < current.base_price:
+                companies[price.company_id] = price
+        for prices in self.by_area.values():
+            prices.sort(key=_by_price)
+        self.by_area = dict(self.by_area)
+        self.all_by_city = dict(self.all_by_city)
+        self.by_city: Dict[Tuple[Tuple[str, str], int], List[DumpsterPrice]] = {
+            key: sorted(companies.values(), key=_by_price) for key, companies in cheapest.items()
+        }
+        self.sizes_by_city: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for city, size_yards in sorted(self.by_city):
+            self.sizes_by_city[city].append(size_yards)
+
+    def area_prices(self, area_id: str, size_yards: int) -> List[DumpsterPrice]:
+        """Prices for a size in one service area, cheapest first"""
+        return self.by_area.get((area_id, size_yards), [])
+
+    def city_prices(self, area_ids: Iterable[str], size_yards: int) -> List[DumpsterPrice]:
+        """Cheapest price per company for a size in the cities these areas belong to"""
+        cities = list(dict.fromkeys(self.area_city[area_id] for area_id in area_ids if area_id in self.area_city))
+        rankings = [self.by_city[(city, size_yards)] for city in cities if (city, size_yards) in self.by_city]
+        if len(rankings) <= 1:
+            return rankings[0] if rankings else []
+        # A name found in several states: each company's cheapest price in any of them
+        cheapest: Dict[str, DumpsterPrice] = {}
+        for price in sorted((price for prices in rankings for price in prices), key=_by_price):
+            cheapest.setdefault(price.company_id, price)
+        return list(cheapest.values())
+
+    def city_totals(self, area_ids: Iterable[str], size_yards: int,
+                    days: int) -> List[Tuple[DumpsterPrice, Optional[float]]]:
+        """Each company's cheapest price for a ``days``-day rental in these areas' cities, with its total.
+
+        Cheapest first; companies whose total cannot be computed come last,
+        with their cheapest base price.
+        """
+        cities = dict.fromkeys(self.area_city[area_id] for area_id in area_ids if area_id in self.area_city)
+        best: Dict[str, Tuple[DumpsterPrice, Optional[float]]] = {}
+        for city in cities:
+            for price in self.all_by_city.get((city, size_yards), ()):
+                total = rental_cost(price, days)
+                current = best.get(price.company_id)
+                if current is None or self._cheaper(total, price, *current):
+                    best[price.company_id] = (price, total)
+        return sorted(best.values(), key=lambda entry: (entry[1] is None, entry[1] or 0.0, entry[0].base_price))
+
+    @staticmethod
+    def _cheaper(total: Optional[float], price: DumpsterPrice,
+                 current: DumpsterPrice, current_total: Optional[float]) -> bool:
+        if total is None or current_total is None:
+            # A known total beats an unknown one; between unknowns the lower base price wins
+            return (total is not None and current_total is None) or (
+                total is None and current_total is None and price.base_price < current.base_price)
+        return total < current_total
+
+    def city_sizes(self, area_ids: Iterable[str]) -> List[int]:
+        """Sizes in yards with prices in the cities these areas belong to"""
+        cities = {self.area_city[area_id] for area_id in area_ids if area_id in self.area_city}
+        return sorted({size_yards for city in cities for size_yards in self.sizes_by_city.get(city, ())})
+
+    def offer(self, price: DumpsterPrice, days: Optional[int] = None) -> Dict[str, Any]:
+        """A price with its company, size and area, and with ``days`` the total for that rental"""
+        company = self.companies.get(price.company_id)
+        area = self.areas.get(price.service_area_id)
+        offer = {
+            **price.model_dump(),
+            "company_name": company.name if company else None,
+            "size_yards": self.sizes[price.size_id].size_yards,
+            "city": area.city if area else None,
+            "zip_code": area.zip_code if area else None,
+        }
+        if days is not None:
+            offer["total_price"] = rental_cost(price, days)
+        return offer
+
+    def compare(self, area_ids: Iterable[str], size_yards: int, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Offers for a size in a city, one per company, cheapest first.
+
+        With ``days`` each company's offer is its cheapest total for that
+        rental, and offers whose total cannot be computed come last.
+        """
+        if days is None:
+            return [self.offer(price) for price in self.city_prices(area_ids, size_yards)]
+        return [self.offer(price, days) for price, _ in self.city_totals(area_ids, size_yards, days)]
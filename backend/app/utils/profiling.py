@@ -0,0 +1,122 @@
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Profiling is only available when a token is configured; requests and
+# scrapes ask for a profile by presenting it in the X-Profile-Token header
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("logs", "profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+PROFILE_HEADER = "X-Profile-Token"
+
+
+def profiling_enabled() -> bool:
+    return bool(PROFILE_TOKEN)
+
+
+def check_token(token: Optional[str]) -> bool:
+    """Whether ``token`` matches the configured profiling token"""
+    # Compare bytes: compare_digest rejects str arguments with non-ASCII characters
+    return (profiling_enabled() and token is not None
+            and hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples Python stacks from a background thread.
+
+    Every ``interval_ms`` it records the stack of one thread (by default the
+    one that created it, e.g. the event loop) or of all threads, and counts
+    identical stacks. Results are written in the folded-stack format read by
+    flamegraph.pl, inferno and speedscope. Nothing runs unless a profiler is
+    started, so there is no cost when profiling is off.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, all_threads: bool = False,
+                 thread_id: Optional[int] = None, max_seconds: float = PROFILE_MAX_SECONDS):
+        self.interval = interval_ms / 1000
+        self.all_threads = all_threads
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self, thread_names: Dict[int, str]):
+        frames = sys._current_frames()
+        if self.all_threads:
+            targets = [(ident, frame) for ident, frame in frames.items() if ident != threading.get_ident()]
+        else:
+            frame = frames.get(self.thread_id)
+            targets = [(self.thread_id, frame)] if frame is not None else []
+
+        for ident, frame in targets:
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if self.all_threads:
+                stack.append(thread_names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()} if self.all_threads else {}
+            self._sample(thread_names)
+            if time.monotonic() >= deadline:
+                logger.warning(f"Profiler stopped after the {self.max_seconds}s limit")
+                break
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def folded(self) -> str:
+        """Collected stacks as ``frame;frame;frame count`` lines, most frequent first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def save(self, name: str, directory: str = PROFILE_DIR) -> str:
+        """Write the folded stacks to ``directory`` and return the file path"""
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '-', name).strip('-') or "profile"
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}"
+        path = os.path.join(directory, f"{stamp}-{slug}.folded")
+        with open(path, "w") as f:
+            f.write(self.folded())
+        logger.info(f"Saved profile with {self.samples} samples to {path}")
+        return path
@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RUN_LEDGER_FILE = os.getenv("SCRAPER_RUN_LEDGER", os.path.join("data", "runs.db"))
+
+# (url, status, bytes, seconds, fetched_at) as collected by BaseScraper
+Fetch = Tuple[str, str, int, float, float]
+
+
+class RunLedger:
+    """Persistent history of scrape runs in a local SQLite file.
+
+    Every run records its providers, outcome and record counts; every
+    scraper in it records its start and end, which hard-coded fallbacks it
+    used, its record counts and each page it fetched with its status, size
+    and latency. The API and the scrape workers share the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Opened on first use, so importing the API doesn't create the file
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with self._lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id TEXT PRIMARY KEY, providers TEXT, status TEXT NOT NULL DEFAULT 'running', "
+            "started_at REAL NOT NULL, finished_at REAL, counts TEXT, rejected INTEGER, error TEXT);"
+            "CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);"
+            "CREATE TABLE IF NOT EXISTS scraper_runs ("
+            "run_id TEXT NOT NULL, scraper TEXT NOT NULL, ok INTEGER NOT NULL, "
+            "started_at REAL NOT NULL, finished_at REAL NOT NULL, fallbacks TEXT NOT NULL, "
+            "counts TEXT NOT NULL, rejected INTEGER NOT NULL, error TEXT, PRIMARY KEY (run_id, scraper));"
+            "CREATE INDEX IF NOT EXISTS scraper_runs_scraper ON scraper_runs (scraper, started_at);"
+            "CREATE TABLE IF NOT EXISTS fetches ("
+            "run_id TEXT NOT NULL, scraper TEXT NOT NULL, url TEXT NOT NULL, status TEXT NOT NULL, "
+            "bytes INTEGER NOT NULL, seconds REAL NOT NULL, fetched_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS fetches_run ON fetches (run_id, scraper);"
+        )
+        return conn
+
+    def start_run(self, run_id: str, providers: Optional[Sequence[str]] = None):
+        """Record that a run started; ``providers`` None means all of them"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO runs (run_id, providers, started_at) VALUES (?, ?, ?)",
+            (run_id, json.dumps(list(providers)) if providers is not None else None, time.time()),
+        )
+
+    def finish_run(self, run_id: str, status: str, counts: Optional[Dict[str, int]] = None,
+                   rejected: int = 0, error: Optional[str] = None):
+        """Record how a run ended: "published", "failed" (no scraper succeeded) or "error" """
+        self._conn.execute(
+            "UPDATE runs SET status = ?, finished_at = ?, counts = ?, rejected = ?, error = ? WHERE run_id = ?",
+            (status, time.time(), json.dumps(counts or {}), rejected, error, run_id),
+        )
+
+    def record_scraper(self, run_id: str, scraper: str, ok: bool, started_at: float, finished_at: float,
+                       fallbacks: Iterable[str], counts: Dict[str, int], rejected: int,
+                       fetches: Sequence[Fetch], error: Optional[str] = None):
+        """Record one scraper's part of a run together with its page fetches"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scraper_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, scraper, int(ok), started_at, finished_at, json.dumps(sorted(fallbacks)),
+                 json.dumps(counts), rejected, error),
+            )
+            self._conn.execute("DELETE FROM fetches WHERE run_id = ? AND scraper = ?", (run_id, scraper))
+            self._conn.executemany(
+                "INSERT INTO fetches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, scraper, url, str(status), size, seconds, fetched_at)
+                 for url, status, size, seconds, fetched_at in fetches),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _run(row: sqlite3.Row) -> Dict[str, Any]:
+        run = dict(row)
+        run["providers"] = json.loads(run["providers"]) if run["providers"] else None
+        run["counts"] = json.loads(run["counts"]) if run["counts"] else None
+        run["duration_seconds"] = run["finished_at"] - run["started_at"] if run["finished_at"] else None
+        return run
+
+    def _scrapers(self, run_ids: Sequence[str], scraper: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Per-scraper summaries with fetch statistics, grouped by run"""
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        query = (
+            "SELECT s.*, COUNT(f.url) AS pages, "
+            "COALESCE(SUM(f.status != '200'), 0) AS failed_pages, COALESCE(SUM(f.bytes), 0) AS bytes, "
+            "COALESCE(SUM(f.seconds), 0) AS fetch_seconds, MAX(f.seconds) AS slowest_fetch_seconds "
+            "FROM scraper_runs s LEFT JOIN fetches f ON f.run_id = s.run_id AND f.scraper = s.scraper "
+            f"WHERE s.run_id IN ({placeholders})"
+        )
+        params: List[Any] = list(run_ids)
+        if scraper is not None:
+            query += " AND s.scraper = ?"
+            params.append(scraper)
+        query += " GROUP BY s.run_id, s.scraper ORDER BY s.scraper"
+
+        scrapers: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._conn.execute(query, params):
+            entry = dict(row)
+            entry["ok"] = bool(entry["ok"])
+            entry["fallbacks"] = json.loads(entry["fallbacks"])
+            entry["counts"] = json.loads(entry["counts"])
+            entry["duration_seconds"] = entry["finished_at"] - entry["started_at"]
+            entry["mean_fetch_seconds"] = entry["fetch_seconds"] / entry["pages"] if entry["pages"] else None
+            scrapers.setdefault(entry.pop("run_id"), []).append(entry)
+        return scrapers
+
+    def list_runs(self, limit: int = 20, scraper: Optional[str] = None,
+                  status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent runs first, each with its per-scraper summaries.
+
+        With ``scraper`` only runs that included it are listed, showing only
+        its summary, which makes one site's timings easy to follow over time.
+        """
+        query = "SELECT * FROM runs"
+        conditions, params = [], []
+        if scraper is not None:
+            conditions.append("run_id IN (SELECT run_id FROM scraper_runs WHERE scraper = ?)")
+            params.append(scraper)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+
+        runs = [self._run(row) for row in self._conn.execute(query, params)]
+        scrapers = self._scrapers([run["run_id"] for run in runs], scraper)
+        for run in runs:
+            run["scrapers"] = scrapers.get(run["run_id"], [])
+        return runs
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """A run with its per-scraper summaries and every page fetched, slowest first"""
+        row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+
+        run = self._run(row)
+        run["scrapers"] = self._scrapers([run_id]).get(run_id, [])
+        fetches: Dict[str, List[Dict[str, Any]]] = {}
+        for fetch in self._conn.execute(
+            "SELECT scraper, url, status, bytes, seconds, fetched_at FROM fetches "
+            "WHERE run_id = ? ORDER BY seconds DESC",
+            (run_id,),
+        ):
+            fetch = dict(fetch)
+            fetches.setdefault(fetch.pop("scraper"), []).append(fetch)
+        for entry in run["scrapers"]:
+            entry["fetches"] = fetches.get(entry["scraper"], [])
+        return run
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,103 +1,262 @@
 import asyncio
+import json
 import logging
+import random
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
 
-from ..scrapers.waste_management_scraper import WasteManagementScraper
-from ..scrapers.budget_dumpster_scraper import BudgetDumpsterScraper
-from ..scrapers.liberty_dumpsters_scraper import LibertyDumpstersScraper
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..scrapers.registry import get_scrapers
+from ..utils.cron import CronSchedule
 from ..utils.data_storage import DataStorage
+from ..utils.job_queue import JobQueue
+from ..utils.pipeline import ScrapePipeline
+from ..utils.profiling import SamplingProfiler
+from ..utils.run_ledger import RunLedger
 
 logger = logging.getLogger(__name__)
 
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+# Cron expression for full scrapes (default: Sundays at 03:00), a random delay
+# of up to SCRAPER_SCHEDULE_JITTER_SECONDS added to every scheduled run, and
+# the age after which data counts as stale at startup
+SCRAPER_SCHEDULE = os.getenv("SCRAPER_SCHEDULE", "0 3 * * 0")
+SCRAPER_SCHEDULE_JITTER_SECONDS = float(os.getenv("SCRAPER_SCHEDULE_JITTER_SECONDS", "900"))
+SCRAPER_MAX_DATA_AGE_HOURS = float(os.getenv("SCRAPER_MAX_DATA_AGE_HOURS", str(7 * 24)))
+
+_file_handler: Optional[logging.FileHandler] = None
 
-file_handler = logging.FileHandler(log_dir / "scraper_runs.log")
-file_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+def _attach_run_log():
+    """Log scraper runs to logs/scraper_runs.log, opened on the first run"""
+    global _file_handler
+    if _file_handler is not None:
+        return
+    
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    
+    _file_handler = logging.FileHandler(log_dir / "scraper_runs.log")
+    _file_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    _file_handler.setFormatter(formatter)
+    logger.addHandler(_file_handler)
 
 class ScraperScheduler:
-    """Scheduler for running scrapers on a regular basis"""
+    """Scheduler for running scrapers on a regular basis.
+
+    Run times come from a cron expression plus random jitter. The last run
+    and the next scheduled run are persisted next to the data, so a restart
+    resumes the schedule instead of scraping again. With a ``job_queue``
+    scheduled runs are queued for the scrape workers instead of run here.
+    Runs made here are recorded in ``run_ledger`` when one is given.
+    """
     
-    def __init__(self, data_storage: DataStorage):
+    def __init__(self, data_storage: DataStorage, providers: Optional[Iterable[str]] = None,
+                 schedule: str = SCRAPER_SCHEDULE, jitter_seconds: float = SCRAPER_SCHEDULE_JITTER_SECONDS,
+                 max_data_age_hours: float = SCRAPER_MAX_DATA_AGE_HOURS, job_queue: Optional[JobQueue] = None,
+                 run_ledger: Optional[RunLedger] = None):
         self.data_storage = data_storage
+        self.job_queue = job_queue
+        self.run_ledger = run_ledger
+        self.providers: Optional[List[str]] = list(providers) if providers is not None else None
+        self.schedule = CronSchedule(schedule)
+        self.jitter_seconds = jitter_seconds
+        self.max_data_age = timedelta(hours=max_data_age_hours)
+        self.state_file = os.path.join(data_storage.data_dir, "scheduler_state.json")
         self.running = False
-        self.last_run = None
+        self.scrape_running = False
+        # True while the first scrape for an empty dataset is in progress
+        self.warming = False
+        
+        self.last_run: Optional[datetime] = None
+        self.last_full_run: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.next_run: Optional[datetime] = None
+        # Folded-stack file of the last profiled run
+        self.last_profile: Optional[str] = None
+        self.refresh_state()
     
-    async def run_scrapers(self):
-        """Run all scrapers and store the data"""
+    def _load_state(self) -> Dict[str, Any]:
+        """Load persisted scheduler state"""
         try:
-            logger.info("Starting scheduled scraper run")
-            
-            scrapers = [
-                WasteManagementScraper(),
-                BudgetDumpsterScraper(),
-                LibertyDumpstersScraper()
-            ]
-            
-            all_companies = []
-            all_service_areas = []
-            all_dumpster_sizes = []
-            all_prices = []
-            
-            for scraper in scrapers:
-                try:
-                    async with scraper:
-                        logger.info(f"Starting scraper for {scraper.__class__.__name__}")
-                        
-                        company = await scraper.scrape_company_info()
-                        all_companies.append(company)
-                        
-                        service_areas = await scraper.scrape_service_areas()
-                        all_service_areas.extend(service_areas)
-                        
-                        dumpster_sizes = await scraper.scrape_dumpster_sizes()
-                        all_dumpster_sizes.extend(dumpster_sizes)
-                        
-                        prices = await scraper.scrape_prices()
-                        all_prices.extend(prices)
-                        
-                        logger.info(f"Completed scraper for {scraper.__class__.__name__}")
-                except Exception as e:
-                    logger.error(f"Error in {scraper.__class__.__name__} scraper: {str(e)}")
-            
-            from ..models.dumpster_data import ScrapedData, DumpsterCompany, ServiceArea, DumpsterSize, DumpsterPrice
+            if not os.path.exists(self.state_file):
+                return {}
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            for key in ("last_run", "last_full_run", "next_run"):
+                if state.get(key):
+                    state[key] = datetime.fromisoformat(state[key])
+            return state
+        except Exception as e:
+            logger.error(f"Error loading scheduler state: {str(e)}")
+            return {}
+    
+    def _apply_state(self, state: Dict[str, Any]):
+        self.last_run = state.get("last_run")
+        self.last_full_run = state.get("last_full_run")
+        self.last_error = state.get("last_error")
+        # A stored next run only applies while the schedule is unchanged
+        self.next_run = state.get("next_run") if state.get("schedule") == self.schedule.expression else None
+    
+    def refresh_state(self):
+        """Reload the persisted state, which worker processes may have updated"""
+        self._apply_state(self._load_state())
+    
+    def _save_state(self, **changes):
+        """Merge ``changes`` into the persisted state atomically"""
+        try:
+            with self.data_storage.publish_lock():
+                state = self._load_state()
+                if state.get("schedule") != self.schedule.expression:
+                    state.pop("next_run", None)
+                state.update(changes, schedule=self.schedule.expression)
+                
+                tmp_file = f"{self.state_file}.tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(state, f, indent=2, default=lambda value: value.isoformat())
+                os.replace(tmp_file, self.state_file)
+            self._apply_state(state)
+        except Exception as e:
+            logger.error(f"Error saving scheduler state: {str(e)}")
+    
+    def state(self) -> Dict[str, Any]:
+        """Current schedule state"""
+        self.refresh_state()
+        return {
+            "schedule": self.schedule.expression,
+            "running": self.running,
+            "scrape_running": self.scrape_running,
+            "last_run": self.last_run,
+            "last_full_run": self.last_full_run,
+            "next_run": self.next_run,
+            "last_error": self.last_error,
+            "stale": self.is_stale(),
+        }
+    
+    def schedule_next_run(self, now: Optional[datetime] = None) -> datetime:
+        """Pick and persist the next run: the next cron time plus jitter"""
+        now = now or datetime.now()
+        next_run = self.schedule.next_after(now) + timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        self._save_state(next_run=next_run)
+        self.next_run = next_run
+        return next_run
+    
+    def _data_age_reference(self) -> Optional[datetime]:
+        """When the data was last fully refreshed, falling back to the snapshot file for older deployments"""
+        if self.last_full_run:
+            return self.last_full_run
+        if self.data_storage.get_companies():
+            return datetime.fromtimestamp(os.path.getmtime(self.data_storage.data_file))
+        return None
+    
+    def is_stale(self, now: Optional[datetime] = None) -> bool:
+        """Whether the data is missing, older than the max age, or a scheduled run was missed"""
+        now = now or datetime.now()
+        self.refresh_state()
+        refreshed = self._data_age_reference()
+        if refreshed is None or now - refreshed >= self.max_data_age:
+            return True
+        return self.next_run is not None and self.next_run <= now
+    
+    def check_warming(self) -> bool:
+        """Mark the scheduler as warming when there is no data yet; return whether it is"""
+        self.warming = self._data_age_reference() is None
+        return self.warming
+    
+    async def trigger(self, providers: Optional[Iterable[str]] = None, profile: bool = False) -> Optional[int]:
+        """Start a scrape: queue it for the workers if there is a job queue, else run it here.
+
+        Returns the job id of a queued scrape.
+        """
+        if self.job_queue is None:
+            await self.run_scrapers(providers, profile=profile)
+            return None
+        
+        providers = self.providers if providers is None else list(providers)
+        payload: Dict[str, Any] = {"providers": providers}
+        if profile:
+            payload["profile"] = True
+        job_id = self.job_queue.enqueue("scrape", payload, unique=True)
+        logger.info(f"Queued scrape job {job_id} for {', '.join(providers) if providers else 'all providers'}")
+        return job_id
+    
+    async def run_scrapers(self, providers: Optional[Iterable[str]] = None,
+                           profile: bool = False) -> Optional[Dict[str, int]]:
+        """Run scrapers and store the data.
+
+        ``providers`` (default: the scheduler's providers, else all) selects
+        registry entries to re-scrape; only their records in the current
+        snapshot are replaced. With ``profile`` every thread is sampled for
+        the whole run and the profile is saved to ``last_profile``. Returns
+        the record counts, or None if the run failed. A run where some
+        scrapers failed publishes the others but still counts as failed, and
+        only a fully successful run of every provider sets ``last_full_run``.
+        """
+        _attach_run_log()
+        self.scrape_running = True
+        profiler = SamplingProfiler(all_threads=True, max_seconds=float("inf")).start() if profile else None
+        try:
+            providers = self.providers if providers is None else list(providers)
+            logger.info(f"Starting scheduled scraper run for {', '.join(providers) if providers else 'all providers'}")
             
-            scraped_data = ScrapedData(
-                companies=[DumpsterCompany(**company) for company in all_companies],
-                service_areas=[ServiceArea(**area) for area in all_service_areas],
-                dumpster_sizes=[DumpsterSize(**size) for size in all_dumpster_sizes],
-                prices=[DumpsterPrice(**price) for price in all_prices]
-            )
+            scrapers = get_scrapers(providers)
+            pipeline = ScrapePipeline(self.data_storage, ledger=self.run_ledger)
+            counts = await pipeline.run(scrapers)
+            logger.info(f"Scraped records: {counts}")
             
-            self.data_storage.save_data(scraped_data)
-            self.last_run = datetime.now()
-            logger.info(f"Scheduled scraper run completed successfully at {self.last_run}")
+            finished = datetime.now()
+            if pipeline.failed:
+                error = f"Scrapers failed: {', '.join(pipeline.failed)}; their previous records were kept"
+                self._save_state(last_run=finished, last_error=error)
+                logger.error(f"Scheduled scraper run published partial results: {error}")
+                return None
+            changes = {"last_run": finished, "last_error": None}
+            if providers is None:
+                changes["last_full_run"] = finished
+            self._save_state(**changes)
+            logger.info(f"Scheduled scraper run completed successfully at {finished}")
+            return counts
             
         except Exception as e:
+            self._save_state(last_error=str(e))
             logger.error(f"Error during scheduled scraping: {str(e)}")
+            return None
+        finally:
+            self.scrape_running = False
+            if profiler is not None:
+                self.last_profile = profiler.stop().save(f"scrape-{'-'.join(providers) if providers else 'all'}")
     
-    async def start_weekly_schedule(self):
-        """Start the weekly scraper schedule"""
+    async def start_schedule(self):
+        """Run scrapers on the cron schedule until stopped.
+
+        The first run happens right away only if the data is stale;
+        otherwise the persisted (or a newly picked) next run is awaited.
+        """
         self.running = True
-        logger.info("Starting weekly scraper schedule")
+        logger.info(f"Starting scraper schedule '{self.schedule.expression}'")
+        
+        if self.warming or self.is_stale():
+            logger.info("Data is stale. Running scrapers now")
+            try:
+                await self.trigger()
+            finally:
+                self.warming = False
+            self.schedule_next_run()
+        elif self.next_run is None:
+            self.schedule_next_run()
         
         while self.running:
-            await self.run_scrapers()
-            
-            now = datetime.now()
-            next_run = now + timedelta(days=7)
-            seconds_until_next_run = (next_run - now).total_seconds()
+            logger.info(f"Next scraper run scheduled for {self.next_run}")
+            await asyncio.sleep(max(0.0, (self.next_run - datetime.now()).total_seconds()))
             
-            logger.info(f"Next scraper run scheduled for {next_run}")
+            if not self.running:
+                break
             
-            await asyncio.sleep(seconds_until_next_run)
+            await self.trigger()
+            self.schedule_next_run()
     
     def stop_schedule(self):
-        """Stop the weekly scraper schedule"""
+        """Stop the scraper schedule"""
         self.running = False
-        logger.info("Weekly scraper schedule stopped")
+        logger.info("Scraper schedule stopped")
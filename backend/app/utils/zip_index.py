@@ -0,0 +1,74 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..models.dumpster_data import ScrapedData
+
+_ZIP = re.compile(r'^\s*(\d{5})(?:-?\d{4})?\s*$')
+
+
+def normalize_zip(value: str) -> Optional[str]:
+    """Five-digit ZIP from "12345" or "12345-6789"; None if it is not a ZIP code"""
+    match = _ZIP.match(value or "")
+    return match.group(1) if match else None
+
+
+@dataclass
+class ZipMatch:
+    """Service areas found for a ZIP code"""
+    zip_code: str
+    # ZIP the areas belong to; differs from zip_code for a ZIP3 fallback
+    matched_zip: str
+    area_ids: List[str]
+    # "zip" or "zip3" (nearest served ZIP with the same three-digit prefix)
+    match: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"zip": self.zip_code, "matched_zip": self.matched_zip, "match": self.match}
+
+
+class ZipIndex:
+    """ZIP code -> service area ids, with served ZIPs grouped by three-digit prefix.
+
+    An exact ZIP is a dictionary lookup. An unserved ZIP can fall back to the
+    numerically nearest served ZIP sharing its first three digits (its
+    sectional center), found by bisecting that prefix's sorted ZIPs.
+    """
+
+    def __init__(self, data: ScrapedData):
+        self.areas: Dict[str, List[str]] = defaultdict(list)
+        for area in data.service_areas:
+            zip_code = normalize_zip(area.zip_code) if area.zip_code else None
+            if zip_code:
+                self.areas[zip_code].append(area.id)
+
+        prefixes: Dict[str, List[str]] = defaultdict(list)
+        for zip_code in sorted(self.areas):
+            prefixes[zip_code[:3]].append(zip_code)
+        self.prefixes = dict(prefixes)
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def _nearest(self, zip_code: str) -> Optional[str]:
+        served = self.prefixes.get(zip_code[:3])
+        if not served:
+            return None
+        i = bisect_left(served, zip_code)
+        neighbours = served[max(0, i - 1):i + 1]
+        return min(neighbours, key=lambda other: abs(int(other) - int(zip_code)))
+
+    def lookup(self, zip_code: str, fallback: bool = True) -> Optional[ZipMatch]:
+        """Areas serving ``zip_code``, or with ``fallback`` its nearest served ZIP3 neighbour"""
+        normalized = normalize_zip(zip_code)
+        if normalized is None:
+            return None
+        if normalized in self.areas:
+            return ZipMatch(normalized, normalized, self.areas[normalized], "zip")
+        if fallback:
+            nearest = self._nearest(normalized)
+            if nearest is not None:
+                return ZipMatch(normalized, nearest, self.areas[nearest], "zip3")
+        return None
@@ -0,0 +1,188 @@
+"""Scrape worker: runs scrape jobs from the local job queue outside the API process.
+
+    python -m app.worker --processes 2
+
+The supervisor starts the worker processes, restarts any that die and runs
+the cron schedule, which queues scrape jobs instead of running them. Each
+worker leases one job at a time, heartbeats while it runs and publishes the
+resulting snapshot to the data directory, where the API picks it up.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from .utils.data_storage import DataStorage
+from .utils.job_queue import JOB_QUEUE_FILE, JobQueue
+from .utils.run_ledger import RUN_LEDGER_FILE, RunLedger
+from .utils.scheduler import ScraperScheduler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORKER_PROCESSES = int(os.getenv("SCRAPER_WORKER_PROCESSES", "1"))
+WORKER_LEASE_SECONDS = float(os.getenv("SCRAPER_WORKER_LEASE_SECONDS", "60"))
+WORKER_POLL_SECONDS = float(os.getenv("SCRAPER_WORKER_POLL_SECONDS", "5"))
+
+
+class ScrapeWorker:
+    """Pulls jobs from the queue and runs them one at a time"""
+    
+    def __init__(self, worker_id: str, data_dir: str = "data", queue_file: str = JOB_QUEUE_FILE,
+                 lease_seconds: float = WORKER_LEASE_SECONDS, poll_seconds: float = WORKER_POLL_SECONDS,
+                 ledger_file: str = RUN_LEDGER_FILE):
+        self.worker_id = worker_id
+        self.queue = JobQueue(queue_file)
+        self.scheduler = ScraperScheduler(DataStorage(data_dir), run_ledger=RunLedger(ledger_file))
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.running = False
+    
+    async def run(self, once: bool = False):
+        """Run jobs until stopped; with ``once`` stop as soon as the queue is empty"""
+        self.running = True
+        logger.info(f"Worker {self.worker_id} started")
+        
+        while self.running:
+            job = self.queue.claim(self.worker_id, self.lease_seconds)
+            if job is None:
+                if once:
+                    break
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            
+            await self.run_job(job)
+        
+        logger.info(f"Worker {self.worker_id} stopped")
+    
+    def stop(self):
+        self.running = False
+    
+    async def execute(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run a job; return its result, or None if it failed"""
+        if job["kind"] == "scrape":
+            profile = bool(job["payload"].get("profile"))
+            counts = await self.scheduler.run_scrapers(job["payload"].get("providers"), profile=profile)
+            if counts is not None and profile:
+                return {**counts, "profile": self.scheduler.last_profile}
+            return counts
+        raise ValueError(f"Unknown job kind: {job['kind']}")
+    
+    async def run_job(self, job: Dict[str, Any]):
+        """Run a leased job, renewing the lease until it finishes"""
+        logger.info(f"Worker {self.worker_id} running job {job['id']} ({job['kind']}, attempt {job['attempts']})")
+        task = asyncio.create_task(self.execute(job))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job, task, lease_lost))
+        
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                self.queue.fail(job["id"], self.worker_id, "worker stopped")
+                raise
+            logger.warning(f"Worker {self.worker_id} lost the lease on job {job['id']}; abandoning it")
+            return
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {str(e)}")
+            self.queue.fail(job["id"], self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+        
+        if result is None:
+            self.queue.fail(job["id"], self.worker_id, self.scheduler.last_error or "scrape failed")
+        else:
+            self.queue.complete(job["id"], self.worker_id, result)
+            logger.info(f"Worker {self.worker_id} finished job {job['id']}: {result}")
+    
+    async def _heartbeat(self, job: Dict[str, Any], task: asyncio.Task, lease_lost: asyncio.Event):
+        while not task.done():
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self.queue.heartbeat(job["id"], self.worker_id, self.lease_seconds):
+                lease_lost.set()
+                task.cancel()
+                return
+
+
+def _worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def run_worker_process(index: int, data_dir: str, queue_file: str, lease_seconds: float,
+                       poll_seconds: float, once: bool = False, ledger_file: str = RUN_LEDGER_FILE):
+    """Entry point of a worker process"""
+    worker = ScrapeWorker(_worker_id(index), data_dir, queue_file, lease_seconds, poll_seconds, ledger_file)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(worker.run(once=once))
+    except KeyboardInterrupt:
+        pass
+
+
+async def supervise(processes: List[multiprocessing.Process], spawn, scheduler: Optional[ScraperScheduler],
+                    poll_seconds: float):
+    """Restart dead worker processes and run the schedule until interrupted"""
+    schedule_task = asyncio.create_task(scheduler.start_schedule()) if scheduler else None
+    try:
+        while True:
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    logger.warning(f"Worker process {index} exited with {process.exitcode}; restarting it")
+                    processes[index] = spawn(index)
+            await asyncio.sleep(poll_seconds)
+    finally:
+        if schedule_task:
+            scheduler.stop_schedule()
+            schedule_task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run scrape workers for the dumpster data API")
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES, help="Number of worker processes")
+    parser.add_argument("--data-dir", default="data", help="Data directory shared with the API")
+    parser.add_argument("--queue", default=JOB_QUEUE_FILE, help="SQLite job queue shared with the API")
+    parser.add_argument("--ledger", default=RUN_LEDGER_FILE, help="SQLite run ledger shared with the API")
+    parser.add_argument("--lease-seconds", type=float, default=WORKER_LEASE_SECONDS, help="Job lease length")
+    parser.add_argument("--poll-seconds", type=float, default=WORKER_POLL_SECONDS, help="Idle poll interval")
+    parser.add_argument("--no-schedule", action="store_true", help="Only run queued jobs; don't queue scheduled scrapes")
+    parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args(argv)
+    
+    options = (args.data_dir, args.queue, args.lease_seconds, args.poll_seconds, args.once, args.ledger)
+    
+    def spawn(index: int) -> multiprocessing.Process:
+        process = multiprocessing.Process(target=run_worker_process, args=(index, *options), name=f"scrape-worker-{index}")
+        process.start()
+        return process
+    
+    processes = [spawn(index) for index in range(max(1, args.processes))]
+    
+    try:
+        if args.once:
+            for process in processes:
+                process.join()
+            return
+        
+        scheduler = None
+        if not args.no_schedule:
+            scheduler = ScraperScheduler(DataStorage(args.data_dir), job_queue=JobQueue(args.queue))
+        asyncio.run(supervise(processes, spawn, scheduler, args.poll_seconds))
+    except KeyboardInterrupt:
+        logger.info("Stopping scrape workers")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + 10
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+
+
+if __name__ == "__main__":
+    main()
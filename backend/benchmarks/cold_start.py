@@ -0,0 +1,92 @@
+"""Cold-start benchmark for the API process.
+
+Starts a fresh interpreter for every run, imports ``app.main``, runs the
+startup event and times the first ``/healthz`` response. Runs happen in a
+temporary directory with an empty dataset, in replay mode against an empty
+fixture directory, so the background initial scrape never touches the
+network. Also reports which heavy scraping dependencies ``import app.main``
+pulled in.
+
+    python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["aiohttp", "bs4", "lxml", "numpy", "pandas", "psycopg", "app.scrapers.base_scraper"]
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+heavy = [name for name in %r if name in sys.modules]
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    response = client.get("/healthz")
+    ready = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "ready_seconds": ready - start,
+    "healthz": response.json(),
+    "heavy_modules": heavy,
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_once() -> Dict:
+    """Time one cold start in a fresh interpreter and an empty data directory"""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            PYTHONPATH=str(BACKEND_DIR),
+            SCRAPER_FETCH_MODE="replay",
+            SCRAPER_FIXTURE_DIR=os.path.join(workdir, "fixtures"),
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD_SCRIPT],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs: int = 5) -> Dict:
+    samples: List[Dict] = [measure_once() for _ in range(runs)]
+    return {
+        "runs": runs,
+        "import_seconds_median": round(statistics.median(s["import_seconds"] for s in samples), 4),
+        "ready_seconds_median": round(statistics.median(s["ready_seconds"] for s in samples), 4),
+        "healthz": samples[-1]["healthz"],
+        "heavy_modules": samples[-1]["heavy_modules"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure API cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh-process runs (median is reported)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.runs)
+
+    print(f"import app.main:      {result['import_seconds_median']:.4f}s")
+    print(f"first /healthz:       {result['ready_seconds_median']:.4f}s ({result['healthz'].get('status')})")
+    print(f"heavy modules on import: {', '.join(result['heavy_modules']) or 'none'}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
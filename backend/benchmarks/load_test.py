@@ -0,0 +1,239 @@
+"""Load test for the read API.
+
+Drives ``/city/{city}``, ``/cities``, ``/prices`` (or any weighted mix of
+routes) with a fixed number of concurrent clients for a fixed duration and
+reports latency percentiles, throughput and error rate per route.
+
+By default the app from ``app.main`` runs in-process behind httpx's ASGI
+transport, which behaves like a single uvicorn worker: handlers share one
+event loop, so CPU-bound routes hold up everything else. With ``--url`` the
+load goes to a running server instead. City names are drawn from the
+dataset, either an existing data directory or a synthetic one.
+
+    python -m benchmarks.load_test --areas 4000 --concurrency 32 --duration 20
+    python -m benchmarks.load_test --data-dir data --mix city=8,cities=1,prices=1
+    python -m benchmarks.load_test --url http://localhost:8000 --data-dir data
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.suite import percentile
+from benchmarks.synthetic_data import add_scale_arguments, generate_records, scale_options, write_snapshot
+
+# Route name -> path template; {city} and {state} are filled from the dataset
+ROUTES = {
+    "city": "/city/{city}?state={state}",
+    "cities": "/cities",
+    "prices": "/prices",
+    "companies": "/companies",
+    "service_areas": "/service-areas",
+    "healthz": "/healthz",
+}
+
+DEFAULT_MIX = "city=8,cities=1,prices=1"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """``"city=8,cities=1"`` -> route weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}. Available: {', '.join(ROUTES)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def load_cities(data_dir: str) -> List[Tuple[str, str]]:
+    """Distinct (city, state) pairs in a data directory's snapshot"""
+    from app.utils.data_storage import DataStorage
+
+    areas = DataStorage(data_dir=data_dir).get_service_areas()
+    return sorted({(area.city, area.state) for area in areas})
+
+
+class LoadGenerator:
+    """Closed-loop load: each client sends its next request as soon as the last one returns"""
+
+    def __init__(self, client, mix: Dict[str, float], cities: List[Tuple[str, str]], seed: int = 0):
+        self.client = client
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.cities = cities or [("Nowhere", "NA")]
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _next_request(self) -> Tuple[str, str]:
+        name = self.rng.choices(self.names, self.weights)[0]
+        city, state = self.rng.choice(self.cities)
+        return name, ROUTES[name].format(city=city, state=state)
+
+    async def _client(self, deadline: float, record_after: float):
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            name, url = self._next_request()
+            try:
+                response = await self.client.get(url)
+                status = response.status_code
+                await response.aread()
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - now
+
+            if now < record_after:
+                continue
+            self.latencies[name].append(elapsed)
+            if status is None:
+                self.errors[name] += 1
+            else:
+                self.statuses[name][status] += 1
+                # A 404 is a valid answer for an unknown city; anything 5xx is not
+                if status >= 500:
+                    self.errors[name] += 1
+
+    async def run(self, concurrency: int, duration: float, warmup: float = 0.0) -> float:
+        """Run the clients; return the measured wall time (excluding warmup)"""
+        start = time.perf_counter()
+        record_after = start + warmup
+        deadline = record_after + duration
+        await asyncio.gather(*(self._client(deadline, record_after) for _ in range(concurrency)))
+        return time.perf_counter() - record_after
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        def stats(latencies: List[float], errors: int) -> Dict[str, Any]:
+            count = len(latencies)
+            if not count:
+                return {"requests": 0}
+            return {
+                "requests": count,
+                "rps": round(count / elapsed, 2),
+                "error_rate": round(errors / count, 4),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+            }
+
+        routes = {
+            name: {
+                **stats(self.latencies[name], self.errors[name]),
+                "statuses": {str(code): count for code, count in sorted(self.statuses[name].items())},
+            }
+            for name in self.names
+        }
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {"overall": stats(all_latencies, sum(self.errors.values())), "routes": routes}
+
+
+async def _run(client, args, mix, cities) -> Dict[str, Any]:
+    generator = LoadGenerator(client, mix, cities, args.seed)
+    elapsed = await generator.run(args.concurrency, args.duration, args.warmup)
+    return {"seconds": round(elapsed, 3), **generator.report(elapsed)}
+
+
+async def run_against_url(url: str, args, mix, cities) -> Dict[str, Any]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        return await _run(client, args, mix, cities)
+
+
+async def run_in_process(args, mix, cities) -> Dict[str, Any]:
+    """Drive ``app.main`` in this process; the working directory must hold the data"""
+    import httpx
+
+    os.environ.setdefault("SCRAPER_EXECUTION", "inline")
+    main = importlib.import_module("app.main")
+    main.data_storage.load_data()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout) as client:
+        return await _run(client, args, mix, cities)
+
+
+def run_load_test(args) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.data_dir:
+            data_dir = os.path.abspath(args.data_dir)
+        else:
+            data_dir = os.path.join(workdir, "data")
+            write_snapshot(data_dir, generate_records(**scale_options(args)))
+        cities = load_cities(data_dir)
+
+        if args.url:
+            result = asyncio.run(run_against_url(args.url, args, mix, cities))
+        else:
+            # app.main reads ./data, so run from a directory where that is the dataset
+            if os.path.join(workdir, "data") != data_dir:
+                os.symlink(data_dir, os.path.join(workdir, "data"))
+            os.chdir(workdir)
+            try:
+                result = asyncio.run(run_in_process(args, mix, cities))
+            finally:
+                os.chdir(cwd)
+
+    return {
+        "target": args.url or "in-process",
+        "dataset": args.data_dir or scale_options(args),
+        "cities": len(cities),
+        "concurrency": args.concurrency,
+        "mix": mix,
+        **result,
+    }
+
+
+def print_report(result: Dict[str, Any]):
+    print(f"{result['target']}: {result['concurrency']} clients for {result['seconds']}s, "
+          f"{result['cities']} cities")
+    print(f"{'route':<16} {'requests':>9} {'rps':>9} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in [*result["routes"].items(), ("overall", result["overall"])]:
+        if not row["requests"]:
+            print(f"{name:<16} {0:>9}")
+            continue
+        print(f"{name:<16} {row['requests']:>9} {row['rps']:>9} {row['error_rate']:>8.2%} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the read API")
+    add_scale_arguments(parser)
+    parser.add_argument("--data-dir", help="Use this data directory instead of a synthetic dataset")
+    parser.add_argument("--url", help="Send load to a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Route weights, from: {', '.join(ROUTES)}")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = run_load_test(args)
+    print_report(result)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Parse-throughput benchmark for the scraper parsing layer.
+
+Runs every parse function in ``app.scrapers.parsing`` over saved HTML pages
+(a directory of ``.html`` files or recorded fixture archives) with each
+available backend and reports pages/s and MB/s.
+
+    python -m benchmarks.parse_benchmark --pages benchmarks/pages --repeat 5
+    python -m benchmarks.parse_benchmark --fixtures data/fixtures
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import SoupStrainer
+
+from app.scrapers.fixtures import FixtureArchive
+from app.scrapers.parsing import (
+    make_soup,
+    parse_company_page,
+    parse_location_links,
+    parse_size_mentions,
+)
+
+LOCATION_HREF = r'location|dumpster-rental|cities|areas'
+
+
+def _full_location_links(html: str, features: str):
+    """Location links without a SoupStrainer, for comparison"""
+    soup = make_soup(html, features=features)
+    return [a.get_text().strip() for a in soup.find_all('a', href=True) if 'location' in a['href']]
+
+
+def _available_backends() -> List[str]:
+    backends = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        backends.append("lxml")
+    except ImportError:
+        pass
+    return backends
+
+
+def load_pages(pages_dir: Path) -> Dict[str, str]:
+    """Load every saved ``.html`` page under ``pages_dir``"""
+    return {
+        str(path.relative_to(pages_dir)): path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(pages_dir.rglob("*.html"))
+    }
+
+
+def load_fixture_pages(fixture_dir: Path) -> Dict[str, str]:
+    """Load every successful response from the fixture archives under ``fixture_dir``"""
+    pages = {}
+    for path in sorted(fixture_dir.glob("*.zip")):
+        archive = FixtureArchive(str(path))
+        try:
+            for response in archive.iter_responses():
+                if response["status"] == 200 and response["body"]:
+                    pages[response["url"]] = response["body"]
+        finally:
+            archive.close()
+    return pages
+
+
+def run_benchmark(pages: Dict[str, str], repeat: int = 3) -> List[Dict]:
+    """Time each parse function/backend pair over all pages"""
+    cases = {
+        "company_page": lambda html, f: parse_company_page(html, "https://example.com", r'about|company', features=f),
+        "location_links_strained": lambda html, f: parse_location_links(html, LOCATION_HREF, features=f),
+        "location_links_full": _full_location_links,
+        "size_mentions": lambda html, f: parse_size_mentions(html, features=f),
+        "soup_only": lambda html, f: make_soup(html, features=f),
+        "soup_only_links_strainer": lambda html, f: make_soup(html, parse_only=SoupStrainer('a'), features=f),
+    }
+    total_bytes = sum(len(html.encode("utf-8")) for html in pages.values())
+    results = []
+
+    for backend in _available_backends():
+        for name, func in cases.items():
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for html in pages.values():
+                    func(html, backend)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            results.append({
+                "case": name,
+                "backend": backend,
+                "pages": len(pages),
+                "seconds": round(best, 6),
+                "pages_per_sec": round(len(pages) / best, 2) if best else None,
+                "mb_per_sec": round(total_bytes / best / 1_000_000, 3) if best else None,
+            })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scraper HTML parsing on saved pages")
+    parser.add_argument("--pages", default="benchmarks/pages", help="Directory of saved .html pages")
+    parser.add_argument("--fixtures", help="Directory of recorded fixture archives to use instead of --pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per case (best is reported)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    source = args.fixtures or args.pages
+    pages = load_fixture_pages(Path(source)) if args.fixtures else load_pages(Path(source))
+    if not pages:
+        print(f"No saved pages found under {source}", file=sys.stderr)
+        return 1
+
+    results = run_benchmark(pages, repeat=args.repeat)
+
+    print(f"{'case':<28} {'backend':<12} {'pages/s':>10} {'MB/s':>8}")
+    for row in results:
+        print(f"{row['case']:<28} {row['backend']:<12} {row['pages_per_sec']:>10} {row['mb_per_sec']:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
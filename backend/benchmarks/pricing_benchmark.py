@@ -0,0 +1,126 @@
+"""Price-generation benchmark at ZIP scale.
+
+Compares the per-cell loop the scrapers used to run with the vectorized
+``RegionalPricing`` engine, both for computing the price matrix alone and
+for materializing every price record.
+
+    python -m benchmarks.pricing_benchmark --areas 42000 --sizes 7
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from app.scrapers.pricing import STATE_INDEX, RegionalPricing
+from app.scrapers.waste_management_scraper import WasteManagementScraper
+
+
+def make_inputs(areas: int, sizes: int, seed: int = 0):
+    """Synthetic ZIP-level service areas and dumpster sizes"""
+    rng = random.Random(seed)
+    states = list(STATE_INDEX)
+    service_areas = [
+        {"id": str(uuid.uuid4()), "city": f"City {i}", "state": rng.choice(states), "zip_code": f"{i:05d}"}
+        for i in range(areas)
+    ]
+    dumpster_sizes = [
+        {"id": str(uuid.uuid4()), "size_yards": size_yards}
+        for size_yards in [10, 15, 20, 30, 40, 12, 25, 8, 6, 4][:sizes]
+    ]
+    return service_areas, dumpster_sizes
+
+
+def legacy_prices(company_id: str, service_areas: List[Dict], dumpster_sizes: List[Dict]):
+    """The nested loop the scrapers used before the pricing engine"""
+    for area in service_areas:
+        for size in dumpster_sizes:
+            base_price = 200 + (size["size_yards"] * 10)
+
+            state_factor = 1.0
+            if area["state"] in ["CA", "NY", "MA"]:
+                state_factor = 1.3
+            elif area["state"] in ["TX", "FL", "GA"]:
+                state_factor = 0.9
+
+            adjusted_price = round(base_price * state_factor, 2)
+
+            yield {
+                "id": str(uuid.uuid4()),
+                "company_id": company_id,
+                "size_id": size["id"],
+                "service_area_id": area["id"],
+                "base_price": adjusted_price,
+                "additional_day_price": round(adjusted_price * 0.15, 2),
+                "weight_overage_price": 50.0,
+                "rental_period_days": 7,
+            }
+
+
+def _time(func: Callable, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(areas: int, sizes: int, repeat: int = 3) -> List[Dict]:
+    service_areas, dumpster_sizes = make_inputs(areas, sizes)
+    pricing = WasteManagementScraper.pricing
+    # The same model with a factor for every tenth area's city, to time the city lookup
+    city_pricing = RegionalPricing(
+        pricing.base_price, pricing.price_per_yard, pricing.state_factors, pricing.additional_day_rate,
+        pricing.weight_overage_price, pricing.rental_period_days,
+        city_factors={(area["city"], area["state"]): 1.1 for area in service_areas[::10]},
+    )
+    company_id = str(uuid.uuid4())
+
+    cases = {
+        "legacy_loop": lambda: sum(1 for _ in legacy_prices(company_id, service_areas, dumpster_sizes)),
+        "grid_compute": lambda: pricing.price_grid(company_id, service_areas, dumpster_sizes),
+        "grid_compute_cities": lambda: city_pricing.price_grid(company_id, service_areas, dumpster_sizes),
+        "grid_materialize": lambda: sum(1 for _ in pricing.price_grid(company_id, service_areas, dumpster_sizes)),
+    }
+    cells = areas * len(dumpster_sizes)
+
+    results = []
+    for name, func in cases.items():
+        seconds = _time(func, repeat)
+        results.append({
+            "case": name,
+            "areas": areas,
+            "sizes": len(dumpster_sizes),
+            "seconds": round(seconds, 6),
+            "cells_per_sec": round(cells / seconds) if seconds else None,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark regional price generation")
+    parser.add_argument("--areas", type=int, default=42000, help="Number of service areas (ZIPs)")
+    parser.add_argument("--sizes", type=int, default=7, help="Number of dumpster sizes (max 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per case (best is reported)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.areas, args.sizes, repeat=args.repeat)
+
+    print(f"{'case':<20} {'seconds':>10} {'cells/s':>12}")
+    for row in results:
+        print(f"{row['case']:<20} {row['seconds']:>10} {row['cells_per_sec']:>12}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
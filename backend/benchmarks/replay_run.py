@@ -0,0 +1,93 @@
+"""End-to-end scrape run against recorded fixtures.
+
+Record fixtures once (needs network access):
+
+    python -m benchmarks.replay_run --record --fixtures data/fixtures
+
+then replay them on any machine, optionally with simulated latency:
+
+    python -m benchmarks.replay_run --fixtures data/fixtures --latency-ms 80
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.registry import get_scrapers
+from app.utils.data_storage import DataStorage
+from app.utils.pipeline import ScrapePipeline
+
+
+class _CountingFetch:
+    """Wrap fetch_page to count pages and time spent fetching"""
+
+    def __init__(self):
+        self.pages = 0
+        self.seconds = 0.0
+        self._fetch_page = BaseScraper.fetch_page
+
+    def install(self):
+        counter = self
+
+        async def fetch_page(scraper, url):
+            start = time.perf_counter()
+            try:
+                return await counter._fetch_page(scraper, url)
+            finally:
+                counter.pages += 1
+                counter.seconds += time.perf_counter() - start
+
+        BaseScraper.fetch_page = fetch_page
+
+
+async def run(fixture_dir: str, record: bool, latency_ms: float, providers: Optional[List[str]]) -> dict:
+    scrapers = get_scrapers(providers)
+    for scraper in scrapers:
+        scraper.fetch_mode = "record" if record else "replay"
+        scraper.fixture_dir = fixture_dir
+        scraper.replay_latency_ms = latency_ms
+
+    fetches = _CountingFetch()
+    fetches.install()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        counts = await ScrapePipeline(DataStorage(data_dir=data_dir)).run(scrapers)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "record" if record else "replay",
+        "providers": [scraper.name for scraper in scrapers],
+        "latency_ms": latency_ms,
+        "seconds": round(elapsed, 4),
+        "pages": fetches.pages,
+        "fetch_seconds": round(fetches.seconds, 4),
+        "pages_per_sec": round(fetches.pages / elapsed, 2) if elapsed else None,
+        "records": counts,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scrapers end to end against recorded fixtures")
+    parser.add_argument("--fixtures", default="data/fixtures", help="Fixture archive directory")
+    parser.add_argument("--record", action="store_true", help="Fetch live and record fixtures instead of replaying")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency per replayed page")
+    parser.add_argument("--providers", nargs="*", help="Providers to run (default: all)")
+    parser.add_argument("--json", dest="json_path", help="Write the result to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.fixtures, args.record, args.latency_ms, args.providers))
+    print(json.dumps(result, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
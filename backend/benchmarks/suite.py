@@ -0,0 +1,308 @@
+"""Benchmark suite for storage, API routes and HTML parsing.
+
+Generates a synthetic dataset (see ``benchmarks.synthetic_data``) in a
+temporary data directory, then times:
+
+* ``DataStorage.load_data`` (cold and cached), ``save_data`` and
+  ``get_data_for_city``
+* every GET route of ``app.main`` through an in-process ASGI client
+* the scraper parse functions on saved pages, when ``--pages`` or
+  ``--fixtures`` is given
+
+Results are written as JSON; pass an earlier result file as ``--baseline``
+to flag cases whose median got slower by more than ``--tolerance``.
+
+    python -m benchmarks.suite --areas 40000 --json results.json
+    python -m benchmarks.suite --json new.json --baseline results.json
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.synthetic_data import add_scale_arguments, generate_records, scale_options, write_snapshot
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Values for path parameters; ids that do not exist exercise the 404 paths
+PATH_PARAMS = {
+    "job_id": "1",
+    "run_id": "benchmark",
+    # The first ZIP of a synthetic dataset
+    "zip_code": "00501",
+}
+
+# Query parameters for routes that require some; the ZIPs and size exist in synthetic datasets
+QUERY_PARAMS = {
+    "/zips": {"zip": ["00501", "00508", "00515", "00522"]},
+    "/city/{city}/compare": {"size": 20, "days": 10},
+}
+
+# Routes not benchmarked, because calling them starts a scrape
+SKIPPED_ROUTES = {("POST", "/scrape")}
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """The ``q``-th percentile (0-100) of ``values``, nearest-rank"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Timing statistics in seconds"""
+    return {
+        "runs": len(samples),
+        "min_seconds": round(min(samples), 6),
+        "median_seconds": round(statistics.median(samples), 6),
+        "mean_seconds": round(statistics.fmean(samples), 6),
+        "p95_seconds": round(percentile(samples, 95), 6),
+        "max_seconds": round(max(samples), 6),
+    }
+
+
+def time_case(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def sample_cities(records: Dict[str, List[Dict[str, Any]]], count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Distinct (city, state) pairs present in the dataset"""
+    cities = sorted({(area["city"], area["state"]) for area in records["service_areas"]})
+    rng = random.Random(seed)
+    return [{"city": city, "state": state} for city, state in rng.sample(cities, min(count, len(cities)))]
+
+
+def benchmark_storage(data_dir: str, cities: List[Dict[str, str]], repeat: int) -> List[Dict[str, Any]]:
+    from app.utils.data_storage import DataStorage
+
+    storage = DataStorage(data_dir=data_dir)
+
+    def drop_cache():
+        storage._snapshot = None
+
+    results = [{"case": "load_data_cold", **time_case(storage.load_data, repeat, setup=drop_cache)}]
+    data = storage.load_data()
+    results.append({"case": "load_data_cached", **time_case(storage.load_data, repeat)})
+    results.append({"case": "save_data", **time_case(lambda: storage.save_data(data), repeat)})
+    storage.load_data()
+
+    def lookup_cities():
+        for city in cities:
+            storage.get_data_for_city(city["city"], city["state"])
+
+    lookups = time_case(lookup_cities, repeat)
+    lookups["cities_per_run"] = len(cities)
+    results.append({"case": "get_data_for_city", **lookups})
+    results.append({"case": "snapshot_bytes", "bytes": os.path.getsize(storage.data_file)})
+    return results
+
+
+def get_routes(app) -> List[Any]:
+    from fastapi.routing import APIRoute
+
+    return [route for route in app.routes if isinstance(route, APIRoute)]
+
+
+async def _benchmark_routes(app, cities: List[Dict[str, str]], repeat: int) -> List[Dict[str, Any]]:
+    import httpx
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for route in get_routes(app):
+            for method in sorted(route.methods):
+                if (method, route.path) in SKIPPED_ROUTES:
+                    results.append({"case": f"{method} {route.path}", "skipped": "starts a scrape"})
+                    continue
+
+                samples, statuses, sizes = [], {}, []
+                for index in range(repeat):
+                    city = cities[index % len(cities)] if cities else {"city": "Nowhere", "state": "NA"}
+                    params = {**PATH_PARAMS, **city}
+                    url = route.path.format(**params)
+                    start = time.perf_counter()
+                    response = await client.request(method, url, params=QUERY_PARAMS.get(route.path))
+                    samples.append(time.perf_counter() - start)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    sizes.append(len(response.content))
+
+                results.append({
+                    "case": f"{method} {route.path}",
+                    "statuses": {str(code): count for code, count in sorted(statuses.items())},
+                    "mean_bytes": int(statistics.fmean(sizes)),
+                    **summarize(samples),
+                })
+    return results
+
+
+def benchmark_routes(cities: List[Dict[str, str]], repeat: int) -> List[Dict[str, Any]]:
+    """Time every route of ``app.main`` in-process; the working directory must hold the data"""
+    os.environ.setdefault("SCRAPER_EXECUTION", "inline")
+    main = importlib.import_module("app.main")
+    # Time the routes against a loaded snapshot; cold loads are covered by the storage cases
+    main.data_storage.load_data()
+    return asyncio.run(_benchmark_routes(main.app, cities, repeat))
+
+
+def benchmark_parsing(pages_dir: Optional[str], fixture_dir: Optional[str], repeat: int) -> List[Dict[str, Any]]:
+    from benchmarks.parse_benchmark import load_fixture_pages, load_pages, run_benchmark
+
+    if fixture_dir:
+        pages = load_fixture_pages(Path(fixture_dir))
+    elif pages_dir:
+        pages = load_pages(Path(pages_dir))
+    else:
+        return []
+    if not pages:
+        print(f"No saved pages found under {fixture_dir or pages_dir}; skipping parsing", file=sys.stderr)
+        return []
+    return [
+        {**row, "case": f"{row['case']} [{row['backend']}]", "median_seconds": row["seconds"]}
+        for row in run_benchmark(pages, repeat=repeat)
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Cases whose median time grew by more than ``tolerance`` (0.2 = 20%) over the baseline"""
+    def medians(result: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            f"{group}/{row['case']}": row["median_seconds"]
+            for group, rows in result["results"].items()
+            for row in rows
+            if row.get("median_seconds")
+        }
+
+    old = medians(baseline)
+    regressions = []
+    for case, new_median in medians(results).items():
+        if case in old and new_median > old[case] * (1 + tolerance):
+            regressions.append({
+                "case": case,
+                "baseline_seconds": old[case],
+                "median_seconds": new_median,
+                "change": round(new_median / old[case] - 1, 3),
+            })
+    return regressions
+
+
+def run_suite(options: Dict[str, Any], repeat: int, city_samples: int, pages_dir: Optional[str] = None,
+              fixture_dir: Optional[str] = None) -> Dict[str, Any]:
+    start = time.perf_counter()
+    records = generate_records(**options)
+    generate_seconds = time.perf_counter() - start
+    cities = sample_cities(records, city_samples, options.get("seed", 0))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = os.path.join(workdir, "data")
+        write_snapshot(data_dir, records)
+        counts = {name: len(items) for name, items in records.items()}
+        del records
+
+        os.chdir(workdir)
+        try:
+            results = {
+                "storage": benchmark_storage(data_dir, cities, repeat),
+                "routes": benchmark_routes(cities, repeat),
+            }
+        finally:
+            os.chdir(cwd)
+
+    parsing = benchmark_parsing(pages_dir, fixture_dir, repeat)
+    if parsing:
+        results["parsing"] = parsing
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": options,
+            "records": counts,
+            "generate_seconds": round(generate_seconds, 3),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def print_results(result: Dict[str, Any]):
+    print(f"Dataset: {', '.join(f'{count} {name}' for name, count in result['meta']['records'].items())}")
+    for group, rows in result["results"].items():
+        print(f"\n{group}")
+        for row in rows:
+            if "skipped" in row:
+                print(f"  {row['case']:<40} skipped ({row['skipped']})")
+            elif "median_seconds" in row:
+                extra = f"  {row['statuses']}" if "statuses" in row else ""
+                print(f"  {row['case']:<40} median {row['median_seconds'] * 1000:>10.2f} ms  "
+                      f"p95 {row.get('p95_seconds', row['median_seconds']) * 1000:>10.2f} ms{extra}")
+            elif "bytes" in row:
+                print(f"  {row['case']:<40} {row['bytes'] / 1_000_000:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark storage, API routes and parsing on synthetic data")
+    add_scale_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    parser.add_argument("--cities", type=int, default=20, help="Cities looked up per run")
+    parser.add_argument("--pages", help="Directory of saved .html pages for the parsing benchmarks")
+    parser.add_argument("--fixtures", help="Directory of recorded fixture archives for the parsing benchmarks")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    result = run_suite(scale_options(args), args.repeat, args.cities, args.pages, args.fixtures)
+    print_results(result)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        result["regressions"] = regressions
+        for row in regressions:
+            print(f"REGRESSION {row['case']}: {row['baseline_seconds'] * 1000:.2f} ms -> "
+                  f"{row['median_seconds'] * 1000:.2f} ms ({row['change']:+.0%})")
+        if regressions:
+            status = 1
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
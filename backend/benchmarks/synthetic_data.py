@@ -0,0 +1,221 @@
+"""Synthetic dataset generator for benchmarks.
+
+Builds a ``ScrapedData``-shaped dataset at any scale: ``companies`` providers,
+``areas`` ZIP-level service areas spread over cities in every state, and
+``sizes`` dumpster sizes per company, with a price for every company, area
+and size a company serves. Output is deterministic for a given seed.
+
+    python -m benchmarks.synthetic_data --companies 10 --areas 40000 --sizes 6 --data-dir /tmp/bench
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models.dumpster_data import ScrapedData
+from app.utils.gazetteer import get_gazetteer
+from app.utils.regions import STATE_ABBREVIATIONS
+
+# Real names first, so benchmarks and load tests can hit familiar cities
+REAL_CITIES = [
+    ("New York", "NY"), ("Los Angeles", "CA"), ("Chicago", "IL"), ("Houston", "TX"),
+    ("Phoenix", "AZ"), ("Philadelphia", "PA"), ("San Antonio", "TX"), ("San Diego", "CA"),
+    ("Dallas", "TX"), ("Austin", "TX"), ("Jacksonville", "FL"), ("Columbus", "OH"),
+    ("Charlotte", "NC"), ("Indianapolis", "IN"), ("Seattle", "WA"), ("Denver", "CO"),
+    ("Boston", "MA"), ("Nashville", "TN"), ("Detroit", "MI"), ("Portland", "OR"),
+    ("Las Vegas", "NV"), ("Atlanta", "GA"), ("Miami", "FL"), ("Minneapolis", "MN"),
+    ("St. Louis", "MO"), ("Tampa", "FL"), ("Pittsburgh", "PA"), ("Cincinnati", "OH"),
+    ("Kansas City", "MO"), ("Orlando", "FL"), ("Sacramento", "CA"), ("Salt Lake City", "UT"),
+    ("Milwaukee", "WI"), ("Raleigh", "NC"), ("Baltimore", "MD"), ("Cleveland", "OH"),
+]
+
+NAME_PREFIXES = [
+    "Spring", "Oak", "Maple", "Cedar", "Pine", "River", "Lake", "Fair", "Green", "Clear",
+    "Rock", "Elm", "Ash", "Wood", "Brook", "Glen", "Mill", "Bay", "Sun", "North",
+    "South", "East", "West", "Red", "White", "Silver", "Gold", "Stone", "Willow", "Bridge",
+]
+NAME_SUFFIXES = [
+    "field", "ville", "ton", "wood", "dale", "port", "view", "ford", "burg", "haven",
+    "land", "side", "crest", "mont", "brook", " Springs", " Falls", " Heights", " Park", " City",
+]
+NAME_QUALIFIERS = ["New", "Old", "Upper", "Lower", "Port", "Mount"]
+# Made-up cities are placed at random in the continental US
+LATITUDE_RANGE = (25.0, 49.0)
+LONGITUDE_RANGE = (-124.0, -67.0)
+COMPANY_WORDS = ["Roll-Off", "Dumpster", "Waste", "Haul", "Disposal", "Container", "Junk", "Debris"]
+SIZE_YARDS = [10, 15, 20, 30, 40, 2, 4, 6, 8, 12]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def city_names(count: int, rng: random.Random) -> List[tuple]:
+    """``count`` distinct (city, state) pairs: the real cities, then made-up ones"""
+    states = list(STATE_ABBREVIATIONS.values())
+    names = [prefix + suffix for prefix in NAME_PREFIXES for suffix in NAME_SUFFIXES]
+    # Repeat names get a distinguishing word, as real town names often do
+    names += [f"{word} {name}" for word in NAME_QUALIFIERS for name in names]
+    rng.shuffle(names)
+
+    cities = REAL_CITIES[:count]
+    needed = count - len(cities)
+    if needed > len(names) * len(states):
+        raise ValueError(f"Can generate at most {len(names) * len(states) + len(REAL_CITIES)} distinct cities")
+
+    # Each pass over the names puts every name in a different state
+    offset = rng.randrange(len(states))
+    for start in range(0, needed, len(names)):
+        for index, name in enumerate(names[:needed - start]):
+            cities.append((name, states[(index + offset + start // len(names)) % len(states)]))
+    return cities
+
+
+def city_coordinates(cities: List[tuple], rng: random.Random) -> List[tuple]:
+    """(latitude, longitude) per city: the gazetteer's for real cities, random for made-up ones"""
+    gazetteer = get_gazetteer()
+    return [
+        gazetteer.locate(city, state)
+        or (rng.uniform(*LATITUDE_RANGE), rng.uniform(*LONGITUDE_RANGE))
+        for city, state in cities
+    ]
+
+
+def generate_records(companies: int = 10, areas: int = 40000, sizes: int = 6, coverage: float = 1.0,
+                     zips_per_city: int = 4, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Plain record dicts for a synthetic dataset.
+
+    Every company serves a random ``coverage`` share of the areas and prices
+    each of its ``sizes`` sizes in every area it serves.
+    """
+    rng = random.Random(seed)
+    sizes = min(sizes, len(SIZE_YARDS))
+
+    company_records = []
+    for index in range(companies):
+        name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(COMPANY_WORDS)} {index + 1}"
+        company_records.append({
+            "id": _uuid(rng),
+            "name": name,
+            "website": f"https://www.{name.lower().replace(' ', '-')}.example.com",
+            "logo_url": None,
+            "description": f"{name} rents roll-off dumpsters.",
+            "phone": f"1-800-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}",
+        })
+
+    area_records = []
+    cities = city_names(max(1, -(-areas // max(1, zips_per_city))), rng)
+    # Separate generator, so coordinates don't change the rest of the dataset
+    geo = random.Random(f"{seed}-coordinates")
+    coordinates = city_coordinates(cities, geo)
+    for index in range(areas):
+        city, state = cities[index % len(cities)]
+        latitude, longitude = coordinates[index % len(cities)]
+        area_records.append({
+            "id": _uuid(rng),
+            "city": city,
+            "state": state,
+            "zip_code": f"{(index * 7 + 501) % 100000:05d}",
+            "county": None,
+            # ZIP areas are scattered a few kilometres around their city
+            "latitude": round(latitude + geo.uniform(-0.05, 0.05), 5),
+            "longitude": round(longitude + geo.uniform(-0.05, 0.05), 5),
+        })
+
+    size_records = []
+    price_records = []
+    for company in company_records:
+        company_sizes = []
+        for yards in SIZE_YARDS[:sizes]:
+            size = {
+                "id": _uuid(rng),
+                "company_id": company["id"],
+                "size_yards": yards,
+                "description": f"{yards} yard dumpster",
+                "weight_limit_lbs": yards * 250,
+                "suitable_for": ["Home renovations", "Cleanouts"],
+            }
+            company_sizes.append(size)
+            size_records.append(size)
+
+        base = rng.uniform(150, 300)
+        per_yard = rng.uniform(8, 16)
+        for area in area_records:
+            if coverage < 1.0 and rng.random() >= coverage:
+                continue
+            regional = rng.uniform(0.85, 1.25)
+            for size in company_sizes:
+                price_records.append({
+                    "id": _uuid(rng),
+                    "company_id": company["id"],
+                    "size_id": size["id"],
+                    "service_area_id": area["id"],
+                    "base_price": round((base + size["size_yards"] * per_yard) * regional, 2),
+                    "additional_day_price": round(base * 0.1, 2),
+                    "weight_overage_price": 65.0,
+                    "rental_period_days": 7,
+                })
+
+    return {
+        "companies": company_records,
+        "service_areas": area_records,
+        "dumpster_sizes": size_records,
+        "prices": price_records,
+    }
+
+
+def generate_scraped_data(**options) -> ScrapedData:
+    """A validated ``ScrapedData`` built from ``generate_records(**options)``"""
+    return ScrapedData(**generate_records(**options), last_updated=datetime.now())
+
+
+def write_snapshot(data_dir: str, records: Optional[Dict[str, List[Dict[str, Any]]]] = None, **options) -> str:
+    """Write records as the data directory's snapshot, in the format DataStorage saves; return its path"""
+    records = records if records is not None else generate_records(**options)
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, "dumpster_data.json")
+    with open(path, "w") as f:
+        json.dump({**records, "last_updated": datetime.now().isoformat()}, f, indent=2)
+    return path
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser):
+    """Dataset scale options shared by the benchmark tools"""
+    parser.add_argument("--companies", type=int, default=10, help="Number of companies")
+    parser.add_argument("--areas", type=int, default=4000, help="Number of ZIP-level service areas")
+    parser.add_argument("--sizes", type=int, default=6, help="Dumpster sizes per company")
+    parser.add_argument("--coverage", type=float, default=1.0, help="Share of areas each company serves")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+
+def scale_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "companies": args.companies,
+        "areas": args.areas,
+        "sizes": args.sizes,
+        "coverage": args.coverage,
+        "seed": args.seed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic dumpster dataset")
+    add_scale_arguments(parser)
+    parser.add_argument("--data-dir", required=True, help="Directory to write dumpster_data.json into")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = generate_records(**scale_options(args))
+    path = write_snapshot(args.data_dir, records)
+    counts = ", ".join(f"{len(items)} {name}" for name, items in records.items())
+    print(f"Wrote {counts} to {path} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
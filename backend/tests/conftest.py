@@ -0,0 +1,24 @@
+import pytest
+
+from app.scrapers import base_scraper
+from app.scrapers.fixtures import FixtureArchive
+from app.scrapers.registry import provider_names
+from app.utils.data_storage import DataStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return DataStorage(str(tmp_path / "data"))
+
+
+@pytest.fixture
+def offline_scrapers(tmp_path, monkeypatch):
+    """Make scrapers replay empty fixture archives, so they run offline on their default data"""
+    fixture_dir = tmp_path / "fixtures"
+    for name in provider_names():
+        FixtureArchive(str(fixture_dir / f"{name}.zip"), "w").close()
+    monkeypatch.setattr(base_scraper, "FETCH_MODE", "replay")
+    monkeypatch.setattr(base_scraper, "FIXTURE_DIR", str(fixture_dir))
+    monkeypatch.setattr(base_scraper, "CRAWL_STATE_DIR", str(tmp_path / "crawl"))
+    # The scheduler logs runs under ./logs
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,51 @@
+import pytest
+
+from app.models.dumpster_data import ScrapedData, ServiceArea
+from app.utils.city_resolver import CityResolver
+
+CITIES = [
+    ("Austin", "TX"), ("San Antonio", "TX"), ("San Diego", "CA"), ("New York", "NY"),
+    ("Newark", "NJ"), ("Springfield", "IL"), ("Springfield", "MO"), ("St. Louis", "MO"),
+    ("Dover", "DE"), ("Rover", "TN"),
+]
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    areas = [ServiceArea(id=f"area-{i}", city=city, state=state) for i, (city, state) in enumerate(CITIES)]
+    return CityResolver(ScrapedData(service_areas=areas))
+
+
+def test_exact_and_alias_matches(resolver):
+    match = resolver.resolve("austin")
+    assert (match.city, match.state, match.match, match.area_ids) == ("Austin", "TX", "exact", ["area-0"])
+    match = resolver.resolve("Saint Louis", "Missouri")
+    assert (match.city, match.state, match.match) == ("St. Louis", "MO", "alias")
+
+
+def test_name_in_several_states(resolver):
+    match = resolver.resolve("Springfield")
+    assert match.state is None
+    assert match.canonical_path == "/city/Springfield"
+    assert sorted(match.area_ids) == ["area-5", "area-6"]
+    assert resolver.resolve("Springfield", "MO").area_ids == ["area-6"]
+
+
+def test_typo_resolves_to_the_city(resolver):
+    match = resolver.resolve("Austn")
+    assert (match.city, match.match) == ("Austin", "fuzzy")
+    assert match.score < 1
+    assert resolver.resolve("San Antonoi").city == "San Antonio"
+
+
+@pytest.mark.parametrize("city, state", [
+    ("Austinville", None),
+    ("San", None),
+    ("New", None),
+    ("Houston", None),
+    ("Austin", "CA"),
+    # As close to Dover as to Rover
+    ("Bover", None),
+])
+def test_non_matches_are_rejected(resolver, city, state):
+    assert resolver.resolve(city, state) is None
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from app.utils.cron import CronSchedule
+
+
+def test_day_of_month_or_day_of_week_when_both_are_restricted():
+    # The 1st of the month or any Monday; 2026-11-01 is a Sunday
+    schedule = CronSchedule("0 0 1 * 1")
+    assert schedule.next_after(datetime(2026, 10, 27, 12, 0)) == datetime(2026, 11, 1, 0, 0)
+    assert schedule.next_after(datetime(2026, 11, 1, 0, 0)) == datetime(2026, 11, 2, 0, 0)
+
+
+def test_unrestricted_day_of_month_leaves_day_of_week_alone():
+    schedule = CronSchedule("0 0 * * 1")
+    assert schedule.next_after(datetime(2026, 10, 27, 12, 0)) == datetime(2026, 11, 2, 0, 0)
+
+
+def test_seven_is_sunday():
+    moment = datetime(2026, 10, 19, 9, 30)
+    assert CronSchedule("0 12 * * 7").next_after(moment) == datetime(2026, 10, 25, 12, 0)
+    assert CronSchedule("0 12 * * 7").next_after(moment) == CronSchedule("0 12 * * 0").next_after(moment)
+
+
+def test_aliases_and_steps():
+    assert CronSchedule("@weekly").next_after(datetime(2026, 10, 19)) == datetime(2026, 10, 25, 0, 0)
+    assert CronSchedule("*/15 * * * *").next_after(datetime(2026, 10, 19, 9, 30)) == datetime(2026, 10, 19, 9, 45)
+
+
+def test_expression_that_never_matches():
+    with pytest.raises(ValueError, match="never matches"):
+        CronSchedule("0 0 30 2 *").next_after(datetime(2026, 10, 19))
+
+
+@pytest.mark.parametrize("expression", ["0 0 * *", "60 * * * *", "0 0 * * 8", "*/0 * * * *", "0 0 5-1 * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
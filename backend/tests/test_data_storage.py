@@ -0,0 +1,85 @@
+import pytest
+
+from app.models.dumpster_data import DumpsterCompany, DumpsterPrice, DumpsterSize, ScrapedData, ServiceArea
+
+
+def company(company_id):
+    return DumpsterCompany(id=company_id, name=f"Company {company_id}", website=f"https://{company_id}.example")
+
+
+def records(company_id, area_id, base_price):
+    return {
+        "companies": [company(company_id).dict()],
+        "service_areas": [ServiceArea(id=area_id, city="Austin", state="TX").dict()],
+        "dumpster_sizes": [DumpsterSize(id=f"{company_id}-20", company_id=company_id, size_yards=20).dict()],
+        "prices": [DumpsterPrice(id=f"{company_id}-{area_id}", company_id=company_id, size_id=f"{company_id}-20",
+                                 service_area_id=area_id, base_price=base_price).dict()],
+    }
+
+
+def stage(storage, run_id, source, staged):
+    for record_type, batch in staged.items():
+        storage.append_records(run_id, source, record_type, batch)
+
+
+@pytest.fixture
+def snapshot(storage):
+    """A snapshot with companies a and b, which share a service area"""
+    data = {record_type: list(batch) for record_type, batch in records("a", "shared", 300).items()}
+    for record_type, batch in records("b", "shared", 400).items():
+        if record_type != "service_areas":
+            data[record_type] += batch
+    storage.save_data(ScrapedData(**data))
+    return storage
+
+
+def prices(storage):
+    return sorted((price.company_id, price.base_price) for price in storage.load_data().prices)
+
+
+def test_commit_without_replace_websites_replaces_the_snapshot(snapshot):
+    stage(snapshot, "run", "a", records("a", "new-area", 310))
+    assert snapshot.commit_staging("run")
+    assert prices(snapshot) == [("a", 310)]
+    assert [area.id for area in snapshot.load_data().service_areas] == ["new-area"]
+    assert snapshot.list_staged_runs() == []
+
+
+def test_commit_with_replace_websites_merges(snapshot):
+    stage(snapshot, "run", "a", records("a", "new-area", 310))
+    assert snapshot.commit_staging("run", replace_websites={"https://a.example"})
+    data = snapshot.load_data()
+    assert prices(snapshot) == [("a", 310), ("b", 400)]
+    assert sorted(company.id for company in data.companies) == ["a", "b"]
+    # b still has prices in the shared area, so it stays
+    assert sorted(area.id for area in data.service_areas) == ["new-area", "shared"]
+
+
+def test_replaced_company_areas_without_other_prices_are_dropped(storage):
+    storage.save_data(ScrapedData(**records("a", "only-a", 300)))
+    stage(storage, "run", "a", records("a", "new-area", 310))
+    assert storage.commit_staging("run", replace_websites={"https://a.example"})
+    assert [area.id for area in storage.load_data().service_areas] == ["new-area"]
+
+
+def test_commit_only_the_given_sources(snapshot):
+    stage(snapshot, "run", "a", records("a", "new-area", 310))
+    stage(snapshot, "run", "c", records("c", "new-area", 500))
+    assert snapshot.commit_staging("run", sources=["a"], replace_websites={"https://a.example"})
+    assert prices(snapshot) == [("a", 310), ("b", 400)]
+
+
+def test_failed_commit_keeps_the_snapshot_and_the_staged_records(snapshot, monkeypatch):
+    stage(snapshot, "run", "a", records("a", "new-area", 310))
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("app.utils.data_storage.os.replace", fail)
+    assert not snapshot.commit_staging("run")
+    monkeypatch.undo()
+
+    assert prices(snapshot) == [("a", 300), ("b", 400)]
+    assert snapshot.list_staged_runs() == ["run"]
+    assert snapshot.commit_staging("run")
+    assert prices(snapshot) == [("a", 310)]
@@ -0,0 +1,82 @@
+import pytest
+
+from app.utils import job_queue
+from app.utils.job_queue import JobQueue
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    yield queue
+    queue.close()
+
+
+def test_expired_lease_goes_to_the_next_worker(queue, clock):
+    job_id = queue.enqueue("scrape", {"company": "budget"})
+    assert queue.claim("worker-1", lease_seconds=60)["id"] == job_id
+    assert queue.claim("worker-2", lease_seconds=60) is None
+
+    clock.advance(30)
+    assert queue.heartbeat(job_id, "worker-1", lease_seconds=60)
+    clock.advance(61)
+    job = queue.claim("worker-2", lease_seconds=60)
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+    assert job["lease_owner"] == "worker-2"
+
+    # The first worker lost its lease and can no longer touch the job
+    assert not queue.heartbeat(job_id, "worker-1", lease_seconds=60)
+    assert not queue.complete(job_id, "worker-1")
+    assert queue.complete(job_id, "worker-2", {"prices": 3})
+    job = queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == {"prices": 3}
+
+
+def test_expired_lease_fails_the_job_after_max_attempts(queue, clock):
+    job_id = queue.enqueue("scrape", max_attempts=1)
+    queue.claim("worker-1", lease_seconds=60)
+    clock.advance(61)
+
+    assert queue.claim("worker-2", lease_seconds=60) is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "lease expired"
+
+
+def test_failed_job_is_retried_while_attempts_remain(queue, clock):
+    job_id = queue.enqueue("scrape", max_attempts=2)
+    queue.claim("worker-1", lease_seconds=60)
+    assert queue.fail(job_id, "worker-1", "timeout")
+    assert queue.get(job_id)["status"] == "queued"
+
+    assert queue.claim("worker-1", lease_seconds=60)["attempts"] == 2
+    assert queue.fail(job_id, "worker-1", "timeout again")
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "timeout again"
+    assert queue.claim("worker-1", lease_seconds=60) is None
+
+
+def test_unique_enqueue_reuses_pending_job(queue, clock):
+    job_id = queue.enqueue("scrape", {"company": "budget"}, unique=True)
+    assert queue.enqueue("scrape", {"company": "budget"}, unique=True) == job_id
+    assert queue.enqueue("scrape", {"company": "liberty"}, unique=True) != job_id
@@ -0,0 +1,42 @@
+import json
+
+from app.utils.junk_king_report import main
+
+HEADER = "city,state,zip,is_available,min_price,max_price,source\n"
+
+
+def run_report(tmp_path, rows):
+    csv_file = tmp_path / "results.csv"
+    csv_file.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+    json_path = tmp_path / "report.json"
+    main(["--csv", str(csv_file), "--json", str(json_path)])
+    return json.loads(json_path.read_text())
+
+
+def test_report_without_available_locations(tmp_path, capsys):
+    report = run_report(tmp_path, ["Austin,Texas,78701,False,,,checked"])
+    assert report["total_records"] == 1
+    assert report["available"] == 0
+    assert report["prices"] == {}
+    assert report["by_state"] == {}
+    assert "Available locations: 0 (0.00%)" in capsys.readouterr().out
+
+
+def test_report_price_statistics(tmp_path):
+    report = run_report(tmp_path, [
+        "Austin,Texas,78701,True,$300,$500,checked",
+        "Dallas,Texas,75201,True,$400,$600,checked",
+        "Miami,Florida,33101,True,$350,$550,inferred",
+        "Boise,Idaho,83701,False,,,checked",
+    ])
+    assert report["available"] == 3
+    assert report["available_pct"] == 75.0
+    assert report["prices"]["min_price"]["count"] == 3
+    assert report["prices"]["min_price"]["p50"] == 350.0
+    assert report["by_state"]["TX"]["min_price"] == {
+        "count": 2.0, "min": 300.0, "max": 400.0, "mean": 350.0, "p25": 325.0, "p50": 350.0, "p75": 375.0, "p90": 390.0,
+    }
+    assert report["by_state"]["FL"]["max_price"]["max"] == 550.0
+    # Dallas is one of the major cities
+    assert report["by_city_class"]["major"]["min_price"]["count"] == 1
+    assert report["by_city_class"]["other"]["min_price"]["count"] == 2
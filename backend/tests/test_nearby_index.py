@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from app.models.dumpster_data import ScrapedData, ServiceArea
+from app.utils.gazetteer import Gazetteer
+from app.utils.nearby_index import NearbyIndex, haversine_km
+
+
+def random_areas(rng, count, longitudes):
+    return [
+        ServiceArea(id=f"area-{i}", city=f"City {i}", state="TX",
+                    latitude=rng.uniform(-60, 70), longitude=rng.uniform(*rng.choice(longitudes)))
+        for i in range(count)
+    ]
+
+
+def brute_force(areas, latitude, longitude, k, radius_km=None, exclude=()):
+    distances = sorted(
+        (haversine_km(latitude, longitude, area.latitude, area.longitude), area.city)
+        for area in areas if area.city not in exclude
+    )
+    if radius_km is not None:
+        distances = [(distance, city) for distance, city in distances if distance <= radius_km]
+    return [city for _, city in distances[:k]]
+
+
+def found(index, latitude, longitude, k, radius_km=None, exclude=()):
+    cities = index.nearby(latitude, longitude, k, radius_km)
+    return [city["city"] for city in cities if city["city"] not in exclude][:k]
+
+
+@pytest.fixture(scope="module")
+def us_areas():
+    return random_areas(random.Random(7), 2000, [(-125, -67)])
+
+
+@pytest.fixture(scope="module")
+def index(us_areas):
+    # Unusable coordinates and nothing in the gazetteer: the city has no position
+    nowhere = ServiceArea(id="nowhere", city="Nowhere", state="TX", latitude=float("nan"), longitude=-97.0)
+    return NearbyIndex(ScrapedData(service_areas=us_areas + [nowhere]), gazetteer=Gazetteer())
+
+
+def test_cities_without_a_position_are_left_out(index):
+    assert len(index) == 2000
+    assert "Nowhere" not in found(index, 31.0, -97.0, 50)
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_nearby_matches_brute_force(index, us_areas, k):
+    rng = random.Random(k)
+    for _ in range(50):
+        latitude, longitude = rng.uniform(20, 55), rng.uniform(-130, -60)
+        assert found(index, latitude, longitude, k) == brute_force(us_areas, latitude, longitude, k)
+
+
+def test_radius_matches_brute_force(index, us_areas):
+    rng = random.Random(1)
+    for _ in range(50):
+        latitude, longitude = rng.uniform(20, 55), rng.uniform(-130, -60)
+        cities = index.nearby(latitude, longitude, 10, radius_km=300)
+        assert [city["city"] for city in cities] == brute_force(us_areas, latitude, longitude, 10, radius_km=300)
+        assert all(city["distance_km"] <= 300 for city in cities)
+
+
+def test_query_far_from_every_city(index, us_areas):
+    assert found(index, -33.9, 151.2, 3) == brute_force(us_areas, -33.9, 151.2, 3)
+
+
+def test_search_across_the_antimeridian():
+    rng = random.Random(3)
+    areas = random_areas(rng, 500, [(150, 180), (-180, -60)])
+    index = NearbyIndex(ScrapedData(service_areas=areas), gazetteer=Gazetteer())
+    for _ in range(100):
+        latitude, longitude = rng.uniform(-70, 80), rng.uniform(-180, 180)
+        assert found(index, latitude, longitude, 5) == brute_force(areas, latitude, longitude, 5)
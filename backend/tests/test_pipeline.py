@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.scrapers.registry import get_scrapers
+from app.utils.junk_king_import import COMPANY_ID, JUNK_KING_NAME, import_results
+from app.utils.pipeline import PublishError, ScrapePipeline
+from app.utils.run_ledger import RunLedger
+
+JUNK_KING_CSV = (
+    "city,state,zip,is_available,min_price,max_price,source\n"
+    "Austin,Texas,78701,True,$300,$500,checked\n"
+)
+REGISTRY_COMPANIES = {"Waste Management", "Budget Dumpster", "Liberty Dumpsters"}
+
+
+def run(storage, providers=None, failing=(), ledger=None, run_id=None):
+    scrapers = get_scrapers(providers)
+    for scraper in scrapers:
+        if scraper.name in failing:
+            # An unknown fetch mode makes the scraper fail as it starts
+            scraper.fetch_mode = "broken"
+    return asyncio.run(ScrapePipeline(storage, ledger=ledger).run(scrapers, run_id=run_id))
+
+
+def companies(storage):
+    return sorted(company.name for company in storage.load_data().companies)
+
+
+def test_full_run_keeps_imported_junk_king_records(tmp_path, storage, offline_scrapers):
+    csv_file = tmp_path / "junk_king.csv"
+    csv_file.write_text(JUNK_KING_CSV)
+    import_results(str(csv_file), storage)
+    junk_king_prices = [price for price in storage.load_data().prices if price.company_id == COMPANY_ID]
+    assert junk_king_prices
+
+    run(storage)
+    run(storage)
+
+    data = storage.load_data()
+    assert companies(storage) == sorted(REGISTRY_COMPANIES | {JUNK_KING_NAME})
+    assert [price for price in data.prices if price.company_id == COMPANY_ID] == junk_king_prices
+    area_ids = {area.id for area in data.service_areas}
+    assert all(price.service_area_id in area_ids for price in junk_king_prices)
+
+
+def company_prices(storage):
+    """Price ids per company name"""
+    data = storage.load_data()
+    names = {company.id: company.name for company in data.companies}
+    found = {}
+    for price in data.prices:
+        found.setdefault(names[price.company_id], set()).add(price.id)
+    return found
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = RunLedger(str(tmp_path / "runs.db"))
+    yield ledger
+    ledger.close()
+
+
+def test_published_run_returns_counts(storage, offline_scrapers, ledger):
+    counts = run(storage, ledger=ledger, run_id="full")
+    assert counts["companies"] == 3
+    assert set(companies(storage)) == REGISTRY_COMPANIES
+    assert ledger.list_runs()[0]["status"] == "published"
+
+
+def test_run_without_successful_scrapers_publishes_nothing(storage, offline_scrapers, ledger):
+    run(storage)
+    before = company_prices(storage)
+
+    with pytest.raises(PublishError):
+        run(storage, failing={"waste_management", "budget_dumpster", "liberty_dumpsters"}, ledger=ledger)
+    assert company_prices(storage) == before
+    assert storage.list_staged_runs() == []
+    assert ledger.list_runs()[0]["status"] == "failed"
+
+
+def test_failed_scraper_keeps_its_previous_records(storage, offline_scrapers, ledger):
+    run(storage)
+    before = company_prices(storage)
+
+    run(storage, failing={"budget_dumpster"}, ledger=ledger)
+    after = company_prices(storage)
+    assert set(after) == REGISTRY_COMPANIES
+    assert after["Budget Dumpster"] == before["Budget Dumpster"]
+    assert after["Liberty Dumpsters"].isdisjoint(before["Liberty Dumpsters"])
+    run_entry = ledger.list_runs()[0]
+    assert run_entry["status"] == "published"
+    assert {scraper["scraper"]: scraper["ok"] for scraper in run_entry["scrapers"]} == {
+        "waste_management": True, "budget_dumpster": False, "liberty_dumpsters": True,
+    }
+
+
+def test_partial_run_merges_into_the_snapshot(storage, offline_scrapers):
+    run(storage)
+    before = company_prices(storage)
+
+    counts = run(storage, providers=["budget_dumpster"])
+    assert counts["companies"] == 1
+    after = company_prices(storage)
+    assert set(after) == REGISTRY_COMPANIES
+    assert after["Waste Management"] == before["Waste Management"]
+    assert after["Budget Dumpster"].isdisjoint(before["Budget Dumpster"])
+
+
+def test_failed_commit_raises(storage, offline_scrapers, ledger, monkeypatch):
+    monkeypatch.setattr(storage, "commit_staging", lambda *args, **kwargs: False)
+    with pytest.raises(PublishError, match="Could not commit"):
+        run(storage, ledger=ledger, run_id="uncommitted")
+    assert ledger.list_runs()[0]["status"] == "failed"
+    assert storage.list_staged_runs() == ["uncommitted"]
@@ -0,0 +1,81 @@
+import pytest
+
+from app.models.dumpster_data import (
+    SERVICE_DUMPSTER, SERVICE_JUNK_REMOVAL, DumpsterCompany, DumpsterPrice, DumpsterSize, ScrapedData, ServiceArea,
+)
+from app.utils.price_ranking import PriceRanking, rental_cost
+
+
+def price(price_id, company_id, area_id, base_price, additional_day_price, size_id=None):
+    return DumpsterPrice(id=price_id, company_id=company_id, size_id=size_id or f"{company_id}-20",
+                         service_area_id=area_id, base_price=base_price,
+                         additional_day_price=additional_day_price, rental_period_days=7)
+
+
+@pytest.fixture
+def data():
+    companies = [DumpsterCompany(id=company_id, name=f"Company {company_id}", website=company_id) for company_id in "ABCJ"]
+    areas = [
+        ServiceArea(id="austin-1", city="Austin", state="TX", zip_code="78701"),
+        ServiceArea(id="austin-2", city="Austin", state="TX", zip_code="78702"),
+        ServiceArea(id="dallas-1", city="Dallas", state="TX", zip_code="75201"),
+    ]
+    sizes = [DumpsterSize(id=f"{company_id}-20", company_id=company_id, size_yards=20) for company_id in "ABC"]
+    sizes.append(DumpsterSize(id="J-20", company_id="J", size_yards=20, service=SERVICE_JUNK_REMOVAL))
+    prices = [
+        # A's cheapest base price is not its cheapest long rental
+        price("a1", "A", "austin-1", 300, 50),
+        price("a2", "A", "austin-2", 310, 5),
+        price("b1", "B", "austin-1", 400, 10),
+        # C charges nothing per extra day that we know of
+        price("c1", "C", "austin-1", 250, None),
+        price("j1", "J", "austin-1", 100, None),
+        price("a3", "A", "dallas-1", 200, 1),
+    ]
+    return ScrapedData(companies=companies, service_areas=areas, dumpster_sizes=sizes, prices=prices)
+
+
+@pytest.fixture
+def ranking(data):
+    return PriceRanking(data)
+
+
+def offers(ranking, days=None):
+    return [(offer["company_id"], offer["base_price"], offer.get("total_price"))
+            for offer in ranking.compare(["austin-1", "austin-2"], 20, days)]
+
+
+def test_rental_cost():
+    assert rental_cost(price("p", "A", "a", 300, 50), 7) == 300
+    assert rental_cost(price("p", "A", "a", 300, 50), 10) == 450
+    assert rental_cost(price("p", "A", "a", 300, None), 10) is None
+    assert rental_cost(DumpsterPrice(id="p", company_id="A", size_id="s", service_area_id="a", base_price=99), 30) == 99
+
+
+def test_compare_by_base_price(ranking):
+    assert offers(ranking) == [("C", 250, None), ("A", 300, None), ("B", 400, None)]
+
+
+def test_compare_totals_use_each_companys_cheapest_total(ranking):
+    assert offers(ranking, 7) == [("C", 250, 250), ("A", 300, 300), ("B", 400, 400)]
+    # A: 300 + 7 * 50 = 650 in one area but 310 + 7 * 5 = 345 in the other
+    assert offers(ranking, 14) == [("A", 310, 345), ("B", 400, 470), ("C", 250, None)]
+
+
+def test_totals_match_brute_force(ranking, data):
+    sizes = {size.id: size for size in data.dumpster_sizes}
+    austin = [price for price in data.prices
+              if price.service_area_id.startswith("austin") and sizes[price.size_id].service == SERVICE_DUMPSTER]
+    for days in (1, 7, 8, 14, 30):
+        best = {}
+        for offer_price in austin:
+            total = rental_cost(offer_price, days)
+            if total is not None:
+                best[offer_price.company_id] = min(best.get(offer_price.company_id, total), total)
+        totals = [offer["total_price"] for offer in ranking.compare(["austin-1"], 20, days)]
+        assert [total for total in totals if total is not None] == sorted(best.values())
+
+
+def test_junk_removal_is_not_ranked(ranking):
+    assert "J" not in {offer["company_id"] for offer in ranking.compare(["austin-1"], 20, 7)}
+    assert ranking.city_sizes(["austin-1"]) == [20]
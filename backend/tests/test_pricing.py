@@ -0,0 +1,50 @@
+import pytest
+
+from app.scrapers.pricing import RegionalPricing
+
+
+@pytest.fixture
+def pricing():
+    return RegionalPricing(
+        base_price=200,
+        price_per_yard=10,
+        state_factors={"CA": 1.5, "TX": 0.8},
+        additional_day_rate=0.1,
+        weight_overage_price=50.0,
+        rental_period_days=7,
+        city_factors={("Portland", "Oregon"): 1.2, ("Houston", "TX"): 1.1},
+    )
+
+
+def test_factors_combine_state_and_city(pricing):
+    factors = pricing.factors(
+        ["OR", "ME", "Texas", "TX", "CA", "ZZ"], ["Portland", "Portland", "Houston", "Dallas", "Houston", "Nowhere"])
+
+    # Cities are told apart by state; unknown states and cities keep the base price
+    assert factors.tolist() == pytest.approx([1.2, 1.0, 0.8 * 1.1, 0.8, 1.5, 1.0])
+
+
+def test_factors_without_cities_use_states_only(pricing):
+    assert pricing.factors(["TX", "OR"]).tolist() == pytest.approx([0.8, 1.0])
+
+
+def test_price_grid_matches_per_cell_prices(pricing):
+    areas = [
+        {"id": "hou", "city": "Houston", "state": "TX"},
+        {"id": "pdx", "city": "Portland", "state": "OR"},
+        {"id": "sf", "city": "San Francisco", "state": "CA"},
+    ]
+    sizes = [{"id": "10", "size_yards": 10}, {"id": "30", "size_yards": 30}]
+    factors = {"hou": 0.8 * 1.1, "pdx": 1.2, "sf": 1.5}
+
+    grid = pricing.price_grid("company", areas, sizes)
+    records = list(grid)
+
+    assert len(grid) == len(records) == 6
+    for record in records:
+        size_yards = int(record["size_id"])
+        expected = round((200 + 10 * size_yards) * factors[record["service_area_id"]], 2)
+        assert record["base_price"] == pytest.approx(expected)
+        assert record["additional_day_price"] == pytest.approx(round(expected * 0.1, 2))
+        assert record["company_id"] == "company"
+    assert len({record["id"] for record in records}) == 6
@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+from app.scrapers import base_scraper
+from app.utils.scheduler import ScraperScheduler
+
+
+def run_scrapers(scheduler, providers=None):
+    return asyncio.run(scheduler.run_scrapers(providers))
+
+
+def test_full_run_sets_last_full_run(storage, offline_scrapers):
+    scheduler = ScraperScheduler(storage)
+    assert scheduler.is_stale()
+
+    counts = run_scrapers(scheduler)
+    assert counts["companies"] == 3
+    assert scheduler.last_full_run is not None
+    assert scheduler.last_error is None
+    assert not scheduler.is_stale()
+
+
+def test_run_where_every_scraper_fails(storage, offline_scrapers, monkeypatch):
+    scheduler = ScraperScheduler(storage)
+    monkeypatch.setattr(base_scraper, "FETCH_MODE", "broken")
+
+    assert run_scrapers(scheduler) is None
+    assert scheduler.last_full_run is None
+    assert scheduler.last_run is None
+    assert "No scraper succeeded" in scheduler.last_error
+    assert scheduler.is_stale()
+
+
+def test_run_where_a_scraper_fails(tmp_path, storage, offline_scrapers):
+    # Without its fixture archive the scraper fails as it starts
+    os.remove(tmp_path / "fixtures" / "budget_dumpster.zip")
+    scheduler = ScraperScheduler(storage)
+
+    assert run_scrapers(scheduler) is None
+    assert scheduler.last_run is not None
+    assert scheduler.last_full_run is None
+    assert "budget_dumpster" in scheduler.last_error
+    # The other providers were still published
+    assert len(storage.load_data().companies) == 2
+
+
+def test_failed_run_keeps_the_last_full_run(storage, offline_scrapers, monkeypatch):
+    scheduler = ScraperScheduler(storage)
+    run_scrapers(scheduler)
+    last_full_run = scheduler.last_full_run
+
+    monkeypatch.setattr(base_scraper, "FETCH_MODE", "broken")
+    assert run_scrapers(scheduler) is None
+    # A restarted scheduler reads the same state back
+    restarted = ScraperScheduler(storage)
+    assert restarted.last_full_run == last_full_run
+    assert restarted.last_error is not None
+
+
+def test_partial_run_does_not_set_last_full_run(storage, offline_scrapers):
+    scheduler = ScraperScheduler(storage)
+    counts = run_scrapers(scheduler, ["budget_dumpster"])
+    assert counts["companies"] == 1
+    assert scheduler.last_run is not None
+    assert scheduler.last_full_run is None
+    assert scheduler.last_error is None
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.scrapers import base_scraper
+from app.worker import ScrapeWorker
+
+
+@pytest.fixture
+def worker(tmp_path, offline_scrapers):
+    worker = ScrapeWorker("worker-1", data_dir=str(tmp_path / "data"), queue_file=str(tmp_path / "jobs.db"),
+                          poll_seconds=0, ledger_file=str(tmp_path / "runs.db"))
+    yield worker
+    worker.queue.close()
+    worker.scheduler.run_ledger.close()
+
+
+def test_job_without_successful_scrapers_is_retried_then_failed(worker, monkeypatch):
+    monkeypatch.setattr(base_scraper, "FETCH_MODE", "broken")
+    job_id = worker.queue.enqueue("scrape", {"providers": None}, max_attempts=2)
+
+    asyncio.run(worker.run_job(worker.queue.claim(worker.worker_id, worker.lease_seconds)))
+    job = worker.queue.get(job_id)
+    assert job["status"] == "queued"
+    assert "No scraper succeeded" in job["error"]
+
+    asyncio.run(worker.run(once=True))
+    job = worker.queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+
+
+def test_successful_job_is_done(worker):
+    job_id = worker.queue.enqueue("scrape", {"providers": None})
+    asyncio.run(worker.run(once=True))
+    job = worker.queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"]["companies"] == 3
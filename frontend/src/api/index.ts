@@ -1,4 +1,4 @@
-import { Company, ServiceArea, DumpsterSize, DumpsterPrice, CityData } from '../types';
+import { Company, ServiceArea, DumpsterSize, DumpsterPrice, CityData, CityComparison } from '../types';
 
 const API_URL = import.meta.env?.VITE_API_URL || 'http://localhost:8000';
 
@@ -67,6 +67,28 @@ export const fetchCities = async (): Promise<{ city: string; state: string }[]>
   }
 };
 
+export interface CitySearchResult {
+  city: string;
+  state: string;
+  providers: number;
+  service_areas: number;
+}
+
+export const searchCities = async (query: string, limit = 12): Promise<CitySearchResult[]> => {
+  try {
+    const response = await fetch(
+      `${API_URL}/cities/search?q=${encodeURIComponent(query)}&limit=${limit}`
+    );
+    if (!response.ok) {
+      throw new Error('Failed to search cities');
+    }
+    return await response.json();
+  } catch (error) {
+    console.error('Error searching cities:', error);
+    return [];
+  }
+};
+
 export const fetchCityData = async (city: string, state?: string): Promise<CityData | null> => {
   try {
     const url = state 
@@ -84,6 +106,27 @@ export const fetchCityData = async (city: string, state?: string): Promise<CityD
   }
 };
 
+export const fetchCityComparison = async (
+  city: string,
+  size: number,
+  state?: string,
+  days?: number
+): Promise<CityComparison | null> => {
+  try {
+    const params = new URLSearchParams({ size: String(size) });
+    if (state) params.set('state', state);
+    if (days) params.set('days', String(days));
+    const response = await fetch(`${API_URL}/city/${encodeURIComponent(city)}/compare?${params}`);
+    if (!response.ok) {
+      throw new Error(`Failed to compare prices for ${city}, ${state}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error(`Error comparing prices for ${city}, ${state}:`, error);
+    return null;
+  }
+};
+
 export const triggerScrape = async (): Promise<{ message: string }> => {
   try {
     const response = await fetch(`${API_URL}/scrape`, {
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { CityData, Company, DumpsterSize, DumpsterPrice } from '../types';
 import { fetchCityData } from '../api';
+import { PriceComparison } from './PriceComparison';
 
 interface CityPageProps {
   city: string;
@@ -84,7 +85,7 @@ export function CityPage({ city, state }: CityPageProps) {
       if (prices.length > 0) {
         sizePrices[size.id] = {
           size,
-          prices: prices.sort((a, b) => a.base_price - b.base_price),
+          prices,
         };
       }
     });
@@ -106,6 +107,10 @@ export function CityPage({ city, state }: CityPageProps) {
 
   const lowestPricesByCompany = getLowestPriceByCompany();
   const dumpsterSizesWithPrices = getDumpsterSizesWithPrices();
+  // Junk removal truck loads are not dumpster rentals, so the comparison doesn't rank them
+  const sizeYards = [...new Set(dumpsterSizesWithPrices
+    .filter(({ size }) => size.service !== 'junk_removal')
+    .map(({ size }) => size.size_yards))].sort((a, b) => a - b);
 
   return (
     <div className="max-w-6xl mx-auto p-4">
@@ -165,6 +170,9 @@ export function CityPage({ city, state }: CityPageProps) {
         </div>
       </section>
 
+      {/* Price Comparison Section */}
+      <PriceComparison key={`${city}-${state}`} city={city} state={state} sizes={sizeYards} />
+
       {/* Dumpster Sizes Section */}
       <section className="mb-12">
         <h2 className="text-3xl font-bold mb-6">Dumpster Sizes Available in {city}, {state}</h2>
@@ -1,69 +1,92 @@
 import { useState, useEffect } from 'react';
-import { fetchCities } from '../api';
+import { searchCities, CitySearchResult } from '../api';
 
 interface CitySelectorProps {
   onCitySelect: (city: string, state: string) => void;
 }
 
+// Wait for a pause in typing before asking the API
+const SEARCH_DELAY_MS = 150;
+
 export function CitySelector({ onCitySelect }: CitySelectorProps) {
-  const [cities, setCities] = useState<{ city: string; state: string }[]>([]);
+  const [query, setQuery] = useState('');
+  const [cities, setCities] = useState<CitySearchResult[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [selectedCity, setSelectedCity] = useState<{ city: string; state: string } | null>(null);
 
   useEffect(() => {
-    const loadCities = async () => {
+    let cancelled = false;
+    const timer = setTimeout(async () => {
       try {
         setLoading(true);
-        const citiesData = await fetchCities();
-        setCities(citiesData);
-        setError(null);
+        const citiesData = await searchCities(query);
+        if (!cancelled) {
+          setCities(citiesData);
+          setError(null);
+        }
       } catch (err) {
-        setError('Failed to load cities. Please try again later.');
+        if (!cancelled) {
+          setError('Failed to load cities. Please try again later.');
+        }
         console.error('Error loading cities:', err);
       } finally {
-        setLoading(false);
+        if (!cancelled) {
+          setLoading(false);
+        }
       }
-    };
+    }, query ? SEARCH_DELAY_MS : 0);
 
-    loadCities();
-  }, []);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
 
   const handleCitySelect = (cityData: { city: string; state: string }) => {
     setSelectedCity(cityData);
     onCitySelect(cityData.city, cityData.state);
   };
 
-  if (loading) {
-    return <div className="p-4 text-center">Loading cities...</div>;
-  }
-
   if (error) {
     return <div className="p-4 text-red-500 text-center">{error}</div>;
   }
 
-  if (cities.length === 0) {
+  if (!loading && !query && cities.length === 0) {
     return <div className="p-4 text-center">No cities available. Please trigger a data scrape first.</div>;
   }
 
   return (
     <div className="p-4 bg-white rounded-lg shadow-md">
       <h2 className="text-xl font-bold mb-4">Select a City</h2>
-      <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-        {cities.map((cityData, index) => (
-          <button
-            key={index}
-            className={`p-3 rounded-md border ${
-              selectedCity?.city === cityData.city && selectedCity?.state === cityData.state
-                ? 'bg-blue-100 border-blue-500'
-                : 'bg-gray-50 border-gray-200 hover:bg-gray-100'
-            }`}
-            onClick={() => handleCitySelect(cityData)}
-          >
-            {cityData.city}, {cityData.state}
-          </button>
-        ))}
-      </div>
+      <input
+        type="search"
+        value={query}
+        onChange={(event) => setQuery(event.target.value)}
+        placeholder="Search for a city, e.g. Austin, TX"
+        className="w-full mb-4 p-3 rounded-md border border-gray-200 focus:outline-none focus:border-blue-500"
+      />
+      {loading && cities.length === 0 ? (
+        <div className="p-4 text-center">Loading cities...</div>
+      ) : cities.length === 0 ? (
+        <div className="p-4 text-center">No cities match "{query}".</div>
+      ) : (
+        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+          {cities.map((cityData) => (
+            <button
+              key={`${cityData.city}-${cityData.state}`}
+              className={`p-3 rounded-md border ${
+                selectedCity?.city === cityData.city && selectedCity?.state === cityData.state
+                  ? 'bg-blue-100 border-blue-500'
+                  : 'bg-gray-50 border-gray-200 hover:bg-gray-100'
+              }`}
+              onClick={() => handleCitySelect(cityData)}
+            >
+              {cityData.city}, {cityData.state}
+            </button>
+          ))}
+        </div>
+      )}
     </div>
   );
 }
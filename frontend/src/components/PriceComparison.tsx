@@ -0,0 +1,95 @@
+import { useState, useEffect } from 'react';
+import { CityComparison } from '../types';
+import { fetchCityComparison } from '../api';
+
+interface PriceComparisonProps {
+  city: string;
+  state: string;
+  sizes: number[];
+}
+
+// Rental lengths offered in the comparison; the API prices any length
+const RENTAL_DAYS = [7, 14, 30];
+
+export function PriceComparison({ city, state, sizes }: PriceComparisonProps) {
+  const [size, setSize] = useState<number | null>(sizes.includes(20) ? 20 : sizes[0] ?? null);
+  const [days, setDays] = useState(RENTAL_DAYS[0]);
+  const [comparison, setComparison] = useState<CityComparison | null>(null);
+  const [loading, setLoading] = useState(false);
+
+  useEffect(() => {
+    if (size === null) return;
+    let cancelled = false;
+    setLoading(true);
+    // The API ranks the providers; the list is shown in the order it returns
+    fetchCityComparison(city, size, state, days).then((data) => {
+      if (!cancelled) {
+        setComparison(data);
+        setLoading(false);
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [city, state, size, days]);
+
+  if (size === null) {
+    return null;
+  }
+
+  return (
+    <section className="mb-12">
+      <h2 className="text-3xl font-bold mb-6">Compare Dumpster Prices in {city}, {state}</h2>
+      <div className="flex flex-wrap gap-4 mb-6">
+        <label className="flex items-center gap-2">
+          <span className="text-gray-700">Size</span>
+          <select
+            value={size}
+            onChange={(e) => setSize(Number(e.target.value))}
+            className="px-3 py-2 border rounded-md"
+          >
+            {sizes.map((yards) => (
+              <option key={yards} value={yards}>{yards} yard</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex items-center gap-2">
+          <span className="text-gray-700">Rental length</span>
+          <select
+            value={days}
+            onChange={(e) => setDays(Number(e.target.value))}
+            className="px-3 py-2 border rounded-md"
+          >
+            {RENTAL_DAYS.map((length) => (
+              <option key={length} value={length}>{length} days</option>
+            ))}
+          </select>
+        </label>
+      </div>
+
+      {loading && !comparison ? (
+        <div className="p-4 text-center">Comparing prices...</div>
+      ) : !comparison || comparison.offers.length === 0 ? (
+        <div className="p-4 text-center">No {size} yard prices available in {city}, {state}.</div>
+      ) : (
+        <ol className="space-y-3">
+          {comparison.offers.map((offer, index) => (
+            <li key={offer.id} className="flex justify-between items-center border rounded-lg p-4 shadow-sm">
+              <div>
+                <p className="font-semibold">{index + 1}. {offer.company_name}</p>
+                <p className="text-gray-600 text-sm">
+                  ${offer.base_price.toFixed(2)}
+                  {offer.rental_period_days ? ` for ${offer.rental_period_days} days` : ''}
+                  {offer.additional_day_price ? `, then $${offer.additional_day_price.toFixed(2)}/day` : ''}
+                </p>
+              </div>
+              <p className="text-xl font-bold text-green-600">
+                {offer.total_price != null ? `$${offer.total_price.toFixed(2)}` : 'Call for price'}
+              </p>
+            </li>
+          ))}
+        </ol>
+      )}
+    </section>
+  );
+}
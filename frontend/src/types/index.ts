@@ -22,6 +22,7 @@ export interface DumpsterSize {
   description?: string;
   weight_limit_lbs?: number;
   suitable_for?: string[];
+  service?: 'dumpster' | 'junk_removal';
 }
 
 export interface DumpsterPrice {
@@ -41,3 +42,17 @@ export interface CityData {
   dumpster_sizes: DumpsterSize[];
   prices: DumpsterPrice[];
 }
+
+export interface PriceOffer extends DumpsterPrice {
+  company_name?: string;
+  size_yards: number;
+  city?: string;
+  zip_code?: string;
+  total_price?: number | null;
+}
+
+export interface CityComparison {
+  size_yards: number;
+  days: number | null;
+  offers: PriceOffer[];
+}